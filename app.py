@@ -1,327 +1,550 @@
-import os
-import markdown2
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session
-from github_analyzer import GitHubAnalyzer
-from dotenv import load_dotenv
-import requests
-
-# Load environment variables
-load_dotenv()
-
-app = Flask(__name__)
-
-# Add markdown filter to Jinja2 environment
-@app.template_filter('markdown')
-def markdown_to_html(markdown_text):
-    if not markdown_text:
-        return ""
-    return markdown2.markdown(markdown_text)
-app.secret_key = os.getenv('SECRET_KEY', 'dev-key-for-testing')
-
-@app.route('/', methods=['GET', 'POST'])
-def index():
-    if request.method == 'POST':
-        repo_url = request.form.get('repo_url')
-        user_name = request.form.get('user_name')
-        user_email = request.form.get('user_email')
-        portfolio_url = request.form.get('portfolio_url', '')
-        
-        if not repo_url:
-            flash('Please enter a GitHub repository URL', 'error')
-            return redirect(url_for('index'))
-        if not user_name:
-            flash('Please enter your name', 'error')
-            return redirect(url_for('index'))
-        if not user_email:
-            flash('Please enter your email', 'error')
-            return redirect(url_for('index'))
-        
-        token = request.form.get('github_token') or os.getenv('GITHUB_TOKEN')
-        
-        # Store in session for result page
-        return redirect(url_for('analyze', 
-                             repo_url=repo_url, 
-                             token=token or '',
-                             user_name=user_name,
-                             user_email=user_email,
-                             portfolio_url=portfolio_url))
-    
-    return render_template('index.html')
-
-@app.route('/analyze')
-def analyze():
-    repo_url = request.args.get('repo_url')
-    token = request.args.get('token')
-    user_name = request.args.get('user_name')
-    user_email = request.args.get('user_email')
-    portfolio_url = request.args.get('portfolio_url', '')
-    
-    if not repo_url:
-        flash('No repository URL provided', 'error')
-        return redirect(url_for('index'))
-    
-    # Prefer logged-in user's token if available
-    if not token:
-        token = session.get('gh_token')
-    analyzer = GitHubAnalyzer(token=token or None)
-    owner, repo_name = analyzer.get_repo_info(repo_url)
-    
-    if not owner or not repo_name:
-        flash('Invalid GitHub repository URL', 'error')
-        return redirect(url_for('index'))
-    
-    try:
-        repo_data = analyzer.analyze_repository(owner, repo_name)
-        if not repo_data:
-            flash('Could not analyze repository', 'error')
-            return redirect(url_for('index'))
-        
-        # Add user information to repo_data
-        repo_data['user'] = {
-            'name': user_name,
-            'email': user_email,
-            'portfolio_url': portfolio_url
-        }
-        
-        # Generate the README content (Markdown)
-        readme_markdown = analyzer.generate_readme(repo_data)
-        
-        # Convert markdown to HTML for preview
-        readme_html = markdown2.markdown(readme_markdown)
-        
-        return render_template('result.html', 
-                             repo_data=repo_data, 
-                             readme_html=readme_html,
-                             readme_markdown=readme_markdown,
-                             repo_url=repo_url,
-                             user_name=user_name,
-                             user_email=user_email,
-                             portfolio_url=portfolio_url)
-    except Exception as e:
-        app.logger.error(f"Error analyzing repository: {str(e)}")
-        flash(f'Error analyzing repository: {str(e)}', 'error')
-        return redirect(url_for('index'))
-
-@app.route('/api/generate', methods=['POST'])
-def api_generate():
-    data = request.get_json()
-    if not data or 'repo_url' not in data:
-        return jsonify({'error': 'Missing repository URL'}), 400
-    
-    repo_url = data['repo_url']
-    token = data.get('token') or os.getenv('GITHUB_TOKEN')
-    
-    analyzer = GitHubAnalyzer(token=token or None)
-    owner, repo_name = analyzer.get_repo_info(repo_url)
-    
-    if not owner or not repo_name:
-        return jsonify({'error': 'Invalid GitHub repository URL'}), 400
-    
-    try:
-        repo_data = analyzer.analyze_repository(owner, repo_name)
-        if not repo_data:
-            return jsonify({'error': 'Could not analyze repository'}), 500
-        
-        readme_content = analyzer.generate_readme(repo_data)
-        return jsonify({
-            'success': True,
-            'readme': readme_content,
-            'repo_data': repo_data
-        })
-    except Exception as e:
-        app.logger.error(f"API Error: {str(e)}")
-        return jsonify({'error': str(e)}), 500
-
-# --- GitHub OAuth ---
-GITHUB_CLIENT_ID = os.getenv('GITHUB_CLIENT_ID', '')
-GITHUB_CLIENT_SECRET = os.getenv('GITHUB_CLIENT_SECRET', '')
-GITHUB_OAUTH_CALLBACK = os.getenv('GITHUB_OAUTH_CALLBACK', '')  # e.g., http://localhost:5000/callback
-
-@app.route('/login')
-def login():
-    if not GITHUB_CLIENT_ID:
-        flash('GitHub OAuth not configured. Set GITHUB_CLIENT_ID and GITHUB_CLIENT_SECRET.', 'error')
-        return redirect(url_for('index'))
-    import secrets
-    state = secrets.token_urlsafe(24)
-    session['oauth_state'] = state
-    # Build authorize URL
-    authorize_url = (
-        'https://github.com/login/oauth/authorize'
-        f'?client_id={GITHUB_CLIENT_ID}'
-        '&scope=repo%20read:user%20user:email'
-        f'&state={state}'
-    )
-    if GITHUB_OAUTH_CALLBACK:
-        from urllib.parse import quote
-        authorize_url += f'&redirect_uri={quote(GITHUB_OAUTH_CALLBACK, safe="")}'
-    return redirect(authorize_url)
-
-@app.route('/callback')
-def oauth_callback():
-    code = request.args.get('code')
-    state = request.args.get('state')
-    if not code:
-        flash('Login failed: missing code.', 'error')
-        return redirect(url_for('index'))
-    # Validate state to prevent CSRF
-    expected_state = session.pop('oauth_state', None)
-    if not expected_state or state != expected_state:
-        flash('Login failed: invalid state.', 'error')
-        return redirect(url_for('index'))
-    try:
-        # Exchange code for access token
-        payload = {
-            'client_id': GITHUB_CLIENT_ID,
-            'client_secret': GITHUB_CLIENT_SECRET,
-            'code': code,
-        }
-        if GITHUB_OAUTH_CALLBACK:
-            payload['redirect_uri'] = GITHUB_OAUTH_CALLBACK
-        token_resp = requests.post(
-            'https://github.com/login/oauth/access_token',
-            headers={'Accept': 'application/json'},
-            data=payload,
-            timeout=15
-        )
-        token_resp.raise_for_status()
-        token_json = token_resp.json()
-        access_token = token_json.get('access_token')
-        if not access_token:
-            # Try to surface GitHub error
-            err = token_json.get('error_description') or token_json.get('error') or 'No access token returned from GitHub'
-            raise RuntimeError(err)
-
-        # Fetch user
-        user_resp = requests.get(
-            'https://api.github.com/user',
-            headers={'Authorization': f'Bearer {access_token}', 'Accept': 'application/vnd.github+json'},
-            timeout=15
-        )
-        user_resp.raise_for_status()
-        user = user_resp.json()
-
-        # Save to session
-        session['gh_token'] = access_token
-        session['gh_user'] = {
-            'login': user.get('login'),
-            'name': user.get('name') or user.get('login'),
-            'avatar_url': user.get('avatar_url'),
-            'html_url': user.get('html_url'),
-        }
-        flash(f"Logged in as {session['gh_user']['login']}", 'info')
-        return redirect(url_for('index'))
-    except Exception as e:
-        app.logger.error(f"OAuth error: {e}")
-        flash(f'GitHub login failed: {e}', 'error')
-        return redirect(url_for('index'))
-
-@app.route('/logout')
-def logout():
-    session.pop('gh_token', None)
-    session.pop('gh_user', None)
-    flash('Logged out of GitHub', 'info')
-    return redirect(url_for('index'))
-
-@app.route('/api/me')
-def api_me():
-    user = session.get('gh_user')
-    return jsonify({'authenticated': bool(user), 'user': user})
-
-@app.route('/api/repos')
-def api_repos():
-    token = session.get('gh_token')
-    if not token:
-        return jsonify({'error': 'Not authenticated'}), 401
-    try:
-        repos = []
-        page = 1
-        while page <= 3:  # fetch up to ~300 repos
-            resp = requests.get(
-                'https://api.github.com/user/repos',
-                headers={'Authorization': f'Bearer {token}', 'Accept': 'application/vnd.github+json'},
-                params={'per_page': 100, 'page': page, 'sort': 'updated', 'affiliation': 'owner,collaborator,organization_member'},
-                timeout=20
-            )
-            resp.raise_for_status()
-            batch = resp.json()
-            if not batch:
-                break
-            for r in batch:
-                repos.append({
-                    'full_name': r.get('full_name'),
-                    'html_url': r.get('html_url'),
-                    'name': r.get('name'),
-                    'private': r.get('private'),
-                    'description': r.get('description'),
-                    'language': r.get('language'),
-                    'updated_at': r.get('updated_at'),
-                })
-            page += 1
-        return jsonify({'repos': repos})
-    except Exception as e:
-        app.logger.error(f"Repos API error: {e}")
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/publish', methods=['POST'])
-def api_publish():
-    token = session.get('gh_token')
-    if not token:
-        return jsonify({'error': 'Not authenticated with GitHub'}), 401
-    data = request.get_json() or {}
-    full_name = data.get('full_name')  # e.g., owner/repo
-    content = data.get('content')  # markdown string
-    message = data.get('message') or 'chore: update README via README Generator'
-    path = data.get('path') or 'README.md'
-    branch = data.get('branch')  # optional
-    if not full_name or not content:
-        return jsonify({'error': 'Missing required fields: full_name, content'}), 400
-    try:
-        # Get current SHA if file exists
-        headers = {
-            'Authorization': f'Bearer {token}',
-            'Accept': 'application/vnd.github+json',
-        }
-        get_url = f'https://api.github.com/repos/{full_name}/contents/{path}'
-        sha = None
-        r = requests.get(get_url, headers=headers, timeout=20, params={'ref': branch} if branch else None)
-        if r.status_code == 200:
-            j = r.json()
-            sha = j.get('sha')
-            # Avoid no-op commit: compare existing content
-            try:
-                import base64
-                existing = base64.b64decode(j.get('content', '').encode('utf-8')).decode('utf-8')
-                if existing.strip() == content.strip():
-                    return jsonify({'success': True, 'skipped': True, 'reason': 'No changes'}), 200
-            except Exception:
-                pass
-        elif r.status_code not in (404,):
-            r.raise_for_status()
-
-        import base64
-        b64_content = base64.b64encode(content.encode('utf-8')).decode('utf-8')
-        put_body = {
-            'message': message,
-            'content': b64_content,
-        }
-        if branch:
-            put_body['branch'] = branch
-        if sha:
-            put_body['sha'] = sha
-        put_url = get_url
-        pr = requests.put(put_url, headers=headers, json=put_body, timeout=30)
-        if not pr.ok:
-            try:
-                err = pr.json()
-                return jsonify({'error': err.get('message') or 'GitHub API error', 'details': err}), pr.status_code
-            except Exception:
-                pr.raise_for_status()
-        resp = pr.json()
-        return jsonify({'success': True, 'content': resp.get('content'), 'commit': resp.get('commit')})
-    except Exception as e:
-        app.logger.error(f"Publish API error: {e}")
-        return jsonify({'error': str(e)}), 500
-
-if __name__ == '__main__':
-    app.run(debug=True)
+import os
+import json
+import base64
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, Response, stream_with_context, g
+from github_analyzer import GitHubAnalyzer
+from github_client import GitHubClient, blob_sha
+from result_cache import result_cache
+from batch import generate_batch, list_owner_repos, BATCH_MAX_REPOS
+from repo_list import iter_user_repos, make_filter, repo_lists
+from publish import publish_batch, PUBLISH_MAX_REPOS, DEFAULT_MESSAGE
+from jobs import job_manager
+from rate_limit import scheduler, token_id, RateLimitExceeded
+from token_pool import token_pool
+from readme_engine import get_engine, resolve_sections
+from markdown_render import render_markdown
+from models import RepoData, NO_README
+from page_cache import page_cache, page_key
+import metrics
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+app = Flask(__name__)
+
+# Compile the README section templates once at startup
+get_engine()
+
+# Add markdown filter to Jinja2 environment
+@app.template_filter('markdown')
+def markdown_to_html(markdown_text):
+    return render_markdown(markdown_text)
+app.secret_key = os.getenv('SECRET_KEY', 'dev-key-for-testing')
+
+# Run /analyze as a background job by default instead of inside the request
+ANALYZE_ASYNC = os.getenv('ANALYZE_ASYNC', '').lower() in ('1', 'true', 'yes')
+
+@app.before_request
+def start_request_metrics():
+    g.metrics_token = metrics.begin_request()
+
+@app.after_request
+def note_response_status(response):
+    g.response_status = response.status_code
+    return response
+
+@app.teardown_request
+def record_request_metrics(exc):
+    # Teardown runs on unhandled exceptions too, and only once a streamed body has been sent
+    if 'metrics_token' in g:
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        status = 500 if exc is not None else g.get('response_status', 500)
+        metrics.end_request(g.pop('metrics_token'), request.method, request.path, endpoint, status)
+
+@app.route('/metrics')
+def prometheus_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/', methods=['GET', 'POST'])
+def index():
+    if request.method == 'POST':
+        # Older forms post here; analyze right away instead of redirecting
+        return analyze()
+    # Prefill the form with the details used last time
+    return render_template('index.html', user=session.get('readme_user') or {})
+
+def render_result(repo_data, readme_markdown, repo_url, cache_key=None, full_name=None):
+    """Render the result page, keeping its content under ``cache_key`` for next time
+    
+    Pages kept with ``full_name`` are dropped when that repository is published to.
+    """
+    result_html = render_template('result_content.html',
+                                  repo_data=repo_data,
+                                  readme_html=render_markdown(readme_markdown),
+                                  readme_markdown=readme_markdown,
+                                  repo_url=repo_url)
+    if cache_key:
+        page_cache.set(cache_key, result_html, full_name)
+    return render_template('result.html', result_html=result_html)
+
+@app.route('/analyze', methods=['GET', 'POST'])
+def analyze():
+    """Analyze a repository and show its README
+    
+    The home page form posts here, so the token and user details never
+    appear in a URL. GET keeps working for links with ``repo_url`` (and
+    optional user details) but only uses the logged-in user's token.
+    """
+    values = request.form if request.method == 'POST' else request.args
+    repo_url = values.get('repo_url')
+    user = {
+        'name': values.get('user_name'),
+        'email': values.get('user_email'),
+        'portfolio_url': values.get('portfolio_url', ''),
+    }
+    refresh = values.get('refresh') == '1'
+    
+    if not repo_url:
+        flash('Please enter a GitHub repository URL', 'error')
+        return redirect(url_for('index'))
+    if request.method == 'POST':
+        if not user['name']:
+            flash('Please enter your name', 'error')
+            return redirect(url_for('index'))
+        if not user['email']:
+            flash('Please enter your email', 'error')
+            return redirect(url_for('index'))
+        session['readme_user'] = user
+    
+    # A pasted token is only used for this request (or its job), never stored;
+    # otherwise prefer the logged-in user's token. Without either, the analyzer
+    # uses a service token from the pool, for public repositories only.
+    token = (request.form.get('github_token') if request.method == 'POST' else None) \
+        or session.get('gh_token')
+    analyzer = GitHubAnalyzer(token=token or None)
+    owner, repo_name = analyzer.get_repo_info(repo_url)
+    
+    if not owner or not repo_name:
+        flash('Invalid GitHub repository URL', 'error')
+        return redirect(url_for('index'))
+    
+    if values.get('async', '1' if ANALYZE_ASYNC else '0') == '1':
+        job = job_manager.submit(run_analysis_job, repo_url, token, user, refresh)
+        return redirect(url_for('job_page', job_id=job.id), code=303)
+    
+    # Identical inputs within RESULT_PAGE_CACHE_TTL get the page rendered last time
+    cache_key = page_key('analyze', f"{owner}/{repo_name}".lower(), token_id(token),
+                         tuple(user.values()), analyzer.engine.version)
+    if not refresh:
+        result_html = page_cache.get(cache_key)
+        if result_html is not None:
+            return render_template('result.html', result_html=result_html)
+    
+    try:
+        repo_data = analyzer.analyze_repository(owner, repo_name, refresh=refresh)
+        if not repo_data:
+            flash('Could not analyze repository', 'error')
+            return redirect(url_for('index'))
+        
+        # Add user information to repo_data
+        repo_data.user = user
+        
+        # Generate the README content (Markdown)
+        readme_markdown = analyzer.generate_readme(repo_data)
+        return render_result(repo_data, readme_markdown, repo_url, cache_key, f"{owner}/{repo_name}")
+    except Exception as e:
+        app.logger.error(f"Error analyzing repository: {str(e)}")
+        flash(f'Error analyzing repository: {str(e)}', 'error')
+        return redirect(url_for('index'))
+
+def run_analysis_job(job, repo_url, token, user, refresh=False):
+    """Background job body: analyze a repository and build its README"""
+    analyzer = GitHubAnalyzer(token=token or None)
+    owner, repo_name = analyzer.get_repo_info(repo_url)
+    if not owner or not repo_name:
+        raise ValueError('Invalid GitHub repository URL')
+    repo_data = analyzer.analyze_repository(owner, repo_name, refresh=refresh, progress=job.progress)
+    if not repo_data:
+        raise RuntimeError('Could not analyze repository')
+    repo_data.user = user
+    readme_markdown = analyzer.generate_readme(repo_data)
+    job.progress('generate_readme', 'done')
+    return {'repo_url': repo_url, 'repo_data': repo_data.to_dict(), 'readme': readme_markdown}
+
+@app.route('/jobs/<job_id>')
+def job_page(job_id):
+    job = job_manager.get(job_id)
+    if not job:
+        flash('Analysis not found or expired', 'error')
+        return redirect(url_for('index'))
+    if job.status == 'failed':
+        flash(f'Error analyzing repository: {job.error}', 'error')
+        return redirect(url_for('index'))
+    if job.status != 'done':
+        return render_template('job.html', job=job)
+    
+    # A finished job's result never changes, so its page is rendered once
+    cache_key = page_key('job', job.id)
+    result_html = page_cache.get(cache_key)
+    if result_html is not None:
+        return render_template('result.html', result_html=result_html)
+    result = job.result
+    return render_result(RepoData.from_dict(result['repo_data']), result['readme'], result['repo_url'], cache_key)
+
+@app.route('/api/jobs', methods=['POST'])
+def api_submit_job():
+    data = request.get_json() or {}
+    if not data.get('repo_url'):
+        return jsonify({'error': 'Missing repository URL'}), 400
+    token = data.get('token') or session.get('gh_token')
+    job = job_manager.submit(run_analysis_job, data['repo_url'], token, data.get('user') or {}, bool(data.get('refresh')))
+    return jsonify({
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': url_for('api_job_status', job_id=job.id),
+        'events_url': url_for('api_job_events', job_id=job.id),
+    }), 202
+
+@app.route('/api/jobs/<job_id>')
+def api_job_status(job_id):
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict(include_result=request.args.get('result', '1') == '1'))
+
+@app.route('/api/jobs/<job_id>/events')
+def api_job_events(job_id):
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    try:
+        since = int(request.headers.get('Last-Event-ID') or request.args.get('since') or 0)
+    except ValueError:
+        return jsonify({'error': 'Invalid event ID'}), 400
+    
+    def stream():
+        # Server-sent events; the browser reconnects with Last-Event-ID
+        for event in job.iter_events(since=since):
+            yield f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+    
+    return Response(stream_with_context(stream()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/generate', methods=['POST'])
+def api_generate():
+    data = request.get_json()
+    if not data or 'repo_url' not in data:
+        return jsonify({'error': 'Missing repository URL'}), 400
+    
+    repo_url = data['repo_url']
+    token = data.get('token')
+    refresh = bool(data.get('refresh')) or request.args.get('refresh') == '1'
+    stream = bool(data.get('stream')) or request.args.get('stream') == '1'
+    # Heavy repo_data fields (e.g. the existing README) can be left out of the response
+    exclude = set(data.get('exclude') or [])
+    try:
+        sections = resolve_sections(data.get('sections'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    analyzer = GitHubAnalyzer(token=token or None)
+    owner, repo_name = analyzer.get_repo_info(repo_url)
+    
+    if not owner or not repo_name:
+        return jsonify({'error': 'Invalid GitHub repository URL'}), 400
+    
+    try:
+        repo_data = analyzer.analyze_repository(owner, repo_name, refresh=refresh)
+        if not repo_data:
+            return jsonify({'error': 'Could not analyze repository'}), 500
+        
+        if stream:
+            # Send each README section as soon as it is rendered, as plain Markdown
+            readme_chunks = analyzer.iter_readme(repo_data, sections=sections)
+            return Response(stream_with_context(readme_chunks), mimetype='text/markdown')
+        
+        readme_content = analyzer.generate_readme(repo_data, sections=sections)
+        response = {
+            'success': True,
+            'readme': readme_content,
+        }
+        if data.get('repo_data', True):
+            response['repo_data'] = {k: v for k, v in repo_data.to_dict().items() if k not in exclude}
+            # The API has always returned the existing README as HTML
+            if 'readme' in response['repo_data'] and repo_data.readme != NO_README:
+                response['repo_data']['readme'] = render_markdown(repo_data.readme)
+        return jsonify(response)
+    except RateLimitExceeded as e:
+        return jsonify({'error': str(e), 'reset': e.reset}), 429
+    except Exception as e:
+        app.logger.error(f"API Error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/generate/batch', methods=['POST'])
+def api_generate_batch():
+    data = request.get_json() or {}
+    repo_urls = list(data.get('repos') or [])
+    org = data.get('org')
+    token = data.get('token') or session.get('gh_token')
+    
+    if org:
+        try:
+            # A service token only lists the organization's public repositories
+            repo_urls += list_owner_repos(GitHubClient(token or token_pool.pick()), org, public_only=not token)
+        except Exception as e:
+            app.logger.error(f"Batch API Error: {str(e)}")
+            return jsonify({'error': f'Could not list repositories for {org}: {e}'}), 502
+    if not repo_urls:
+        return jsonify({'error': 'Provide a list of repos or an org'}), 400
+    if len(repo_urls) > BATCH_MAX_REPOS:
+        return jsonify({'error': f'Too many repositories (max {BATCH_MAX_REPOS})'}), 400
+    try:
+        sections = resolve_sections(data.get('sections'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    def stream():
+        # One JSON document per line, written as each repository finishes
+        for result in generate_batch(repo_urls, token=token, user=data.get('user'), sections=sections):
+            yield json.dumps(result) + '\n'
+    
+    return Response(stream_with_context(stream()), mimetype='application/x-ndjson')
+
+# --- GitHub OAuth ---
+GITHUB_CLIENT_ID = os.getenv('GITHUB_CLIENT_ID', '')
+GITHUB_CLIENT_SECRET = os.getenv('GITHUB_CLIENT_SECRET', '')
+GITHUB_OAUTH_CALLBACK = os.getenv('GITHUB_OAUTH_CALLBACK', '')  # e.g., http://localhost:5000/callback
+
+@app.route('/login')
+def login():
+    if not GITHUB_CLIENT_ID:
+        flash('GitHub OAuth not configured. Set GITHUB_CLIENT_ID and GITHUB_CLIENT_SECRET.', 'error')
+        return redirect(url_for('index'))
+    import secrets
+    state = secrets.token_urlsafe(24)
+    session['oauth_state'] = state
+    # Build authorize URL
+    authorize_url = (
+        'https://github.com/login/oauth/authorize'
+        f'?client_id={GITHUB_CLIENT_ID}'
+        '&scope=repo%20read:user%20user:email'
+        f'&state={state}'
+    )
+    if GITHUB_OAUTH_CALLBACK:
+        from urllib.parse import quote
+        authorize_url += f'&redirect_uri={quote(GITHUB_OAUTH_CALLBACK, safe="")}'
+    return redirect(authorize_url)
+
+@app.route('/callback')
+def oauth_callback():
+    code = request.args.get('code')
+    state = request.args.get('state')
+    if not code:
+        flash('Login failed: missing code.', 'error')
+        return redirect(url_for('index'))
+    # Validate state to prevent CSRF
+    expected_state = session.pop('oauth_state', None)
+    if not expected_state or state != expected_state:
+        flash('Login failed: invalid state.', 'error')
+        return redirect(url_for('index'))
+    try:
+        # Exchange code for access token
+        payload = {
+            'client_id': GITHUB_CLIENT_ID,
+            'client_secret': GITHUB_CLIENT_SECRET,
+            'code': code,
+        }
+        if GITHUB_OAUTH_CALLBACK:
+            payload['redirect_uri'] = GITHUB_OAUTH_CALLBACK
+        token_resp = GitHubClient().request(
+            'POST',
+            'https://github.com/login/oauth/access_token',
+            headers={'Accept': 'application/json'},
+            data=payload,
+            timeout=15
+        )
+        token_resp.raise_for_status()
+        token_json = token_resp.json()
+        access_token = token_json.get('access_token')
+        if not access_token:
+            # Try to surface GitHub error
+            err = token_json.get('error_description') or token_json.get('error') or 'No access token returned from GitHub'
+            raise RuntimeError(err)
+
+        # Fetch user
+        user_resp = GitHubClient(access_token).get('/user', timeout=15)
+        user_resp.raise_for_status()
+        user = user_resp.json()
+
+        # Save to session
+        session['gh_token'] = access_token
+        session['gh_user'] = {
+            'login': user.get('login'),
+            'name': user.get('name') or user.get('login'),
+            'avatar_url': user.get('avatar_url'),
+            'html_url': user.get('html_url'),
+        }
+        flash(f"Logged in as {session['gh_user']['login']}", 'info')
+        return redirect(url_for('index'))
+    except Exception as e:
+        app.logger.error(f"OAuth error: {e}")
+        flash(f'GitHub login failed: {e}', 'error')
+        return redirect(url_for('index'))
+
+@app.route('/logout')
+def logout():
+    if session.get('gh_token'):
+        repo_lists.invalidate(session['gh_token'])
+    session.pop('gh_token', None)
+    session.pop('gh_user', None)
+    flash('Logged out of GitHub', 'info')
+    return redirect(url_for('index'))
+
+@app.route('/api/me')
+def api_me():
+    user = session.get('gh_user')
+    return jsonify({'authenticated': bool(user), 'user': user})
+
+@app.route('/api/repos')
+def api_repos():
+    """List the signed-in user's repositories, optionally searched and filtered
+    
+    Query parameters: ``q`` (words matched against name and description),
+    ``language``, ``owner``, ``visibility`` (public/private), ``fork``,
+    ``archived``, ``limit`` and ``refresh=1``. With ``stream=1`` matches are
+    sent as newline-delimited JSON batches while the pages come in.
+    """
+    token = session.get('gh_token')
+    if not token:
+        return jsonify({'error': 'Not authenticated'}), 401
+    args = request.args
+    try:
+        matches = make_filter(args.get('q'), args.get('language'), args.get('owner'),
+                              args.get('visibility'), args.get('fork'), args.get('archived'))
+        limit = int(args['limit']) if args.get('limit') else None
+        if limit is not None and limit < 1:
+            raise ValueError('limit must be a positive integer')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    batches = iter_user_repos(token, refresh=args.get('refresh') == '1')
+    
+    if args.get('stream') == '1':
+        def generate():
+            total = 0
+            try:
+                for batch in batches:
+                    found = [r for r in batch if matches(r)]
+                    if limit is not None:
+                        found = found[:limit - total]
+                    total += len(found)
+                    if found:
+                        yield json.dumps({'repos': found}) + '\n'
+                    if limit is not None and total >= limit:
+                        break
+                yield json.dumps({'done': True, 'total': total}) + '\n'
+            except Exception as e:
+                app.logger.error(f"Repos API error: {e}")
+                yield json.dumps({'error': str(e)}) + '\n'
+            finally:
+                batches.close()
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    
+    try:
+        repos = sorted((r for batch in batches for r in batch if matches(r)),
+                       key=lambda r: (r['full_name'] or '').lower())
+        return jsonify({'repos': repos[:limit], 'total': len(repos)})
+    except RateLimitExceeded as e:
+        return jsonify({'error': str(e), 'reset': e.reset}), 429
+    except Exception as e:
+        app.logger.error(f"Repos API error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/ratelimit')
+def api_ratelimit():
+    token = session.get('gh_token') or token_pool.pick()
+    budget = scheduler.budget(token)
+    if budget['remaining'] is None:
+        # Nothing seen for this token yet; /rate_limit itself is free to call
+        try:
+            GitHubClient(token).get('/rate_limit', timeout=10)
+            budget = scheduler.budget(token)
+        except Exception as e:
+            app.logger.error(f"Rate limit API error: {e}")
+    return jsonify(dict(budget, token=token_id(token)))
+
+@app.route('/api/publish', methods=['POST'])
+def api_publish():
+    token = session.get('gh_token')
+    if not token:
+        return jsonify({'error': 'Not authenticated with GitHub'}), 401
+    data = request.get_json() or {}
+    full_name = data.get('full_name')  # e.g., owner/repo
+    content = data.get('content')  # markdown string
+    message = data.get('message') or 'chore: update README via README Generator'
+    path = data.get('path') or 'README.md'
+    branch = data.get('branch')  # optional
+    if not full_name or not content:
+        return jsonify({'error': 'Missing required fields: full_name, content'}), 400
+    try:
+        # Get current SHA if file exists
+        client = GitHubClient(token)
+        get_url = f'/repos/{full_name}/contents/{path}'
+        sha = None
+        r = client.get(get_url, timeout=20, params={'ref': branch} if branch else None)
+        if r.status_code == 200:
+            j = r.json()
+            sha = j.get('sha')
+            # Identical content has the same blob SHA, so no-op publishes are
+            # caught without decoding the current file
+            if sha == blob_sha(content):
+                return jsonify({'success': True, 'skipped': True, 'reason': 'No changes'}), 200
+        elif r.status_code not in (404,):
+            r.raise_for_status()
+
+        b64_content = base64.b64encode(content.encode('utf-8')).decode('utf-8')
+        put_body = {
+            'message': message,
+            'content': b64_content,
+        }
+        if branch:
+            put_body['branch'] = branch
+        if sha:
+            put_body['sha'] = sha
+        put_url = get_url
+        pr = client.request('PUT', put_url, json=put_body, timeout=30)
+        if not pr.ok:
+            try:
+                err = pr.json()
+                return jsonify({'error': err.get('message') or 'GitHub API error', 'details': err}), pr.status_code
+            except Exception:
+                pr.raise_for_status()
+        resp = pr.json()
+        # The README changed, so cached analyses and result pages of this repo are stale
+        result_cache.invalidate(full_name)
+        page_cache.invalidate(full_name)
+        return jsonify({'success': True, 'content': resp.get('content'), 'commit': resp.get('commit')})
+    except Exception as e:
+        app.logger.error(f"Publish API error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/publish/batch', methods=['POST'])
+def api_publish_batch():
+    """Publish files to many repositories, one commit per repository
+    
+    Body: ``{"repos": [{"full_name", "files": [{"path", "content"}, ...],
+    "branch", "message"}, ...], "message"}``; ``"content"`` alone is
+    shorthand for the README. One JSON result per line is streamed back as
+    each repository finishes.
+    """
+    token = session.get('gh_token')
+    if not token:
+        return jsonify({'error': 'Not authenticated with GitHub'}), 401
+    data = request.get_json() or {}
+    targets = data.get('repos')
+    if not targets or not isinstance(targets, list):
+        return jsonify({'error': 'Provide a list of repos'}), 400
+    if len(targets) > PUBLISH_MAX_REPOS:
+        return jsonify({'error': f'Too many repositories (max {PUBLISH_MAX_REPOS})'}), 400
+    if not all(isinstance(t, dict) for t in targets):
+        return jsonify({'error': 'Each repo must be an object with full_name and files'}), 400
+    message = data.get('message') or DEFAULT_MESSAGE
+    
+    def stream():
+        for result in publish_batch(targets, token, message):
+            yield json.dumps(result) + '\n'
+    
+    return Response(stream_with_context(stream()), mimetype='application/x-ndjson')
+
+if __name__ == '__main__':
+    app.run(debug=True)
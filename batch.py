@@ -0,0 +1,92 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dotenv import load_dotenv
+from github_analyzer import GitHubAnalyzer
+from github_client import GitHubAPIError
+from rate_limit import scheduler, BATCH
+
+# Load environment variables
+load_dotenv()
+
+# Batch generation runs repositories through a bounded worker pool; its
+# GitHub calls run at batch priority so the rate-limit scheduler paces them
+# and lets interactive requests go first
+BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', '4'))
+BATCH_MAX_REPOS = int(os.getenv('BATCH_MAX_REPOS', '1000'))
+
+
+def list_owner_repos(client, owner, public_only=False):
+    """Return the HTML URLs of every repository of an organization (or user)
+
+    ``public_only`` leaves out private repositories the token can see, for
+    listings made with a shared service token.
+    """
+    try:
+        pages = list(client.iter_page_batches(f"/orgs/{owner}/repos",
+                                              params={'type': 'public' if public_only else 'all'}))
+    except GitHubAPIError as e:
+        if e.status != 404:
+            raise
+        # Not an organization; try it as a user account
+        pages = list(client.iter_page_batches(f"/users/{owner}/repos", params={'type': 'owner'}))
+    repos = [r for page in pages for r in page]
+    return [r['html_url'] for r in repos if not r.get('archived') and not (public_only and r.get('private'))]
+
+
+def generate_one(analyzer, repo_url, user=None, sections=None):
+    """Analyze one repository and build its README, reporting errors inline"""
+    result = {'repo_url': repo_url, 'success': False}
+    owner, repo_name = analyzer.get_repo_info(repo_url)
+    if not owner or not repo_name:
+        result['error'] = 'Invalid GitHub repository URL'
+        return result
+    try:
+        with scheduler.priority(BATCH):
+            repo_data = analyzer.analyze_repository(owner, repo_name)
+        if not repo_data:
+            result['error'] = 'Could not analyze repository'
+            return result
+        if user:
+            repo_data.user = user
+        result.update({
+            'success': True,
+            'full_name': repo_data.full_name,
+            'readme': analyzer.generate_readme(repo_data, sections=sections),
+        })
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+def generate_batch(repo_urls, token=None, user=None, backend=None, workers=BATCH_WORKERS, sections=None,
+                   template_dirs=None):
+    """Yield one result per repository as soon as it finishes
+
+    At most ``workers`` repositories are in flight; the rest are submitted
+    as earlier ones complete, so an abandoned stream stops promptly.
+    """
+    if token:
+        analyzer = GitHubAnalyzer(token=token, backend=backend, template_dirs=template_dirs)
+        next_analyzer = lambda: analyzer
+    else:
+        # Each repository takes the service token with the most budget left
+        next_analyzer = lambda: GitHubAnalyzer(backend=backend, template_dirs=template_dirs)
+    pending_urls = iter(repo_urls)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='gh-batch')
+    in_flight = set()
+    try:
+        for url in pending_urls:
+            in_flight.add(executor.submit(generate_one, next_analyzer(), url, user, sections))
+            if len(in_flight) >= workers:
+                break
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                next_url = next(pending_urls, None)
+                if next_url is not None:
+                    in_flight.add(executor.submit(generate_one, next_analyzer(), next_url, user, sections))
+                yield future.result()
+    finally:
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=False)
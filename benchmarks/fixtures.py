@@ -0,0 +1,188 @@
+import os
+import json
+import zlib
+
+# A fixture holds what the GitHub REST API returns for one repository:
+# {'repo': {...}, 'readme': '...', 'contributors': [...], 'languages': {...},
+#  'releases': [...], 'files': {path: text}, 'tree_truncated': bool}.
+# 'files' is the default branch's content, served as a tree listing, blobs
+# and a tarball; with 'tree_truncated' the listing says it is incomplete so
+# the tarball is scanned. Files recorded with benchmarks/record.py live in
+# fixtures/<name>.json; the built-in scenarios below are generated in the
+# same shape so the suite runs without network access.
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+LANGUAGES = [
+    'Python', 'JavaScript', 'TypeScript', 'Go', 'Rust', 'C', 'C++', 'Shell',
+    'HTML', 'CSS', 'Dockerfile', 'Makefile', 'Java', 'Ruby', 'Lua', 'Perl',
+]
+
+
+def _timestamp(day):
+    return f"2023-{1 + day // 28 % 12:02d}-{1 + day % 28:02d}T12:00:00Z"
+
+
+def _repo(name, languages, topics):
+    full_name = f"bench/{name}"
+    return {
+        'id': zlib.crc32(full_name.encode('utf-8')),
+        'name': name,
+        'full_name': full_name,
+        'private': False,
+        'html_url': f"https://github.com/{full_name}",
+        'description': f"Benchmark fixture repository ({name})",
+        'fork': False,
+        'archived': False,
+        'created_at': '2019-05-01T08:00:00Z',
+        'updated_at': '2024-02-01T08:00:00Z',
+        'pushed_at': '2024-01-31T21:13:00Z',
+        'homepage': '',
+        'size': 10240,
+        'stargazers_count': 4821,
+        'watchers_count': 4821,
+        'language': languages[0],
+        'forks_count': 612,
+        'open_issues_count': 87,
+        'license': {'key': 'mit', 'name': 'MIT License', 'spdx_id': 'MIT'},
+        'topics': topics,
+        'default_branch': 'main',
+    }
+
+
+def _contributor(i):
+    login = f"contributor-{i}"
+    return {
+        'login': login,
+        'id': 100000 + i,
+        'avatar_url': f"https://avatars.githubusercontent.com/u/{100000 + i}?v=4",
+        'html_url': f"https://github.com/{login}",
+        'type': 'User',
+        'site_admin': False,
+        'contributions': max(1, 50000 // (i + 1)),
+    }
+
+
+def _release(i):
+    tag = f"v{i // 100}.{i // 10 % 10}.{i % 10}"
+    return {
+        'id': 200000 + i,
+        'tag_name': tag,
+        'name': f"Release {tag}",
+        'draft': False,
+        'prerelease': False,
+        'created_at': _timestamp(1000 - i),
+        'published_at': _timestamp(1000 - i),
+        'body': "## What's changed\n\n" + ''.join(f"- Fix issue #{i * 10 + n}\n" for n in range(12)),
+    }
+
+
+def _readme(size):
+    """Markdown with the usual README constructs, repeated up to ``size`` bytes"""
+    block = (
+        "## Section {n}\n\n"
+        "Some *emphasised* and **strong** text with `inline code` and a "
+        "[link](https://example.com/{n}).\n\n"
+        "- first item\n- second item\n  - nested item\n\n"
+        "```python\ndef handler_{n}(event):\n    return event['value'] * {n}\n```\n\n"
+        "| Option | Default | Description |\n|--------|---------|-------------|\n"
+        "| `opt_{n}` | `{n}` | Tunes part {n} |\n\n"
+        "> Note: section {n} is generated.\n\n"
+    )
+    parts = ["# Benchmark fixture\n\n"]
+    total = len(parts[0])
+    n = 0
+    while total < size:
+        part = block.format(n=n)
+        parts.append(part)
+        total += len(part)
+        n += 1
+    return ''.join(parts)
+
+
+# Manifests of the built-in scenarios, by ecosystem
+MANIFESTS = {
+    'python': {
+        'requirements.txt': "flask>=2.3\nsqlalchemy\nredis\n\n# Tests\npytest\n",
+        'app.py': "from flask import Flask\n\napp = Flask(__name__)\n",
+        '.github/workflows/ci.yml': "on: [push]\njobs:\n  test:\n    runs-on: ubuntu-latest\n",
+    },
+    'node': {
+        'package.json': json.dumps({
+            'name': 'bench', 'scripts': {'dev': 'vite', 'build': 'vite build', 'test': 'vitest'},
+            'dependencies': {'react': '^18.2.0', 'react-dom': '^18.2.0'},
+            'devDependencies': {'vite': '^5.0.0', 'vitest': '^1.0.0', 'typescript': '^5.3.0'},
+        }, indent=2),
+        'yarn.lock': "# yarn lockfile v1\n",
+    },
+    'ml': {
+        'pyproject.toml': '[project]\nname = "bench"\ndependencies = ["torch>=2.1", "numpy", "pandas"]\n\n'
+                          '[project.scripts]\nbench-train = "bench.train:main"\n',
+        'requirements-dev.txt': "pytest\nscikit-learn\n",
+        'Dockerfile': "FROM python:3.11-slim\nCOPY . /app\n",
+    },
+    'monorepo': {
+        'go.mod': "module github.com/bench/monorepo\n\ngo 1.21\n\nrequire github.com/gin-gonic/gin v1.9.1\n",
+        'cmd/server/main.go': "package main\n\nfunc main() {}\n",
+        'docker-compose.yml': "services:\n  api:\n    build: .\n",
+        'Dockerfile': "FROM golang:1.21\n",
+        'services/web/package.json': json.dumps({'dependencies': {'vue': '^3.4.0'}}),
+    },
+}
+
+
+def _files(ecosystems, sources, directory='src'):
+    """Manifests of the given ecosystems plus ``sources`` filler source files"""
+    files = {}
+    for ecosystem in ecosystems:
+        files.update(MANIFESTS[ecosystem])
+    for i in range(sources):
+        files[f"{directory}/pkg{i // 50}/module_{i}.py"] = f"def function_{i}(value):\n    return value * {i}\n" * 20
+    return files
+
+
+def synthetic(name, readme_size, contributors, releases, languages, topics, files=None, tree_truncated=False):
+    langs = LANGUAGES[:languages]
+    return {
+        'repo': _repo(name, langs, topics),
+        'readme': _readme(readme_size),
+        'contributors': [_contributor(i) for i in range(contributors)],
+        'languages': {lang: 1000000 // (i + 1) for i, lang in enumerate(langs)},
+        'releases': [_release(i) for i in range(releases)],
+        'files': files or {},
+        'tree_truncated': tree_truncated,
+    }
+
+
+SCENARIOS = {
+    'small': lambda: synthetic('small', 4 * 1024, 12, 5, 3, ['cli', 'developer-tools'],
+                               files=_files(['python'], 40)),
+    'huge_readme': lambda: synthetic('huge-readme', 2 * 1024 * 1024, 30, 10, 6,
+                                     ['documentation', 'static-site', 'markdown'],
+                                     files=_files(['node'], 200)),
+    'many_contributors': lambda: synthetic('many-contributors', 16 * 1024, 5000, 400, 12,
+                                           ['machine-learning', 'deep-learning', 'python', 'gpu', 'research'],
+                                           files=_files(['ml'], 400)),
+    # Too many files for a full tree listing, so the tarball is streamed
+    'monorepo': lambda: synthetic('monorepo', 8 * 1024, 200, 50, 8, ['monorepo', 'microservices'],
+                                  files=_files(['monorepo'], 5000, directory='vendor'), tree_truncated=True),
+}
+
+
+def available():
+    """Names of the built-in and recorded scenarios"""
+    names = list(SCENARIOS)
+    if os.path.isdir(FIXTURE_DIR):
+        names += sorted(f[:-5] for f in os.listdir(FIXTURE_DIR)
+                        if f.endswith('.json') and f[:-5] not in SCENARIOS)
+    return names
+
+
+def load(name):
+    """Load a recorded fixture, falling back to the built-in scenario of that name"""
+    path = os.path.join(FIXTURE_DIR, f"{name}.json")
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    if name not in SCENARIOS:
+        raise KeyError(f"Unknown scenario '{name}' (available: {', '.join(available())})")
+    return SCENARIOS[name]()
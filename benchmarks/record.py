@@ -0,0 +1,93 @@
+"""Record a repository's GitHub API responses as a benchmark fixture
+
+    python -m benchmarks.record owner/repo [--name NAME] [--max-items 5000]
+
+The fixture is written to benchmarks/fixtures/NAME.json and can then be
+benchmarked with ``python -m benchmarks.run --scenario NAME``.
+"""
+import os
+import sys
+import json
+import argparse
+import requests
+from dotenv import load_dotenv
+from benchmarks.fixtures import FIXTURE_DIR
+
+# Load environment variables
+load_dotenv()
+
+API_URL = os.getenv('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
+
+
+def _get(session, url, **kwargs):
+    resp = session.get(url, timeout=30, **kwargs)
+    resp.raise_for_status()
+    return resp
+
+
+def _get_all(session, url, max_items):
+    items = []
+    params = {'per_page': 100}
+    while url and len(items) < max_items:
+        resp = _get(session, url, params=params)
+        items += resp.json()
+        url = resp.links.get('next', {}).get('url')
+        params = None
+    return items[:max_items]
+
+
+def record(full_name, token=None, max_items=5000):
+    """Fetch everything the analyzer reads for a repository"""
+    session = requests.Session()
+    session.headers['Accept'] = 'application/vnd.github+json'
+    if token:
+        session.headers['Authorization'] = f"Bearer {token}"
+    base = f"{API_URL}/repos/{full_name}"
+    fixture = {'repo': _get(session, base).json()}
+    try:
+        fixture['readme'] = _get(session, f"{base}/readme",
+                                 headers={'Accept': 'application/vnd.github.raw'}).content.decode('utf-8', 'replace')
+    except requests.HTTPError:
+        fixture['readme'] = None
+    fixture['contributors'] = _get_all(session, f"{base}/contributors", max_items)
+    fixture['languages'] = _get(session, f"{base}/languages").json()
+    fixture['releases'] = _get_all(session, f"{base}/releases", max_items)
+    fixture['files'], fixture['tree_truncated'] = _files(session, base, fixture['repo'].get('default_branch'))
+    return fixture
+
+
+def _files(session, base, ref):
+    """Every path of the default branch; only the manifests the scan reads are recorded with content"""
+    from content_scan import is_relevant, needs_content
+    tree = _get(session, f"{base}/git/trees/{ref or 'HEAD'}", params={'recursive': 1}).json()
+    files = {}
+    for item in tree.get('tree') or []:
+        if item['type'] != 'blob':
+            continue
+        text = ''
+        if is_relevant(item['path']) and needs_content(item['path']):
+            text = _get(session, f"{base}/git/blobs/{item['sha']}",
+                        headers={'Accept': 'application/vnd.github.raw'}).content.decode('utf-8', 'replace')
+        files[item['path']] = text
+    return files, bool(tree.get('truncated'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record a GitHub repository as a benchmark fixture')
+    parser.add_argument('repo', help='Repository as OWNER/REPO')
+    parser.add_argument('--name', help='Fixture name (default: REPO)')
+    parser.add_argument('--token', '-t', help='GitHub token (default: GITHUB_TOKEN)')
+    parser.add_argument('--max-items', type=int, default=5000, help='Maximum contributors and releases recorded (default: 5000)')
+    args = parser.parse_args()
+
+    fixture = record(args.repo, args.token or os.getenv('GITHUB_TOKEN'), args.max_items)
+    name = args.name or args.repo.split('/')[-1]
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    path = os.path.join(FIXTURE_DIR, f"{name}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(fixture, f, separators=(',', ':'))
+    print(f"Recorded {args.repo} to {path}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""Benchmark repository analysis and README generation against GitHub fixtures
+
+    python -m benchmarks.run [--scenario NAME ...] [--backend rest|graphql]
+                             [--repeat N] [--output FILE] [--compare FILE]
+
+Each scenario is served by a local stub of the GitHub API. Results are
+written as JSON (to stdout, or FILE with --output); --compare prints the
+change of every metric against an earlier results file.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import tracemalloc
+from benchmarks.fixtures import available, load
+from benchmarks.stub_server import StubGitHub
+
+# Metrics where a larger value is an improvement
+HIGHER_IS_BETTER = ('readmes_per_sec', 'cached_readmes_per_sec')
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _throughput(fn, min_time):
+    """Calls per second of fn, run for at least min_time seconds"""
+    count = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        count += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return count / elapsed
+
+
+def bench_scenario(stub, fixture, backend, repeat, min_time):
+    # Imported here so the analyzer picks up the stub's URL from the environment
+    from github_analyzer import GitHubAnalyzer
+    from response_cache import get_response_cache
+    from result_cache import result_cache
+    from manifest_cache import get_manifest_cache
+
+    owner, repo_name = fixture['repo']['full_name'].split('/')
+    analyzer = GitHubAnalyzer(token='benchmark-token', backend=backend)
+
+    def cold_analysis():
+        get_response_cache().clear()
+        get_manifest_cache().clear()
+        result_cache.invalidate()
+        return analyzer.analyze_repository(owner, repo_name, refresh=True)
+
+    # Cold: nothing cached, every call goes to the API
+    times = []
+    for _ in range(repeat):
+        stub.reset_calls()
+        start = time.perf_counter()
+        repo_data = cold_analysis()
+        times.append(time.perf_counter() - start)
+        calls = stub.reset_calls()
+    if repo_data is None:
+        raise RuntimeError(f"Analysis of {owner}/{repo_name} failed")
+
+    # Revalidated: every response comes back as 304 from the ETag cache, and
+    # manifests come from the manifest cache without downloading any blob
+    start = time.perf_counter()
+    analyzer.analyze_repository(owner, repo_name, refresh=True)
+    revalidated_time = time.perf_counter() - start
+    revalidated_calls = stub.reset_calls()
+
+    # Cached: the analysis itself is reused while the repository is unchanged
+    start = time.perf_counter()
+    analyzer.analyze_repository(owner, repo_name)
+    cached_time = time.perf_counter() - start
+    cached_calls = stub.reset_calls()
+
+    # Peak memory of one full analysis plus README generation
+    tracemalloc.start()
+    analyzer.generate_readme(cold_analysis())
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    stub.reset_calls()
+
+    def render_from_scratch():
+        analyzer.engine._rendered.clear()
+        analyzer.generate_readme(repo_data)
+
+    readme = analyzer.generate_readme(repo_data)
+    return {
+        'api_calls': sum(calls.values()),
+        'api_calls_by_endpoint': calls,
+        'analyze_wall_ms': round(statistics.median(times) * 1000, 2),
+        'analyze_wall_ms_min': round(min(times) * 1000, 2),
+        'revalidated_api_calls': sum(revalidated_calls.values()),
+        'revalidated_wall_ms': round(revalidated_time * 1000, 2),
+        'cached_api_calls': sum(cached_calls.values()),
+        'cached_wall_ms': round(cached_time * 1000, 2),
+        'peak_memory_kb': round(peak_memory / 1024, 1),
+        'readme_bytes': len(readme.encode('utf-8')),
+        'readmes_per_sec': round(_throughput(render_from_scratch, min_time), 1),
+        'cached_readmes_per_sec': round(_throughput(lambda: analyzer.generate_readme(repo_data), min_time), 1),
+    }
+
+
+def compare(results, baseline):
+    """Print the relative change of every shared metric, one line each"""
+    for scenario, metrics in results['results'].items():
+        before = baseline.get('results', {}).get(scenario)
+        if not before:
+            continue
+        for name, value in metrics.items():
+            old = before.get(name)
+            if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or not old:
+                continue
+            change = (value - old) / old * 100
+            better = change > 0 if name in HIGHER_IS_BETTER else change < 0
+            marker = '' if abs(change) < 5 else (' (better)' if better else ' (worse)')
+            print(f"{scenario:20} {name:26} {old:>12} -> {value:>12} {change:+7.1f}%{marker}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the analyzer and README generator')
+    parser.add_argument('--scenario', action='append', help=f"Scenario to run, repeatable (default: all of {', '.join(available())})")
+    parser.add_argument('--backend', choices=['rest', 'graphql'], default='rest', help='Analyzer backend (default: rest)')
+    parser.add_argument('--repeat', type=int, default=5, help='Cold analyses per scenario; the median is reported (default: 5)')
+    parser.add_argument('--min-time', type=float, default=1.0, help='Seconds each throughput measurement runs (default: 1)')
+    parser.add_argument('--output', '-o', help='Write the JSON results to a file instead of stdout')
+    parser.add_argument('--compare', metavar='FILE', help='Earlier results file to compare against')
+    args = parser.parse_args()
+
+    names = args.scenario or available()
+    fixtures = {name: load(name) for name in names}
+    stub = StubGitHub(fixtures.values()).start()
+    # Point the analyzer at the stub, with an isolated in-memory response cache
+    os.environ['GITHUB_API_URL'] = stub.url
+    os.environ['GITHUB_GRAPHQL_URL'] = f"{stub.url}/graphql"
+    os.environ['GITHUB_CACHE_BACKEND'] = 'memory'
+    os.environ['MANIFEST_CACHE_PATH'] = os.path.join(tempfile.mkdtemp(prefix='readme-bench-'), 'manifests.sqlite3')
+
+    results = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'backend': args.backend,
+            'repeat': args.repeat,
+        },
+        'results': {},
+    }
+    try:
+        for name, fixture in fixtures.items():
+            print(f"Running {name}...", file=sys.stderr)
+            results['results'][name] = bench_scenario(stub, fixture, args.backend, args.repeat, args.min_time)
+    finally:
+        stub.stop()
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark how long the command line takes to import, against a budget
+
+    python -m benchmarks.startup [--scenario NAME ...] [--repeat N]
+                                 [--budget SCENARIO=MS ...] [--output FILE]
+
+Every scenario imports what one kind of invocation needs in a fresh
+interpreter with ``-X importtime``. The time reported is the median of the
+imports beyond what the bare interpreter loads, so it leaves out Python's
+own startup. Exits with status 1 when a scenario is over its budget.
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What each kind of invocation imports before it does any work
+SCENARIOS = {
+    # Every invocation, and all that a --connect client needs
+    'cli': 'import cli',
+    # --local, written as Markdown
+    'local': 'import cli, local_repo, readme_engine',
+    # Analysis over the GitHub API
+    'github': 'import cli, github_analyzer',
+    # --format html
+    'html': 'import cli, local_repo, readme_engine, markdown_render; markdown_render.get_renderer()',
+}
+DEFAULT_BUDGETS_MS = {'cli': 50, 'local': 250}
+
+
+def _imports(code):
+    """{module: cumulative microseconds} of the top-level imports made by ``code``"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.split(':', 1)[1].split('|')
+        # Nested imports are indented under the module that made them
+        if not name.startswith('  '):
+            modules[name.strip()] = int(cumulative_us)
+    return modules
+
+
+def measure(code, baseline, repeat):
+    totals = []
+    slowest = {}
+    for _ in range(repeat):
+        modules = {name: us for name, us in _imports(code).items() if name not in baseline}
+        totals.append(sum(modules.values()))
+        for name, us in modules.items():
+            slowest.setdefault(name, []).append(us)
+    top = sorted(((statistics.median(v), k) for k, v in slowest.items()), reverse=True)[:5]
+    return {
+        'import_ms': round(statistics.median(totals) / 1000, 1),
+        'import_ms_min': round(min(totals) / 1000, 1),
+        'slowest_ms': {name: round(us / 1000, 1) for us, name in top},
+    }
+
+
+def _budget(value):
+    scenario, _, ms = value.partition('=')
+    if scenario not in SCENARIOS or not ms:
+        raise argparse.ArgumentTypeError(f"expected SCENARIO=MS with SCENARIO one of {', '.join(SCENARIOS)}")
+    return scenario, float(ms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark command-line import time')
+    parser.add_argument('--scenario', action='append', choices=list(SCENARIOS), help='Scenario to run, repeatable (default: all)')
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh interpreters per scenario; the median is reported (default: 5)')
+    parser.add_argument('--budget', type=_budget, action='append', metavar='SCENARIO=MS',
+                        help=f"Import budget in milliseconds, repeatable (default: {', '.join(f'{k}={v}' for k, v in DEFAULT_BUDGETS_MS.items())})")
+    parser.add_argument('--output', '-o', help='Write the JSON results to a file instead of stdout')
+    args = parser.parse_args()
+
+    budgets = dict(DEFAULT_BUDGETS_MS, **dict(args.budget or []))
+    baseline = set(_imports('pass'))
+    results = {}
+    for name in args.scenario or SCENARIOS:
+        print(f"Running {name}...", file=sys.stderr)
+        results[name] = measure(SCENARIOS[name], baseline, args.repeat)
+
+    output = json.dumps({'python': sys.version.split()[0], 'budgets_ms': budgets, 'results': results}, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    over = [name for name, result in results.items() if name in budgets and result['import_ms'] > budgets[name]]
+    for name in over:
+        print(f"{name}: imports take {results[name]['import_ms']} ms, over the {budgets[name]} ms budget", file=sys.stderr)
+    if over:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,253 @@
+import io
+import re
+import sys
+import json
+import time
+import base64
+import hashlib
+import tarfile
+import posixpath
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, urlencode
+
+# Local stand-in for the GitHub REST and GraphQL endpoints the analyzer uses,
+# serving fixtures (see fixtures.py). List endpoints are paginated from the
+# full fixture lists with real Link headers, responses carry ETags and answer
+# If-None-Match with 304, and every request is counted per endpoint. The
+# fixture's files are served as a recursive tree listing, blobs by SHA and a
+# tarball written in git archive order.
+
+REPO_PATH = re.compile(r'^/repos/([^/]+)/([^/]+)(?:/(readme|languages|contributors|releases|tarball|git/trees|git/blobs)(?:/([^/]+))?)?$')
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # The content scan closes a tarball download early on purpose
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StubGitHub:
+    def __init__(self, fixtures):
+        self.fixtures = {f['repo']['full_name'].lower(): f for f in fixtures}
+        self.calls = {}
+        self._content = {}
+        self._lock = threading.Lock()
+        self.server = None
+        self.url = None
+
+    def start(self):
+        stub = self
+        # Build trees and tarballs now, so they aren't timed as part of an analysis
+        for fixture in self.fixtures.values():
+            self.content(fixture)
+
+        class Handler(_Handler):
+            github = stub
+
+        self.server = _Server(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def count(self, endpoint):
+        with self._lock:
+            self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+
+    def reset_calls(self):
+        with self._lock:
+            calls, self.calls = self.calls, {}
+        return calls
+
+    def content(self, fixture):
+        """(tree listing, {blob sha: bytes}, tarball) of a fixture's files, built on first use"""
+        key = fixture['repo']['full_name'].lower()
+        with self._lock:
+            if key not in self._content:
+                self._content[key] = _content(fixture)
+            return self._content[key]
+
+
+def _blob_sha(data):
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+
+def _tree_order(path):
+    """Sort key putting paths in git tree order, as git archive writes them"""
+    parts = path.split('/')
+    return tuple(part + '/' for part in parts[:-1]) + (parts[-1],)
+
+
+def _content(fixture):
+    files = {path: text.encode('utf-8') for path, text in (fixture.get('files') or {}).items()}
+    blobs = {_blob_sha(data): data for data in files.values()}
+    dirs = {posixpath.dirname(path) for path in files}
+    for directory in list(dirs):
+        while directory:
+            directory = posixpath.dirname(directory)
+            dirs.add(directory)
+    dirs.discard('')
+    entries = sorted([(d, None) for d in dirs] + list(files.items()),
+                     key=lambda entry: _tree_order(entry[0] + '/' if entry[1] is None else entry[0]))
+
+    tree = [{'path': path, 'mode': '040000', 'type': 'tree'} if data is None else
+            {'path': path, 'mode': '100644', 'type': 'blob', 'sha': _blob_sha(data), 'size': len(data)}
+            for path, data in entries]
+    listing = {'sha': 'HEAD', 'tree': tree, 'truncated': bool(fixture.get('tree_truncated'))}
+
+    prefix = fixture['repo']['full_name'].replace('/', '-') + '-0000000/'
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode='w:gz') as tar:
+        root = tarfile.TarInfo(prefix)
+        root.type = tarfile.DIRTYPE
+        tar.addfile(root)
+        for path, data in entries:
+            info = tarfile.TarInfo(prefix + path)
+            if data is None:
+                info.type = tarfile.DIRTYPE
+                tar.addfile(info)
+            else:
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+    return listing, blobs, buf.getvalue()
+
+
+def graphql_repository(fixture, releases=3):
+    """Answer the analyzer's repository query from a REST-shaped fixture"""
+    repo = fixture['repo']
+    license_info = repo.get('license')
+    return {
+        'name': repo['name'],
+        'nameWithOwner': repo['full_name'],
+        'description': repo.get('description'),
+        'url': repo['html_url'],
+        'isPrivate': repo.get('private', False),
+        'createdAt': repo.get('created_at'),
+        'updatedAt': repo.get('updated_at'),
+        'pushedAt': repo.get('pushed_at'),
+        'forkCount': repo.get('forks_count', 0),
+        'stargazerCount': repo.get('stargazers_count', 0),
+        'defaultBranchRef': {'name': repo.get('default_branch')},
+        'primaryLanguage': {'name': repo['language']} if repo.get('language') else None,
+        'licenseInfo': {'name': license_info['name']} if license_info else None,
+        'issues': {'totalCount': repo.get('open_issues_count', 0)},
+        'pullRequests': {'totalCount': 0},
+        'repositoryTopics': {'nodes': [{'topic': {'name': t}} for t in repo.get('topics') or []]},
+        'languages': {'edges': [{'size': size, 'node': {'name': name}}
+                                for name, size in fixture['languages'].items()]},
+        'releases': {'nodes': [{
+            'tagName': r['tag_name'],
+            'name': r.get('name'),
+            'publishedAt': r.get('published_at'),
+            'createdAt': r.get('created_at'),
+            'description': r.get('body'),
+        } for r in fixture['releases'][:releases]]},
+        'readme': {'text': fixture['readme']} if fixture.get('readme') is not None else None,
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    github = None
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, content_type='application/json', headers=None):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode('utf-8')
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if status == 200 and self.headers.get('If-None-Match') == etag:
+            status, body = 304, b''
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('X-RateLimit-Limit', '5000')
+        self.send_header('X-RateLimit-Remaining', '4999')
+        self.send_header('X-RateLimit-Reset', str(int(time.time()) + 3600))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _not_found(self):
+        self._send(404, {'message': 'Not Found'})
+
+    def _paginate(self, path, query, items):
+        per_page = min(int(query.get('per_page', ['30'])[0]), 100)
+        page = int(query.get('page', ['1'])[0])
+        last = max(1, -(-len(items) // per_page))
+        links = []
+        if page < last:
+            links.append(f'<{self._page_url(path, query, page + 1)}>; rel="next"')
+            links.append(f'<{self._page_url(path, query, last)}>; rel="last"')
+        headers = {'Link': ', '.join(links)} if links else None
+        self._send(200, items[(page - 1) * per_page:page * per_page], headers=headers)
+
+    def _page_url(self, path, query, page):
+        params = {k: v[0] for k, v in query.items()}
+        params['page'] = page
+        return f"{self.github.url}{path}?{urlencode(params)}"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        match = REPO_PATH.match(url.path)
+        fixture = match and self.github.fixtures.get(f"{match.group(1)}/{match.group(2)}".lower())
+        endpoint = (match.group(3) or 'repo') if match else url.path
+        self.github.count(endpoint)
+        if not fixture:
+            return self._not_found()
+        if endpoint in ('git/trees', 'git/blobs', 'tarball'):
+            return self._content(endpoint, match.group(4), fixture)
+        if endpoint == 'repo':
+            return self._send(200, fixture['repo'])
+        if endpoint == 'readme':
+            if fixture.get('readme') is None:
+                return self._not_found()
+            text = fixture['readme'].encode('utf-8')
+            if 'raw' in self.headers.get('Accept', ''):
+                return self._send(200, text, content_type='text/plain; charset=utf-8')
+            return self._send(200, {'name': 'README.md', 'encoding': 'base64',
+                                    'content': base64.b64encode(text).decode('ascii')})
+        if endpoint == 'languages':
+            return self._send(200, fixture['languages'])
+        if endpoint in ('contributors', 'releases'):
+            return self._paginate(url.path, query, fixture[endpoint])
+        self._not_found()
+
+    def _content(self, endpoint, ref, fixture):
+        listing, blobs, tarball = self.github.content(fixture)
+        if endpoint == 'git/trees':
+            return self._send(200, listing)
+        if endpoint == 'tarball':
+            return self._send(200, tarball, content_type='application/x-gzip')
+        data = blobs.get(ref)
+        if data is None:
+            return self._not_found()
+        if 'raw' in self.headers.get('Accept', ''):
+            return self._send(200, data, content_type='application/octet-stream')
+        return self._send(200, {'sha': ref, 'size': len(data), 'encoding': 'base64',
+                                'content': base64.b64encode(data).decode('ascii')})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        if urlsplit(self.path).path != '/graphql':
+            self.github.count(self.path)
+            return self._not_found()
+        self.github.count('graphql')
+        variables = payload.get('variables') or {}
+        fixture = self.github.fixtures.get(f"{variables.get('owner')}/{variables.get('name')}".lower())
+        repository = graphql_repository(fixture, variables.get('releases', 3)) if fixture else None
+        self._send(200, {'data': {'repository': repository}})
@@ -0,0 +1,302 @@
+import os
+import sys
+import json
+import argparse
+
+# Command-line entry point. Only the standard library is imported up front;
+# the GitHub client (requests), the analyzer and the Markdown renderer are
+# imported by the code path that needs them, so `--local` never loads
+# requests and Markdown output never loads a Markdown renderer.
+#
+# `--serve SOCKET` keeps a process running with everything imported and the
+# HTTP sessions, response cache and rendered sections warm. `--connect SOCKET`
+# (or README_DAEMON_SOCKET) sends the request to it instead of analyzing
+# in-process; the client itself imports nothing beyond this module.
+README_DAEMON_SOCKET = os.getenv('README_DAEMON_SOCKET', '')
+
+
+class CommandError(Exception):
+    """An error to report to the user, who then gets exit status 1"""
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Generate a README for a GitHub repository')
+    parser.add_argument('repo_url', type=str, nargs='?', help='GitHub repository URL')
+    parser.add_argument('--local', type=str, metavar='PATH', help='Analyze a local checkout from its files and git history, without network access')
+    parser.add_argument('--output', '-o', type=str, default='README.md', help='Output file path, or - for standard output (default: README.md)')
+    parser.add_argument('--format', choices=['markdown', 'html'], default='markdown', help='Write the README as Markdown or rendered to HTML (default: markdown)')
+    parser.add_argument('--token', '-t', type=str, help='GitHub Personal Access Token')
+    parser.add_argument('--backend', choices=['rest', 'graphql'], help='GitHub API used for analysis (default: ANALYZER_BACKEND or rest)')
+    parser.add_argument('--batch', type=str, metavar='FILE', help='Generate READMEs for every repository URL listed in FILE')
+    parser.add_argument('--org', type=str, metavar='NAME', help='Generate READMEs for every repository of an organization or user')
+    parser.add_argument('--output-dir', type=str, default='readmes', help='Batch output directory, written as OWNER/REPO/README.md (default: readmes)')
+    parser.add_argument('--workers', type=int, default=4, help='Repositories processed in parallel in batch mode (default: 4)')
+    parser.add_argument('--sections', type=str, help='README sections to include: full, minimal or a comma-separated list (default: README_SECTIONS or full)')
+    parser.add_argument('--template-dir', type=str, action='append', metavar='DIR', help='Directory of section templates overriding the built-in ones (repeatable)')
+    parser.add_argument('--serve', type=str, metavar='SOCKET', help='Run as a daemon answering requests on a Unix socket')
+    parser.add_argument('--connect', type=str, metavar='SOCKET', default=README_DAEMON_SOCKET or None,
+                        help='Have the daemon on SOCKET do the work (default: README_DAEMON_SOCKET)')
+    return parser
+
+
+def read_batch_file(path):
+    """Read repository URLs from a file, one per line, ignoring blanks and # comments"""
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+
+
+def run_batch(args):
+    """Generate READMEs for many repositories, printing one NDJSON line per repo"""
+    from batch import generate_batch, list_owner_repos
+    from github_client import GitHubClient, GitHubAPIError
+
+    token = args.token or os.getenv('GITHUB_TOKEN')
+    repo_urls = read_batch_file(args.batch) if args.batch else []
+    if args.org:
+        try:
+            repo_urls += list_owner_repos(GitHubClient(token), args.org)
+        except GitHubAPIError as e:
+            print(f"Error: Could not list repositories for {args.org}: {e}")
+            sys.exit(1)
+
+    failures = 0
+    for result in generate_batch(repo_urls, token=token, backend=args.backend, workers=args.workers,
+                                 sections=args.sections, template_dirs=args.template_dir):
+        readme = result.pop('readme', None)
+        if readme is not None:
+            path = os.path.join(args.output_dir, *result['full_name'].split('/'), 'README.md')
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(readme)
+            result['output'] = path
+        else:
+            failures += 1
+        print(json.dumps(result), flush=True)
+
+    if failures:
+        sys.exit(1)
+
+
+def _analyze_remote(args, log):
+    """Analyze the repository at args.repo_url over the GitHub API; returns (repo_data, engine)"""
+    from github_analyzer import GitHubAnalyzer
+    from github_client import GitHubAPIError
+    from rate_limit import RateLimitExceeded
+
+    # A token given on the command line or in GITHUB_TOKEN is the user's own
+    analyzer = GitHubAnalyzer(token=args.token or os.getenv('GITHUB_TOKEN'), backend=args.backend,
+                              template_dirs=args.template_dir)
+    owner, repo_name = analyzer.get_repo_info(args.repo_url)
+    if not owner or not repo_name:
+        raise CommandError("Error: Invalid GitHub repository URL")
+
+    log(f"Analyzing repository: {owner}/{repo_name}")
+    try:
+        repo_data = analyzer.analyze_repository(owner, repo_name)
+    except RateLimitExceeded as e:
+        raise CommandError(f"Error: {e}. Please provide a GitHub token or try again later.")
+    except GitHubAPIError as e:
+        if e.status == 404:
+            raise CommandError("Error: Repository not found or access denied")
+        if e.status == 403 and 'rate limit' in str(e).lower():
+            raise CommandError("Error: GitHub API rate limit exceeded. Please provide a GitHub token.")
+        raise CommandError(f"GitHub API Error: {e}")
+    if not repo_data:
+        raise CommandError("Error: Could not analyze repository")
+    return repo_data, analyzer.engine
+
+
+def generate(args, log=print):
+    """Analyze the repository ``args`` names and return its README as an iterable of chunks
+
+    Markdown is yielded section by section as it is rendered; HTML comes
+    as one chunk. Raises CommandError with the message to show.
+    """
+    from readme_engine import get_engine, resolve_sections
+
+    try:
+        resolve_sections(args.sections)
+    except ValueError as e:
+        raise CommandError(f"Error: {e}")
+    if args.local:
+        from local_repo import analyze_local
+        log(f"Analyzing local repository: {args.local}")
+        try:
+            repo_data = analyze_local(args.local)
+        except (ValueError, OSError) as e:
+            raise CommandError(f"Error: {e}")
+        engine = get_engine(args.template_dir)
+    else:
+        repo_data, engine = _analyze_remote(args, log)
+
+    chunks = engine.iter_render(repo_data, args.sections)
+    if args.format == 'html':
+        from markdown_render import render_markdown
+        return [render_markdown(''.join(chunks))]
+    return chunks
+
+
+class _Output:
+    """Writes README chunks to a file, opened on the first chunk so a failed run leaves it untouched"""
+
+    def __init__(self, path, stdout):
+        self.path = path
+        self.stdout = stdout
+        self.file = None
+
+    def write(self, chunk):
+        if self.path == '-':
+            self.stdout.write(chunk)
+            self.stdout.flush()
+            return
+        if self.file is None:
+            self.file = open(self.path, 'w', encoding='utf-8')
+        self.file.write(chunk)
+        self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+
+def _finish(args, out):
+    out.close()
+    if args.output != '-':
+        print(f"✅ README generated successfully at {args.output}")
+
+
+def run_local(args, stdout):
+    out = _Output(args.output, stdout)
+    try:
+        for chunk in generate(args):
+            out.write(chunk)
+    except CommandError as e:
+        out.close()
+        print(str(e))
+        return 1
+    except Exception as e:
+        out.close()
+        print(f"Error: {e}")
+        return 1
+    _finish(args, out)
+    return 0
+
+
+def run_remote(args, stdout):
+    """Have the daemon generate the README; returns the exit status, or None if it can't be reached"""
+    import socket
+
+    request = dict(vars(args), token=args.token or os.getenv('GITHUB_TOKEN'))
+    # The daemon runs elsewhere, so paths are sent resolved
+    if args.local:
+        request['local'] = os.path.abspath(args.local)
+    if args.template_dir:
+        request['template_dir'] = [os.path.abspath(d) for d in args.template_dir]
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(args.connect)
+    except OSError:
+        return None
+    out = _Output(args.output, stdout)
+    status = 1
+    with sock, sock.makefile('r', encoding='utf-8') as replies:
+        sock.sendall((json.dumps(request) + '\n').encode('utf-8'))
+        for line in replies:
+            reply = json.loads(line)
+            if 'chunk' in reply:
+                out.write(reply['chunk'])
+            elif 'log' in reply:
+                print(reply['log'])
+            elif 'exit' in reply:
+                status = reply['exit']
+    if status == 0:
+        _finish(args, out)
+    else:
+        out.close()
+    return status
+
+
+def serve(path):
+    """Answer requests from `--connect` clients on a Unix socket until interrupted"""
+    import stat
+    import signal
+    import socketserver
+    # Import everything now, so the first request is as fast as the next ones
+    import github_analyzer
+    import local_repo
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            def send(reply):
+                self.wfile.write((json.dumps(reply) + '\n').encode('utf-8'))
+                self.wfile.flush()
+
+            status = 1
+            try:
+                args = argparse.Namespace(**json.loads(self.rfile.readline()))
+                for chunk in generate(args, log=lambda message: send({'log': message})):
+                    send({'chunk': chunk})
+                status = 0
+            except CommandError as e:
+                send({'log': str(e)})
+            except Exception as e:
+                send({'log': f"Error: {e}"})
+            send({'exit': status})
+
+    # Replace a socket left behind by an earlier daemon, but never another file
+    if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+        os.unlink(path)
+    server = socketserver.ThreadingUnixStreamServer(path, Handler)
+    server.daemon_threads = True
+    # Requests carry tokens, so only this user may connect
+    os.chmod(path, 0o600)
+    # Stop cleanly on SIGTERM too, so the socket file is removed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"Serving README generation on {path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(path)
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.serve)
+        return
+    if not args.connect or args.batch or args.org:
+        # The daemon checks the sections itself, so clients don't import the engine
+        from readme_engine import resolve_sections
+        try:
+            resolve_sections(args.sections)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.batch or args.org:
+        run_batch(args)
+        return
+    if not args.repo_url and not args.local:
+        parser.error('a repository URL, --local PATH, --batch FILE or --org NAME is required')
+
+    readme_out = sys.stdout
+    if args.output == '-':
+        # Keep standard output for the README itself; messages go to stderr
+        sys.stdout = sys.stderr
+
+    status = None
+    if args.connect:
+        status = run_remote(args, readme_out)
+        if status is None:
+            print(f"Could not reach the daemon at {args.connect}; running in-process")
+    if status is None:
+        status = run_local(args, readme_out)
+    if status:
+        sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
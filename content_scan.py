@@ -0,0 +1,417 @@
+import os
+import re
+import json
+import time
+import tarfile
+import posixpath
+from dotenv import load_dotenv
+from rate_limit import PriorityExecutor
+
+try:
+    import tomllib
+except ImportError:
+    # Python 3.10: the same parser from PyPI
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# Load environment variables
+load_dotenv()
+
+# The repository's files are found through its recursive tree listing, which
+# gives every path with its blob SHA. Manifests (requirements.txt,
+# package.json, go.mod, ...) are looked up in the manifest cache by SHA and
+# only the ones never seen before are downloaded and parsed, so regenerating
+# many repositories mostly costs the tree listing.
+#
+# When the listing is too large for GitHub to return in full, the tarball is
+# streamed in one request instead and never extracted: manifests are parsed
+# as their tar members go by and everything else is skipped. That scan stops
+# at SCAN_MAX_BYTES of download or after SCAN_TIMEOUT seconds, and as soon as
+# the root-level files that matter have gone by (see _scan_done); manifests
+# in directories sorting after them are then not seen.
+SCAN_MAX_BYTES = int(os.getenv('SCAN_MAX_BYTES', str(50 * 1024 * 1024)))
+SCAN_MAX_FILE_SIZE = int(os.getenv('SCAN_MAX_FILE_SIZE', str(256 * 1024)))
+SCAN_MAX_DEPTH = int(os.getenv('SCAN_MAX_DEPTH', '2'))
+SCAN_TIMEOUT = float(os.getenv('SCAN_TIMEOUT', '10'))
+SCAN_FETCH_WORKERS = int(os.getenv('SCAN_FETCH_WORKERS', '4'))
+
+# Bump when parse_manifest() output changes, so cached results are not reused
+PARSER_VERSION = 1
+
+_blob_executor = PriorityExecutor(SCAN_FETCH_WORKERS, 'gh-blob')
+
+# Files parsed for their content, by name
+MANIFESTS = {
+    'requirements.txt': 'python',
+    'pyproject.toml': 'python',
+    'setup.py': 'python',
+    'Pipfile': 'python',
+    'package.json': 'node',
+    'go.mod': 'go',
+    'Cargo.toml': 'rust',
+}
+# Files whose presence alone says something
+MARKERS = {
+    'Dockerfile': 'docker',
+    'docker-compose.yml': 'docker', 'docker-compose.yaml': 'docker', 'compose.yml': 'docker', 'compose.yaml': 'docker',
+    'yarn.lock': 'node', 'pnpm-lock.yaml': 'node',
+    'app.py': 'python', 'main.py': 'python', 'manage.py': 'python',
+    'index.js': 'node', 'server.js': 'node',
+    'main.go': 'go',
+}
+# Root-level files that decide whether an ecosystem is used, and the ones
+# that only refine an ecosystem already found at the root (lockfiles, entry points)
+ROOT_DECIDING = set(MANIFESTS) | {name for name, kind in MARKERS.items() if kind == 'docker'}
+ROOT_REFINING = {}
+for _name, _kind in MARKERS.items():
+    if _kind != 'docker':
+        ROOT_REFINING.setdefault(_kind, set()).add(_name)
+
+CATEGORIES = ['Languages', 'Frontend', 'Backend', 'Database', 'Data & ML', 'Testing', 'DevOps']
+# Dependency name -> (category, display name)
+KNOWN_PACKAGES = {
+    'flask': ('Backend', 'Flask'),
+    'django': ('Backend', 'Django'),
+    'fastapi': ('Backend', 'FastAPI'),
+    'streamlit': ('Frontend', 'Streamlit'),
+    'sqlalchemy': ('Database', 'SQLAlchemy'),
+    'psycopg2': ('Database', 'PostgreSQL'),
+    'psycopg2-binary': ('Database', 'PostgreSQL'),
+    'psycopg': ('Database', 'PostgreSQL'),
+    'pymongo': ('Database', 'MongoDB'),
+    'redis': ('Database', 'Redis'),
+    'celery': ('Backend', 'Celery'),
+    'pandas': ('Data & ML', 'pandas'),
+    'numpy': ('Data & ML', 'NumPy'),
+    'scikit-learn': ('Data & ML', 'scikit-learn'),
+    'torch': ('Data & ML', 'PyTorch'),
+    'tensorflow': ('Data & ML', 'TensorFlow'),
+    'pytest': ('Testing', 'pytest'),
+    'react': ('Frontend', 'React'),
+    'vue': ('Frontend', 'Vue.js'),
+    'next': ('Frontend', 'Next.js'),
+    '@angular/core': ('Frontend', 'Angular'),
+    'svelte': ('Frontend', 'Svelte'),
+    'tailwindcss': ('Frontend', 'Tailwind CSS'),
+    'vite': ('Frontend', 'Vite'),
+    'express': ('Backend', 'Express'),
+    'mongoose': ('Database', 'MongoDB'),
+    'pg': ('Database', 'PostgreSQL'),
+    'typescript': ('Languages', 'TypeScript'),
+    'jest': ('Testing', 'Jest'),
+    'vitest': ('Testing', 'Vitest'),
+    'github.com/gin-gonic/gin': ('Backend', 'Gin'),
+    'actix-web': ('Backend', 'Actix Web'),
+    'tokio': ('Backend', 'Tokio'),
+}
+
+_REQUIREMENT = re.compile(r'^\s*([A-Za-z0-9][A-Za-z0-9._-]*)')
+
+
+class ScanLimitReached(Exception):
+    """The download cap or the time budget ran out"""
+
+
+def is_relevant(path):
+    """Whether a repository path is a manifest, a marker or a workflow within the depth cap"""
+    if path.count('/') > SCAN_MAX_DEPTH:
+        return False
+    name = posixpath.basename(path)
+    if name in MANIFESTS or name in MARKERS or (name.startswith('requirements') and name.endswith('.txt')):
+        return True
+    return path.startswith('.github/workflows/') and name.endswith(('.yml', '.yaml'))
+
+
+def needs_content(path):
+    """Whether a relevant path has to be read, rather than just seen"""
+    name = posixpath.basename(path)
+    return name in MANIFESTS or (name.startswith('requirements') and name.endswith('.txt'))
+
+
+def _requirement_names(lines):
+    names = []
+    for line in lines:
+        line = line.split('#', 1)[0]
+        match = _REQUIREMENT.match(line)
+        if match and not line.lstrip().startswith('-'):
+            names.append(match.group(1).lower())
+    return names
+
+
+def parse_manifest(path, data):
+    """Parse one manifest into {'kind', 'deps', 'scripts'}; returns None if it can't be read"""
+    name = posixpath.basename(path)
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+    kind = MANIFESTS.get(name, 'python')
+    parsed = {'kind': kind, 'deps': [], 'scripts': []}
+    try:
+        if name.startswith('requirements'):
+            parsed['deps'] = _requirement_names(text.splitlines())
+        elif name == 'package.json':
+            package = json.loads(text)
+            parsed['deps'] = sorted(set(package.get('dependencies') or {}) | set(package.get('devDependencies') or {}))
+            parsed['scripts'] = sorted(package.get('scripts') or {})
+        elif name in ('pyproject.toml', 'Cargo.toml', 'Pipfile') and tomllib is not None:
+            toml = tomllib.loads(text)
+            if name == 'pyproject.toml':
+                project = toml.get('project') or {}
+                poetry = (toml.get('tool') or {}).get('poetry') or {}
+                parsed['deps'] = _requirement_names(project.get('dependencies') or []) + \
+                    [d.lower() for d in poetry.get('dependencies') or {} if d != 'python']
+                parsed['scripts'] = sorted(set(project.get('scripts') or {}) | set(poetry.get('scripts') or {}))
+            elif name == 'Pipfile':
+                parsed['deps'] = [d.lower() for d in toml.get('packages') or {}]
+            else:
+                parsed['deps'] = sorted(toml.get('dependencies') or {})
+                parsed['scripts'] = [b['name'] for b in toml.get('bin') or [] if b.get('name')]
+        elif name == 'go.mod':
+            parsed['deps'] = re.findall(r'^\s*(?:require\s+)?([\w.-]+\.[\w.-]+/[\w./-]+)\s+v', text, re.M)
+    except (ValueError, TypeError, AttributeError) as e:
+        # tomllib.TOMLDecodeError and json.JSONDecodeError are ValueErrors
+        print(f"Could not parse {path}: {e}")
+        return None
+    return parsed
+
+
+def manifest_key(path, sha):
+    """Manifest cache key: the parse result depends on the blob and the file name"""
+    return f"{PARSER_VERSION}:{posixpath.basename(path)}:{sha}"
+
+
+def build_stack(name, paths, parsed):
+    """Combine the relevant paths and parsed manifests of a repository into README inputs
+
+    ``paths`` are all relevant paths seen, ``parsed`` maps manifest paths to
+    parse_manifest() results. Commands come from root-level files only.
+    """
+    root = {p for p in paths if '/' not in p}
+    kinds = {MANIFESTS.get(posixpath.basename(p)) or MARKERS.get(posixpath.basename(p)) for p in paths}
+    if any(p.startswith('.github/workflows/') for p in paths):
+        kinds.add('actions')
+    if any(posixpath.basename(p).startswith('requirements') for p in paths):
+        kinds.add('python')
+    stack = {category: [] for category in CATEGORIES}
+
+    def add(category, tech):
+        if tech not in stack[category]:
+            stack[category].append(tech)
+
+    deps = set()
+    for manifest in parsed.values():
+        if manifest:
+            deps.update(manifest['deps'])
+    for language, kind in (('Python', 'python'), ('Node.js', 'node'), ('Go', 'go'), ('Rust', 'rust')):
+        if kind in kinds:
+            add('Languages', language)
+    for dep in sorted(deps):
+        if dep in KNOWN_PACKAGES:
+            add(*KNOWN_PACKAGES[dep])
+    if 'docker' in kinds:
+        add('DevOps', 'Docker')
+    if root & {'docker-compose.yml', 'docker-compose.yaml', 'compose.yml', 'compose.yaml'}:
+        add('DevOps', 'Docker Compose')
+    if 'actions' in kinds:
+        add('DevOps', 'GitHub Actions')
+
+    prerequisites, install, run = [], [], []
+    root_manifest = {posixpath.basename(p): parsed.get(p) or {} for p in root}
+    if root & {'requirements.txt', 'pyproject.toml', 'setup.py', 'Pipfile', 'manage.py', 'app.py', 'main.py'}:
+        prerequisites += ['Python 3', 'pip']
+        if 'requirements.txt' in root:
+            install.append('pip install -r requirements.txt')
+        elif 'Pipfile' in root:
+            install.append('pipenv install')
+        elif root & {'pyproject.toml', 'setup.py'}:
+            install.append('pip install .')
+        scripts = (root_manifest.get('pyproject.toml') or {}).get('scripts') or []
+        if 'manage.py' in root:
+            run.append('python manage.py runserver')
+        elif 'streamlit' in deps and root & {'app.py', 'main.py'}:
+            run.append(f"streamlit run {'app.py' if 'app.py' in root else 'main.py'}")
+        elif scripts:
+            run.append(scripts[0])
+        elif root & {'app.py', 'main.py'}:
+            run.append(f"python {'app.py' if 'app.py' in root else 'main.py'}")
+    if 'package.json' in root:
+        manager = 'pnpm' if 'pnpm-lock.yaml' in root else 'yarn' if 'yarn.lock' in root else 'npm'
+        prerequisites += ['Node.js', manager]
+        install.append(f"{manager} install")
+        scripts = root_manifest['package.json'].get('scripts') or []
+        if 'start' in scripts:
+            run.append(f"{manager} start")
+        elif 'dev' in scripts:
+            run.append(f"{manager} run dev")
+        elif root & {'index.js', 'server.js'}:
+            run.append(f"node {'server.js' if 'server.js' in root else 'index.js'}")
+    if 'go.mod' in root:
+        prerequisites.append('Go')
+        install.append('go mod download')
+        commands = sorted(p for p in paths if p.startswith('cmd/') and p.endswith('/main.go'))
+        if 'main.go' in root:
+            run.append('go run .')
+        elif commands:
+            run.append(f"go run ./{posixpath.dirname(commands[0])}")
+    if 'Cargo.toml' in root:
+        prerequisites.append('Rust and Cargo')
+        install.append('cargo build --release')
+        run.append('cargo run')
+    if root & {'docker-compose.yml', 'docker-compose.yaml', 'compose.yml', 'compose.yaml'}:
+        prerequisites.append('Docker')
+        run.append('docker compose up')
+    elif 'Dockerfile' in root:
+        image = re.sub(r'[^a-z0-9_.-]', '-', (name or 'app').lower())
+        prerequisites.append('Docker')
+        run.append(f"docker build -t {image} . && docker run {image}")
+
+    return {
+        'manifests': sorted(parsed),
+        'tech_stack': {category: techs for category, techs in stack.items() if techs},
+        'prerequisites': prerequisites,
+        'install': install,
+        'run': run,
+    }
+
+
+def _scan_done(position, paths):
+    """Whether no root-level file still to come in a tarball could change the result
+
+    GitHub builds tarballs with git archive, which writes entries in git tree
+    order: sorted by name, with a directory's contents right after it (as
+    "name/"). Every root-level name sorting before ``position`` has gone by.
+    """
+    wanted = set(ROOT_DECIDING)
+    for path in paths:
+        if '/' not in path:
+            wanted |= ROOT_REFINING.get(MANIFESTS.get(path) or MARKERS.get(path), set())
+    return all(name <= position for name in wanted)
+
+
+class _LimitedReader:
+    """File-like view of a response body that stops at a byte cap and a deadline"""
+
+    def __init__(self, raw, max_bytes, deadline):
+        self.raw = raw
+        self.max_bytes = max_bytes
+        self.deadline = deadline
+        self.count = 0
+
+    def read(self, size=-1):
+        if self.count >= self.max_bytes or time.monotonic() > self.deadline:
+            raise ScanLimitReached()
+        data = self.raw.read(size if size and size > 0 else 64 * 1024)
+        self.count += len(data)
+        return data
+
+
+def scan_tarball(client, full_name, ref=None, name=None, max_bytes=SCAN_MAX_BYTES, timeout=SCAN_TIMEOUT):
+    """Stream a repository tarball and detect its stack, install steps and entry points"""
+    # The GitHub client and the cache are imported on use, so offline
+    # analysis (local_repo) can parse manifests without loading requests
+    from github_client import GitHubAPIError, blob_sha
+    from manifest_cache import get_manifest_cache
+    deadline = time.monotonic() + timeout
+    path = f"/repos/{full_name}/tarball" + (f"/{ref}" if ref else '')
+    resp = client.get(path, stream=True)
+    paths = set()
+    parsed = {}
+    found = {}
+    truncated = False
+    try:
+        if not resp.ok:
+            raise GitHubAPIError.from_response(resp)
+        resp.raw.decode_content = True
+        reader = _LimitedReader(resp.raw, max_bytes, deadline)
+        try:
+            with tarfile.open(fileobj=reader, mode='r|gz') as tar:
+                for member in tar:
+                    # Stream mode remembers every member; forget them to keep memory flat
+                    tar.members = []
+                    if time.monotonic() > deadline:
+                        raise ScanLimitReached()
+                    # Members are prefixed with a top-level "owner-repo-sha/" directory
+                    parts = member.name.split('/', 1)
+                    if len(parts) < 2:
+                        continue
+                    repo_path = parts[1]
+                    top, _, rest = repo_path.partition('/')
+                    position = top + '/' if rest or member.isdir() else top
+                    if member.isfile() and is_relevant(repo_path):
+                        paths.add(repo_path)
+                        if needs_content(repo_path) and member.size <= SCAN_MAX_FILE_SIZE:
+                            data = tar.extractfile(member).read()
+                            # Skip binary files that happen to have a manifest's name
+                            if b'\0' not in data[:8192]:
+                                parsed[repo_path] = parse_manifest(repo_path, data)
+                                found[manifest_key(repo_path, blob_sha(data))] = parsed[repo_path]
+                    if _scan_done(position, paths):
+                        break
+        except (ScanLimitReached, tarfile.ReadError, EOFError):
+            # A capped or cut-off download still tells us about the files seen so far
+            truncated = True
+    finally:
+        resp.close()
+    # Remember what was parsed, so a later tree scan needs no download
+    get_manifest_cache().set_many(found)
+    stack = build_stack(name or full_name.split('/')[-1], paths, parsed)
+    stack['truncated'] = truncated
+    return stack
+
+
+def _fetch_blob(client, full_name, sha):
+    """Raw content of a blob; it is immutable, so the response cache is bypassed"""
+    from github_client import GitHubAPIError
+    resp = client.request('GET', f"/repos/{full_name}/git/blobs/{sha}",
+                          headers={'Accept': 'application/vnd.github.raw'})
+    if not resp.ok:
+        raise GitHubAPIError.from_response(resp)
+    return resp.content
+
+
+def scan_tree(client, full_name, ref=None, name=None):
+    """Detect a repository's stack from its tree listing and cached or downloaded manifests
+
+    Falls back to scan_tarball() when GitHub truncates the listing.
+    """
+    from manifest_cache import get_manifest_cache
+    tree = client.get_json(f"/repos/{full_name}/git/trees/{ref or 'HEAD'}", params={'recursive': 1})
+    if tree.get('truncated'):
+        return scan_tarball(client, full_name, ref, name)
+
+    paths = set()
+    wanted = {}
+    for item in tree.get('tree') or []:
+        path = item['path']
+        if item['type'] != 'blob' or not is_relevant(path):
+            continue
+        paths.add(path)
+        if needs_content(path) and item.get('size', 0) <= SCAN_MAX_FILE_SIZE:
+            wanted[path] = manifest_key(path, item['sha'])
+
+    cache = get_manifest_cache()
+    cached = cache.get_many(set(wanted.values()))
+    parsed = {path: cached[key] for path, key in wanted.items() if key in cached}
+    missing = {}
+    for path, key in wanted.items():
+        if key not in cached:
+            # Identical manifests within the repository are downloaded once
+            missing.setdefault(key, path)
+
+    futures = {key: _blob_executor.submit(_fetch_blob, client, full_name, key.rsplit(':', 1)[1])
+               for key in missing}
+    found = {}
+    for key, future in futures.items():
+        data = future.result()
+        found[key] = parse_manifest(missing[key], data) if b'\0' not in data[:8192] else None
+    cache.set_many(found)
+    for path, key in wanted.items():
+        if key in found:
+            parsed[path] = found[key]
+
+    stack = build_stack(name or full_name.split('/')[-1], paths, parsed)
+    stack['truncated'] = False
+    return stack
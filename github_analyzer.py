@@ -1,397 +1,443 @@
-import os
-import sys
-import requests
-from github import Github, GithubException
-from datetime import datetime
-import markdown2
-import re
-from urllib.parse import urlparse, unquote
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-class GitHubAnalyzer:
-    def __init__(self, token=None):
-        """Initialize GitHub client with token if provided"""
-        self.token = token or os.getenv('GITHUB_TOKEN')
-        if not self.token:
-            print("Warning: No GitHub token provided. You may hit rate limits.")
-        self.g = Github(self.token) if self.token else Github()
-    
-    def get_repo_info(self, repo_url):
-        """Extract repository information from URL"""
-        try:
-            # Handle different GitHub URL formats
-            parsed = urlparse(repo_url)
-            if parsed.netloc != 'github.com':
-                raise ValueError("Only GitHub repository URLs are supported")
-                
-            # Extract path and clean it up
-            path = parsed.path.strip('/')
-            path = re.sub(r'\.git$', '', path)  # Remove .git if present
-            
-            # Split into parts
-            parts = path.split('/')
-            if len(parts) < 2:
-                raise ValueError("Invalid GitHub repository URL format")
-                
-            owner = parts[0]
-            repo_name = parts[1]
-            
-            # Clean up the repository name (remove any query parameters or fragments)
-            repo_name = repo_name.split('?')[0].split('#')[0]
-            
-            return owner, repo_name
-            
-        except Exception as e:
-            print(f"Error parsing repository URL: {e}")
-            return None, None
-    
-    def analyze_repository(self, owner, repo_name):
-        """Analyze GitHub repository and return metadata"""
-        try:
-            repo = self.g.get_repo(f"{owner}/{repo_name}")
-            
-            # Get basic repository information
-            repo_data = {
-                'name': repo.name,
-                'full_name': repo.full_name,
-                'description': repo.description or 'No description provided',
-                'url': repo.html_url,
-                'created_at': repo.created_at,
-                'updated_at': repo.updated_at,
-                'language': repo.language,
-                'forks_count': repo.forks_count,
-                'stargazers_count': repo.stargazers_count,
-                'open_issues_count': repo.open_issues_count,
-                'license': None,
-                'topics': [],
-                'readme': None,
-                'contributors': [],
-                'languages': {},
-                'releases': []
-            }
-            
-            # Get license information safely
-            try:
-                if repo.license:
-                    repo_data['license'] = repo.get_license().license.name
-            except:
-                pass
-                
-            # Get topics safely
-            try:
-                repo_data['topics'] = repo.get_topics()
-            except:
-                pass
-            
-            # Get README content safely
-            try:
-                readme = repo.get_readme()
-                repo_data['readme'] = markdown2.markdown(readme.decoded_content.decode('utf-8', errors='replace'))
-            except Exception as e:
-                print(f"Could not fetch README: {e}")
-                repo_data['readme'] = "No README found"
-            
-            # Get contributors (first 5) safely
-            try:
-                contributors = list(repo.get_contributors())[:5]  # Limit to first 5 contributors
-                repo_data['contributors'] = [{
-                    'login': c.login,
-                    'url': c.html_url,
-                    'contributions': c.contributions
-                } for c in contributors]
-            except Exception as e:
-                print(f"Could not fetch contributors: {e}")
-            
-            # Get languages safely
-            try:
-                repo_data['languages'] = repo.get_languages()
-            except Exception as e:
-                print(f"Could not fetch languages: {e}")
-            
-            # Get releases (first 3) safely
-            try:
-                releases = list(repo.get_releases())[:3]  # Get latest 3 releases
-                repo_data['releases'] = [{
-                    'tag_name': r.tag_name,
-                    'name': r.name or r.tag_name,
-                    'published_at': r.published_at or r.created_at,
-                    'body': (r.body[:200] + '...') if r.body else ''
-                } for r in releases if hasattr(r, 'tag_name')]
-            except Exception as e:
-                print(f"Could not fetch releases: {e}")
-                
-            return repo_data
-            
-        except Exception as e:
-            print(f"Error analyzing repository: {e}")
-            return None
-    
-    def generate_readme(self, repo_data):
-        """Generate a comprehensive README.md file based on repository data"""
-        if not repo_data:
-            return "# Error: Could not generate README - No repository data provided"
-        
-        # Get user information or use defaults
-        user_data = repo_data.get('user', {})
-        user_name = user_data.get('name', 'Your Name')
-        user_email = user_data.get('email', 'your.email@example.com')
-        portfolio_url = user_data.get('portfolio_url', '')
-        
-        # Initialize README with project title
-        project_name = repo_data.get('name', 'My Project')
-        readme = f"# {project_name}\n\n"
-        
-        # Add badges
-        badges = []
-        if repo_data.get('license'):
-            license_badge = repo_data['license'].replace(' ', '%20')
-            badges.append(f"![License](https://img.shields.io/badge/license-{license_badge}-blue)")
-        if repo_data.get('language'):
-            badges.append(f"![Language](https://img.shields.io/badge/language-{repo_data['language']}-blueviolet)")
-        if 'stargazers_count' in repo_data:
-            badges.append(f"![Stars](https://img.shields.io/github/stars/{repo_data['full_name']}?style=social)")
-        if 'forks_count' in repo_data:
-            badges.append(f"![Forks](https://img.shields.io/github/forks/{repo_data['full_name']}?style=social)")
-        
-        # Add badges (stars, license, etc.) if available
-        if badges:
-            readme += ' '.join(badges) + '\n\n'
-        
-        # Table of Contents
-        readme += "## 📋 Table of Contents\n"
-        sections = [
-            ("Features", "#-features"),
-            ("Getting Started", "#-getting-started"),
-            ("Prerequisites", "#prerequisites"),
-            ("Installation", "#installation"),
-            ("Usage", "#-usage"),
-            ("Tech Stack", "#-tech-stack"),
-            ("Contributing", "#-contributing"),
-            ("License", "#-license"),
-            ("Contact", "#-contact")
-        ]
-        
-        for section, link in sections:
-            readme += f"- [{section}]({link})\n"
-        readme += "\n"
-        
-        # Features
-        readme += "## ✨ Key Features\n\n"
-        if repo_data.get('topics') and len(repo_data['topics']) > 0:
-            # Use repository topics as features
-            features = []
-            for topic in repo_data['topics'][:5]:  # Limit to first 5 topics
-                # Convert topic to readable format (e.g., "machine-learning" -> "Machine Learning")
-                feature_name = ' '.join(word.capitalize() for word in topic.split('-'))
-                features.append(feature_name)
-        else:
-            # Default features if no topics available
-            features = [
-                "Modern UI: Clean and intuitive user interface",
-                "Responsive Design: Works on all devices and screen sizes",
-                "Easy Setup: Simple installation and configuration process"
-            ]
-        
-        for feature in features:
-            if ":" in feature:
-                # If feature is already in "Label: Description" format
-                label, desc = feature.split(":", 1)
-                readme += f"- ✅ **{label.strip()}**:{desc.strip()}\n"
-            else:
-                # If just a topic name, format it as a feature
-                readme += f"- ✅ **{feature}**: Core functionality for {feature.lower()}.\n"
-        readme += "\n"
-        
-        # Demo / Screenshots (after features)
-        readme += "## 🎥 Demo / Screenshots\n\n"
-        readme += "```markdown\n"
-        readme += "<!-- Add your screenshots here -->\n"
-        readme += "![Screenshot 1](screenshots/screenshot1.png)\n"
-        readme += "*Figure 1: Brief description of the screenshot*\n"
-        readme += "```\n\n"
-        
-        # Getting Started
-        readme += "## 🚀 Getting Started\n\n"
-        readme += "### Prerequisites\n\n"
-        
-        # Add prerequisites based on the project type
-        if repo_data.get('language') == 'Python':
-            readme += "- Python 3.8 or higher\n"
-            readme += "- pip (Python package manager)\n"
-            readme += "- Git\n\n"
-        elif repo_data.get('language') == 'JavaScript':
-            readme += "- Node.js (v14 or higher)\n"
-            readme += "- npm (Node package manager)\n"
-            readme += "- Git\n\n"
-        else:
-            readme += "- Git\n"
-            readme += "- [Specify other requirements]\n\n"
-        
-        readme += "### Installation\n\n"
-        readme += "1. **Clone the repository**\n\n"
-        readme += "```bash\n"
-        readme += f"git clone {repo_data['url']}.git\n"
-        readme += f"cd {repo_data['name']}\n"
-        readme += "```\n\n"
-        
-        # Add language-specific installation
-        if repo_data.get('language') == 'Python':
-            readme += "2. **Set up a virtual environment** (recommended)\n\n"
-            readme += "```bash\n"
-            readme += "# Create a virtual environment\n"
-            readme += "python -m venv venv\n"
-            readme += "# Activate the virtual environment\n"
-            readme += "# On Windows:\n"
-            readme += "venv\\Scripts\\activate\n"
-            readme += "# On macOS/Linux:\n"
-            readme += "source venv/bin/activate\n"
-            readme += "```\n\n"
-            readme += "3. **Install dependencies**\n\n"
-            readme += "```bash\n"
-            readme += "pip install -r requirements.txt\n"
-            readme += "```\n\n"
-        elif repo_data.get('language') == 'JavaScript':
-            readme += "2. **Install dependencies**\n\n"
-            readme += "```bash\n"
-            readme += "npm install\n"
-            readme += "```\n\n"
-        
-        # Usage
-        readme += "## 💻 Usage\n\n"
-        
-        if repo_data.get('language') == 'Python':
-            readme += "To run the application:\n\n"
-            readme += "```bash\n"
-            readme += "python main.py\n"
-            readme += "```\n\n"
-        elif repo_data.get('language') == 'JavaScript':
-            readme += "To run the application:\n\n"
-            readme += "```bash\n"
-            readme += "npm start\n"
-            readme += "```\n\n"
-        else:
-            readme += "To run the application:\n\n"
-            readme += "```bash\n"
-            readme += "python app.py  # for Python applications\n"
-            readme += "# or\n"
-            readme += "npm start     # for Node.js applications\n"
-            readme += "```\n\n"
-            
-        # Configuration
-        readme += "## 🔧 Configuration\n\n"
-        readme += "Create a `.env` file in the root directory for environment-specific settings.\n\n"
-        
-        # Tech Stack
-        readme += "## 🛠️ Tech Stack\n\n"
-        
-        tech_stack = {
-            "Frontend": ["HTML", "CSS", "JavaScript"],
-            "Backend": ["Python"],
-            "Database": ["SQLite"],
-            "DevOps": ["Docker", "GitHub Actions"]
-        }
-        
-        for category, techs in tech_stack.items():
-            readme += f"**{category}**\\n"
-            for tech in techs:
-                readme += f"- {tech}\\n"
-            readme += "\n"
-        
-        # Contributing
-        readme += "## 🤝 Contributing\n\n"
-        readme += "Contributions are what make the open-source community such an amazing place to learn, inspire, and create. Any contributions you make are **greatly appreciated**.\n\n"
-        readme += "1. Fork the Project\n"
-        readme += "2. Create your Feature Branch (`git checkout -b feature/AmazingFeature`)\n"
-        readme += "3. Commit your Changes (`git commit -m 'Add some AmazingFeature'`)\n"
-        readme += "4. Push to the Branch (`git push origin feature/AmazingFeature`)\n"
-        readme += "5. Open a Pull Request\n\n"
-        
-        # License
-        readme += f"## 📄 License\n\n"
-        if repo_data.get('license'):
-            readme += f"Distributed under the {repo_data['license']} License. See `LICENSE` for more information.\n\n"
-        else:
-            readme += "Distributed under the MIT License. See `LICENSE` for more information.\n\n"
-        
-        # Contact
-        readme += "## 📫 Contact\n\n"
-        readme += f"**{user_name}**\n"
-        
-        if user_email:
-            readme += f"📧 {user_email}\n"
-            
-        if portfolio_url:
-            readme += f"🌐 [{portfolio_url}]({portfolio_url})\n"
-            
-        readme += f"🔗 Project Link: [{repo_data['url']}]({repo_data['url']})\n\n"
-        
-        # Contributors
-        if repo_data.get('contributors'):
-            readme += "## 👥 Contributors\n\n"
-            readme += "Thanks to these wonderful people who have contributed to this project!\n\n"
-            
-            for contributor in repo_data['contributors']:
-                readme += f"<a href=\"{contributor['url']}\"><img src=\"{contributor['url']}.png?size=50\" width=\"50\" height=\"50\" alt=\"{contributor['login']}\" style=\"border-radius: 50%;\"></a>\n"
-            
-            readme += "\n"
-        
-        # Acknowledgments
-        readme += "## 🙏 Acknowledgments\n\n"
-        readme += "- [Choose an Open Source License](https://choosealicense.com)\\n"
-        readme += "- [GitHub Emoji Cheat Sheet](https://www.webpagefx.com/tools/emoji-cheat-sheet)\\n"
-        readme += "- [Img Shields](https://shields.io)\\n"
-        readme += "- [GitHub Pages](https://pages.github.com)\\n\n"
-        
-        return readme
-
-def main():
-    parser = argparse.ArgumentParser(description='Generate a README for a GitHub repository')
-    parser.add_argument('repo_url', type=str, help='GitHub repository URL')
-    parser.add_argument('--output', '-o', type=str, default='README.md', help='Output file path (default: README.md)')
-    parser.add_argument('--token', '-t', type=str, help='GitHub Personal Access Token')
-    
-    args = parser.parse_args()
-    
-    analyzer = GitHubAnalyzer(token=args.token)
-    
-    # Get repository info from URL
-    owner, repo_name = analyzer.get_repo_info(args.repo_url)
-    if not owner or not repo_name:
-        print("Error: Invalid GitHub repository URL")
-        sys.exit(1)
-    
-    print(f"Analyzing repository: {owner}/{repo_name}")
-    
-    try:
-        # Analyze repository
-        repo_data = analyzer.analyze_repository(owner, repo_name)
-        if not repo_data:
-            print("Error: Could not analyze repository")
-            sys.exit(1)
-        
-        # Generate README
-        readme_content = analyzer.generate_readme(repo_data)
-        
-        # Save to file
-        with open(args.output, 'w', encoding='utf-8') as f:
-            f.write(readme_content)
-        
-        print(f"✅ README generated successfully at {args.output}")
-        
-    except GithubException as e:
-        if e.status == 404:
-            print("Error: Repository not found or access denied")
-        elif e.status == 403 and 'rate limit' in str(e).lower():
-            print("Error: GitHub API rate limit exceeded. Please provide a GitHub token.")
-        else:
-            print(f"GitHub API Error: {e}")
-        sys.exit(1)
-    except Exception as e:
-        print(f"Error: {e}")
-        sys.exit(1)
-
-if __name__ == "__main__":
-    main()
+import os
+from concurrent.futures import as_completed, TimeoutError as FutureTimeoutError
+from datetime import datetime
+import re
+from urllib.parse import urlparse, unquote
+from dotenv import load_dotenv
+from github_client import GitHubClient, GitHubAPIError, parse_datetime
+from result_cache import result_cache, result_key
+from rate_limit import RateLimitExceeded, PriorityExecutor, current_priority, token_id, BATCH
+from readme_engine import get_engine
+from models import RepoData, Contributor, Release
+from metrics import timed, timed_stage, FETCH_ERRORS
+from singleflight import single_flight
+from content_scan import scan_tree
+from local_repo import analyze_local
+from token_pool import token_pool
+
+# Load environment variables
+load_dotenv()
+
+# Sub-resource fetches run on shared, bounded pools so concurrent requests
+# cannot spawn unbounded threads; FETCH_TIMEOUT caps the whole fan-out.
+# Interactive and batch fetches have a pool each, so batch fetches waiting
+# for rate-limit budget never keep interactive ones queued.
+FETCH_WORKERS = int(os.getenv('ANALYZER_FETCH_WORKERS', '8'))
+FETCH_TIMEOUT = float(os.getenv('ANALYZER_FETCH_TIMEOUT', '20'))
+_fetch_executor = PriorityExecutor(FETCH_WORKERS, 'gh-fetch')
+
+# 'rest' fans out one call per sub-resource; 'graphql' collects nearly
+# everything in a single query and uses REST only for contributors
+ANALYZER_BACKEND = os.getenv('ANALYZER_BACKEND', 'rest').lower()
+
+# Scan the repository tarball for manifests to detect the real tech stack,
+# install steps and entry points (see content_scan.py)
+ANALYZER_SCAN_CONTENT = os.getenv('ANALYZER_SCAN_CONTENT', '1') == '1'
+
+# How many entries of each list field to keep; only that many are requested
+FIELD_LIMITS = {
+    'contributors': int(os.getenv('CONTRIBUTORS_LIMIT', '5')),
+    'releases': int(os.getenv('RELEASES_LIMIT', '3')),
+}
+
+REPOSITORY_QUERY = """
+query($owner: String!, $name: String!, $releases: Int!) {
+  repository(owner: $owner, name: $name) {
+    name
+    nameWithOwner
+    description
+    url
+    isPrivate
+    createdAt
+    updatedAt
+    pushedAt
+    forkCount
+    stargazerCount
+    defaultBranchRef { name }
+    primaryLanguage { name }
+    licenseInfo { name }
+    issues(states: OPEN) { totalCount }
+    pullRequests(states: OPEN) { totalCount }
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+    languages(first: 100, orderBy: {field: SIZE, direction: DESC}) { edges { size node { name } } }
+    releases(first: $releases, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes { tagName name publishedAt createdAt description }
+    }
+    readme: object(expression: "HEAD:README.md") { ... on Blob { text } }
+  }
+}
+"""
+
+# Sub-resources that only change when something is pushed to the repository
+PUSH_FIELDS = ('readme', 'contributors', 'languages', 'stack')
+
+def _no_progress(stage, status):
+    pass
+
+def _submit(fn, *args):
+    """Run fn on the fetch pool of the caller's priority, inside a copy of the caller's context"""
+    return _fetch_executor.submit(fn, *args)
+
+class GitHubAnalyzer:
+    def __init__(self, token=None, backend=None, limits=None, template_dirs=None, offline=False):
+        """Initialize GitHub client with token if provided
+        
+        Without a token, the service token with the most budget left is taken
+        from the pool (GITHUB_TOKENS) and only public repositories are
+        analyzed, since those tokens are shared by everyone. An offline
+        analyzer only analyzes local checkouts, so it needs no token.
+        """
+        self.pooled = not token
+        self.token = token or (None if offline else token_pool.pick())
+        if not self.token and not offline:
+            print("Warning: No GitHub token provided. You may hit rate limits.")
+        self.client = GitHubClient(self.token)
+        self.backend = (backend or ANALYZER_BACKEND).lower()
+        self.limits = dict(FIELD_LIMITS, **(limits or {}))
+        self.engine = get_engine(template_dirs)
+        if self.backend == 'graphql' and not self.token:
+            # The GraphQL API does not accept anonymous requests
+            print("Warning: GraphQL backend requires a token, falling back to REST.")
+            self.backend = 'rest'
+    
+    def get_repo_info(self, repo_url):
+        """Extract repository information from URL"""
+        try:
+            # Handle different GitHub URL formats
+            parsed = urlparse(repo_url)
+            if parsed.netloc != 'github.com':
+                raise ValueError("Only GitHub repository URLs are supported")
+                
+            # Extract path and clean it up
+            path = parsed.path.strip('/')
+            path = re.sub(r'\.git$', '', path)  # Remove .git if present
+            
+            # Split into parts
+            parts = path.split('/')
+            if len(parts) < 2:
+                raise ValueError("Invalid GitHub repository URL format")
+                
+            owner = parts[0]
+            repo_name = parts[1]
+            
+            # Clean up the repository name (remove any query parameters or fragments)
+            repo_name = repo_name.split('?')[0].split('#')[0]
+            
+            return owner, repo_name
+            
+        except Exception as e:
+            print(f"Error parsing repository URL: {e}")
+            return None, None
+    
+    def analyze_repository(self, owner, repo_name, refresh=False, progress=None):
+        """Analyze GitHub repository and return metadata
+        
+        ``progress(stage, status)`` is called as the repository and each
+        sub-resource is fetched.
+        """
+        progress = progress or _no_progress
+        if self.backend == 'graphql':
+            return self._analyze_graphql(owner, repo_name, refresh, progress)
+        try:
+            repo = self._fetch_repository(owner, repo_name)
+            progress('repository', 'fetched')
+            
+            # Reuse a previous analysis while the repository hasn't changed
+            cache_key = result_key(repo, self.token)
+            if not refresh:
+                cached = result_cache.get(cache_key)
+                if cached is not None:
+                    progress('analysis', 'cached')
+                    return cached
+            
+            # Identical analyses running at the same time share one set of fetches
+            return self._single_flight(cache_key + (refresh,), lambda: self._analyze_rest(repo, cache_key, refresh, progress),
+                                       progress, refresh)
+            
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            print(f"Error analyzing repository: {e}")
+            return None
+    
+    def _fetch_repository(self, owner, repo_name):
+        """Get the repository payload, moving to another pool token if GitHub rejects this one"""
+        while True:
+            try:
+                with timed('github.repository'):
+                    repo = self.client.get_json(f"/repos/{owner}/{repo_name}")
+                break
+            except GitHubAPIError as e:
+                if e.status != 401 or not self.pooled or not self.token:
+                    raise
+                # The client dropped the token from the pool; without any left, go anonymous
+                self.token = token_pool.pick()
+                self.client = GitHubClient(self.token)
+        self._check_visibility(repo.get('private'))
+        return repo
+    
+    def _check_visibility(self, private):
+        """Refuse private repositories to pooled analyzers, as if they did not exist"""
+        if private and self.pooled:
+            raise GitHubAPIError(404, 'Not Found')
+    
+    def analyze_local(self, path):
+        """Analyze the repository checked out at ``path`` from its files and git history, without network access"""
+        return analyze_local(path, self.limits)
+    
+    def _analyze_rest(self, repo, cache_key, refresh, progress):
+        """Fetch the sub-resources of a repository payload and cache the result"""
+        # Get basic repository information; license and topics are part
+        # of the repository payload so they need no extra round trip
+        repo_data = RepoData(
+            name=repo['name'],
+            full_name=repo['full_name'],
+            description=repo.get('description') or 'No description provided',
+            url=repo['html_url'],
+            default_branch=repo.get('default_branch'),
+            created_at=parse_datetime(repo.get('created_at')),
+            updated_at=parse_datetime(repo.get('updated_at')),
+            pushed_at=parse_datetime(repo.get('pushed_at')),
+            language=repo.get('language'),
+            forks_count=repo.get('forks_count', 0),
+            stargazers_count=repo.get('stargazers_count', 0),
+            open_issues_count=repo.get('open_issues_count', 0),
+            license=(repo.get('license') or {}).get('name'),
+            topics=repo.get('topics') or [],
+        )
+        
+        # Fetch the independent sub-resources concurrently; each one keeps
+        # its own fallback so a slow or failing call only loses that field
+        fetchers = {
+            'readme': self._fetch_readme,
+            'contributors': self._fetch_contributors,
+            'languages': self._fetch_languages,
+            'releases': self._fetch_releases,
+        }
+        if ANALYZER_SCAN_CONTENT:
+            fetchers['stack'] = self._fetch_stack
+        if not refresh:
+            self._reuse_unpushed(repo_data, result_cache.latest(cache_key), fetchers, progress)
+        futures = {field: _submit(fetch, repo) for field, fetch in fetchers.items()}
+        self._collect(repo_data, futures, progress)
+            
+        result_cache.set(cache_key, repo_data)
+        return repo_data
+    
+    def _single_flight(self, key, analyze, progress=_no_progress, refresh=False):
+        """Run ``analyze()`` unless an identical analysis is already running, then share its result
+        
+        The key includes the caller's priority so interactive requests never
+        wait behind a batch analysis queued on the rate-limit scheduler.
+        Other callers get a decoded copy, as from the result cache. A refresh
+        never takes a result another worker stored earlier.
+        """
+        own = []
+        
+        def run():
+            repo_data = analyze()
+            own.append(repo_data)
+            return repo_data.to_bytes() if repo_data is not None else None
+        
+        raw = single_flight.do('|'.join(map(str, key + (current_priority(),))), run, reuse_stored=not refresh)
+        if own:
+            return own[0]
+        if raw is None:
+            return None
+        progress('analysis', 'shared')
+        return RepoData.from_bytes(raw)
+    
+    def _analyze_graphql(self, owner, repo_name, refresh=False, progress=_no_progress):
+        """Analyze a repository with a single GraphQL query"""
+        # The repository state is only known once the query returns, so
+        # coalesce on the repository and token instead
+        # Pooled analyzers only see public data, so they share flights whichever token they hold
+        scope = 'pool' if self.pooled else token_id(self.token)
+        key = ('graphql', f"{owner}/{repo_name}".lower(), scope, refresh)
+        try:
+            return self._single_flight(key, lambda: self._query_graphql(owner, repo_name, refresh, progress), progress, refresh)
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            print(f"Error analyzing repository: {e}")
+            return None
+    
+    def _query_graphql(self, owner, repo_name, refresh, progress):
+        """Analyze a repository with a single GraphQL query, raising on failure"""
+        with timed('github.graphql'):
+            data = self.client.graphql(REPOSITORY_QUERY, {
+                'owner': owner,
+                'name': repo_name,
+                'releases': self.limits['releases'],
+            })
+        repo = data.get('repository')
+        if not repo:
+            raise GitHubAPIError(404, 'Not Found')
+        self._check_visibility(repo['isPrivate'])
+        progress('repository', 'fetched')
+        
+        # Same key shape as the REST path so both backends share entries
+        cache_key = result_key({
+            'full_name': repo['nameWithOwner'],
+            'private': repo['isPrivate'],
+            'pushed_at': repo['pushedAt'],
+            'updated_at': repo['updatedAt'],
+        }, self.token)
+        if not refresh:
+            cached = result_cache.get(cache_key)
+            if cached is not None:
+                progress('analysis', 'cached')
+                return cached
+        
+        # GraphQL has no contributors connection, so fetch them over REST;
+        # only now, so an analysis served from the cache makes no REST call
+        rest_repo = {'full_name': repo['nameWithOwner'], 'name': repo['name'],
+                     'default_branch': (repo.get('defaultBranchRef') or {}).get('name')}
+        futures = {'contributors': _submit(self._fetch_contributors, rest_repo)}
+        if ANALYZER_SCAN_CONTENT:
+            futures['stack'] = _submit(self._fetch_stack, rest_repo)
+        
+        readme = repo.get('readme') or {}
+        repo_data = RepoData(
+            name=repo['name'],
+            full_name=repo['nameWithOwner'],
+            description=repo.get('description') or 'No description provided',
+            url=repo['url'],
+            default_branch=(repo.get('defaultBranchRef') or {}).get('name'),
+            created_at=parse_datetime(repo.get('createdAt')),
+            updated_at=parse_datetime(repo.get('updatedAt')),
+            pushed_at=parse_datetime(repo.get('pushedAt')),
+            language=(repo.get('primaryLanguage') or {}).get('name'),
+            forks_count=repo.get('forkCount', 0),
+            stargazers_count=repo.get('stargazerCount', 0),
+            # REST counts open pull requests as issues too
+            open_issues_count=repo['issues']['totalCount'] + repo['pullRequests']['totalCount'],
+            license=(repo.get('licenseInfo') or {}).get('name'),
+            topics=[n['topic']['name'] for n in repo['repositoryTopics']['nodes']],
+            languages={e['node']['name']: e['size'] for e in repo['languages']['edges']},
+            releases=[Release(
+                tag_name=r['tagName'],
+                name=r.get('name') or r['tagName'],
+                published_at=parse_datetime(r.get('publishedAt') or r.get('createdAt')),
+                body=(r['description'][:200] + '...') if r.get('description') else ''
+            ) for r in repo['releases']['nodes']],
+        )
+        
+        if readme.get('text') is not None:
+            repo_data.readme = readme['text']
+        else:
+            # The README isn't at HEAD:README.md; let REST locate it
+            futures['readme'] = _submit(self._fetch_readme, rest_repo)
+        
+        self._collect(repo_data, futures, progress)
+        result_cache.set(cache_key, repo_data)
+        return repo_data
+    
+    def _reuse_unpushed(self, repo_data, previous, fetchers, progress=_no_progress):
+        """Take push-dependent fields from a previous analysis when nothing was pushed since
+        
+        Only metadata (stars, topics, ...) or releases changed, so the README,
+        contributors and languages are reused and their fetchers dropped.
+        Fields whose previous fetch fell back to the default are fetched again.
+        """
+        if not previous or previous.pushed_at != repo_data.pushed_at:
+            return
+        for field in PUSH_FIELDS:
+            if field in fetchers and getattr(previous, field) != getattr(repo_data, field):
+                setattr(repo_data, field, getattr(previous, field))
+                del fetchers[field]
+                progress(field, 'reused')
+    
+    def _collect(self, repo_data, futures, progress=_no_progress):
+        """Wait for concurrent fetches, keeping each field's fallback on failure"""
+        fields = {future: field for field, future in futures.items()}
+        # Batch calls may legitimately wait on the rate-limit scheduler
+        timeout = None if current_priority() == BATCH else FETCH_TIMEOUT
+        try:
+            for future in as_completed(fields, timeout=timeout):
+                field = fields[future]
+                try:
+                    setattr(repo_data, field, future.result())
+                    progress(field, 'fetched')
+                except RateLimitExceeded:
+                    # Don't hide an exhausted budget behind a partial README
+                    raise
+                except Exception as e:
+                    print(f"Could not fetch {field}: {e}")
+                    FETCH_ERRORS.inc(field=field, reason='failed')
+                    progress(field, 'failed')
+        except FutureTimeoutError:
+            for future, field in fields.items():
+                if not future.done():
+                    future.cancel()
+                    print(f"Timed out fetching {field}")
+                    FETCH_ERRORS.inc(field=field, reason='timeout')
+                    progress(field, 'timeout')
+    
+    @timed_stage('github.readme')
+    def _fetch_readme(self, repo):
+        """Get the README source; it is only rendered to HTML where it is displayed"""
+        resp = self.client.get(f"/repos/{repo['full_name']}/readme",
+                               headers={'Accept': 'application/vnd.github.raw'})
+        if not resp.ok:
+            raise GitHubAPIError.from_response(resp)
+        return resp.content.decode('utf-8', errors='replace')
+    
+    @timed_stage('github.contributors')
+    def _fetch_contributors(self, repo):
+        """Get the top contributors, requesting only as many as are kept"""
+        contributors = self.client.iter_pages(f"/repos/{repo['full_name']}/contributors",
+                                              limit=self.limits['contributors'])
+        return [Contributor(
+            login=c['login'],
+            url=c['html_url'],
+            contributions=c['contributions']
+        ) for c in contributors]
+    
+    @timed_stage('github.languages')
+    def _fetch_languages(self, repo):
+        """Get language breakdown in bytes"""
+        return self.client.get_json(f"/repos/{repo['full_name']}/languages")
+    
+    @timed_stage('github.releases')
+    def _fetch_releases(self, repo):
+        """Get the latest releases, requesting only as many as are kept"""
+        releases = self.client.iter_pages(f"/repos/{repo['full_name']}/releases",
+                                          limit=self.limits['releases'])
+        return [Release(
+            tag_name=r['tag_name'],
+            name=r.get('name') or r['tag_name'],
+            published_at=parse_datetime(r.get('published_at') or r.get('created_at')),
+            body=(r['body'][:200] + '...') if r.get('body') else ''
+        ) for r in releases if r.get('tag_name')]
+    
+    @timed_stage('github.content_scan')
+    def _fetch_stack(self, repo):
+        """Detect the tech stack, install steps and entry points from the repository files"""
+        return scan_tree(self.client, repo['full_name'], repo.get('default_branch'), repo.get('name'))
+    
+    @timed_stage('generate_readme')
+    def generate_readme(self, repo_data, sections=None):
+        """Generate a comprehensive README.md file based on repository data
+        
+        ``sections`` is a section set name (e.g. 'minimal'), a comma-separated
+        string or a list of section names; all sections are rendered by default.
+        """
+        if not repo_data:
+            return "# Error: Could not generate README - No repository data provided"
+        return self.engine.render(repo_data, sections)
+    
+    def iter_readme(self, repo_data, sections=None):
+        """Yield the README section by section, for streaming it as it is rendered"""
+        if not repo_data:
+            yield "# Error: Could not generate README - No repository data provided"
+            return
+        yield from self.engine.iter_render(repo_data, sections)
+
+def main():
+    """Command-line entry point; the command line itself lives in cli.py"""
+    from cli import main as cli_main
+    cli_main()
+
+if __name__ == "__main__":
+    main()
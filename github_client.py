@@ -0,0 +1,287 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import as_completed
+from urllib.parse import urlsplit, parse_qs
+from datetime import datetime
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dotenv import load_dotenv
+from response_cache import get_response_cache
+from rate_limit import scheduler, token_id, is_rate_limited, RateLimitExceeded, PriorityExecutor
+from token_pool import token_pool
+import metrics
+
+# Load environment variables
+load_dotenv()
+
+# Every GitHub call in the app goes through a process-wide pool of keep-alive
+# sessions, one per token, so repeated requests reuse TCP/TLS connections
+GITHUB_API_URL = os.getenv('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
+GITHUB_GRAPHQL_URL = os.getenv('GITHUB_GRAPHQL_URL', '')
+POOL_SIZE = int(os.getenv('GITHUB_POOL_SIZE', '20'))
+MAX_SESSIONS = int(os.getenv('GITHUB_MAX_SESSIONS', '256'))
+MAX_RETRIES = int(os.getenv('GITHUB_MAX_RETRIES', '3'))
+BACKOFF_FACTOR = float(os.getenv('GITHUB_BACKOFF_FACTOR', '0.5'))
+DEFAULT_TIMEOUT = float(os.getenv('GITHUB_TIMEOUT', '15'))
+PAGE_WORKERS = int(os.getenv('GITHUB_PAGE_WORKERS', '8'))
+
+_sessions = OrderedDict()
+_sessions_lock = threading.Lock()
+_page_executor = PriorityExecutor(PAGE_WORKERS, 'gh-pages')
+
+
+class GitHubAPIError(Exception):
+    """Raised when the GitHub API answers with an error status"""
+
+    def __init__(self, status, message, data=None):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+        self.message = message
+        self.data = data or {}
+
+    @classmethod
+    def from_response(cls, resp):
+        try:
+            data = resp.json()
+        except ValueError:
+            data = {}
+        message = data.get('message') if isinstance(data, dict) else None
+        return cls(resp.status_code, message or resp.reason or 'GitHub API error', data)
+
+
+def _build_session(token):
+    """Create a session with a bounded connection pool and retry/backoff"""
+    retry = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=(500, 502, 503, 504),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'Accept': 'application/vnd.github+json',
+        'User-Agent': 'GitHub-README-Generator',
+    })
+    if token:
+        session.headers['Authorization'] = f'Bearer {token}'
+    return session
+
+
+def get_session(token=None):
+    """Return the shared session for a token, creating it on first use"""
+    key = token or ''
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is not None:
+            _sessions.move_to_end(key)
+            return session
+        session = _build_session(token)
+        _sessions[key] = session
+        # Drop the least recently used sessions so one-off tokens don't pile up
+        while len(_sessions) > MAX_SESSIONS:
+            _, evicted = _sessions.popitem(last=False)
+            evicted.close()
+        return session
+
+
+def parse_datetime(value):
+    """Parse a GitHub ISO 8601 timestamp into an aware datetime"""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def last_page(resp):
+    """Page number of the rel="last" link of a paginated response, or None"""
+    url = resp.links.get('last', {}).get('url')
+    if not url:
+        return None
+    try:
+        return int(parse_qs(urlsplit(url).query).get('page', ['1'])[0])
+    except ValueError:
+        return None
+
+
+def blob_sha(content):
+    """Git blob SHA of a text, as GitHub reports it for files"""
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+
+class GitHubClient:
+    def __init__(self, token=None, base_url=None, timeout=None):
+        """Thin wrapper around the shared session for one token"""
+        self.token = token
+        self.base_url = (base_url or GITHUB_API_URL).rstrip('/')
+        self.graphql_url = GITHUB_GRAPHQL_URL or f"{self.base_url}/graphql"
+        self.timeout = timeout or DEFAULT_TIMEOUT
+        self.session = get_session(token)
+
+    def url(self, path):
+        if path.startswith('http://') or path.startswith('https://'):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def is_api_url(self, url):
+        """True for REST and GraphQL API URLs, the calls that spend rate-limit budget"""
+        return url == self.graphql_url or url.startswith(self.base_url + '/')
+
+    def request(self, method, path, **kwargs):
+        """Send a request through the pooled session and return the response
+        
+        API calls are paced by the rate-limit scheduler; a response saying the
+        budget is exhausted raises RateLimitExceeded. Other GitHub hosts (the
+        OAuth endpoints on github.com) don't count against the API budget, so
+        they are sent straight through.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        url = self.url(path)
+        if not self.is_api_url(url):
+            start = time.perf_counter()
+            resp = self.session.request(method, url, **kwargs)
+            metrics.github_call(method, resp.status_code, time.perf_counter() - start)
+            return resp
+        scheduler.acquire(self.token)
+        start = time.perf_counter()
+        resp = self.session.request(method, url, **kwargs)
+        metrics.github_call(method, resp.status_code, time.perf_counter() - start)
+        scheduler.update(self.token, resp)
+        if resp.status_code == 401 and self.token:
+            # A revoked service token must not be handed out again
+            token_pool.drop(self.token)
+        if is_rate_limited(resp):
+            raise RateLimitExceeded(scheduler.budget(self.token)['reset'])
+        return resp
+
+    def cache_key(self, path, params=None, headers=None):
+        """Key cached responses by token scope, full URL and Accept header
+        
+        Service tokens share one scope: a cached body is only reused after
+        GitHub answers 304 to the token making the request, which it only
+        does when that token can read the resource.
+        """
+        scope = 'pool' if self.token and self.token in token_pool else token_id(self.token)
+        url = requests.Request('GET', self.url(path), params=params).prepare().url
+        accept = (headers or {}).get('Accept') or self.session.headers.get('Accept')
+        return f"{scope}:{accept}:{url}"
+
+    def get(self, path, params=None, **kwargs):
+        """GET with ETag/Last-Modified revalidation against the response cache"""
+        cache = get_response_cache()
+        if cache is None or kwargs.get('stream'):
+            return self.request('GET', path, params=params, **kwargs)
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        key = self.cache_key(path, params, headers)
+        entry = cache.get(key)
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        resp = self.request('GET', path, params=params, headers=headers, **kwargs)
+        metrics.cache_lookup('github_response', bool(entry) and resp.status_code == 304)
+        if resp.status_code == 304 and entry:
+            # Not modified: serve the cached body as if it were a fresh 200
+            resp.status_code = 200
+            resp._content = entry['body']
+            resp.headers.update(entry['headers'])
+            resp.from_cache = True
+        elif resp.status_code == 200 and ('ETag' in resp.headers or 'Last-Modified' in resp.headers):
+            cache.set(key, {
+                'etag': resp.headers.get('ETag'),
+                'last_modified': resp.headers.get('Last-Modified'),
+                'headers': {k: resp.headers[k] for k in ('Content-Type', 'Link') if k in resp.headers},
+                'body': resp.content,
+            })
+        return resp
+
+    def get_json(self, path, params=None, **kwargs):
+        """GET a resource and decode it, raising GitHubAPIError on failure"""
+        resp = self.get(path, params=params, **kwargs)
+        if not resp.ok:
+            raise GitHubAPIError.from_response(resp)
+        return resp.json()
+
+    def graphql(self, query, variables=None):
+        """Run a GraphQL v4 query and return its data, raising on request-level errors"""
+        resp = self.request('POST', self.graphql_url, json={'query': query, 'variables': variables or {}})
+        if not resp.ok:
+            raise GitHubAPIError.from_response(resp)
+        payload = resp.json()
+        errors = payload.get('errors')
+        if errors and not payload.get('data'):
+            raise GitHubAPIError(resp.status_code, errors[0].get('message', 'GraphQL error'), payload)
+        return payload.get('data') or {}
+
+    def iter_pages(self, path, params=None, limit=None):
+        """Yield items from a paginated list endpoint, following Link headers
+
+        With a limit, pages are sized to it and iteration stops as soon as
+        enough items were seen, so only the pages actually needed are fetched.
+        """
+        params = dict(params or {})
+        if limit is not None:
+            if limit <= 0:
+                return
+            params.setdefault('per_page', min(limit, 100))
+        url = path
+        count = 0
+        while url:
+            resp = self.get(url, params=params)
+            if not resp.ok:
+                raise GitHubAPIError.from_response(resp)
+            for item in resp.json():
+                yield item
+                count += 1
+                if limit is not None and count >= limit:
+                    return
+            url = resp.links.get('next', {}).get('url')
+            params = None  # the next link already carries the query string
+
+    def iter_page_batches(self, path, params=None):
+        """Yield the items of a paginated list endpoint one page at a time
+
+        The first page's Link header tells how many pages there are; the
+        rest are then fetched concurrently and yielded as they arrive, so
+        pages after the first come in no particular order. Closing the
+        generator early cancels the pages not yet requested.
+        """
+        params = dict(params or {})
+        params.setdefault('per_page', 100)
+        resp = self.get(path, params=params)
+        if not resp.ok:
+            raise GitHubAPIError.from_response(resp)
+        yield resp.json()
+        last = last_page(resp)
+        if last is None:
+            # No rel="last" link (single page, or an endpoint that omits it)
+            next_url = resp.links.get('next', {}).get('url')
+            if next_url:
+                yield from self._iter_next_pages(next_url)
+            return
+        futures = [_page_executor.submit(self.get_json, path, dict(params, page=page))
+                   for page in range(2, last + 1)]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _iter_next_pages(self, url):
+        while url:
+            resp = self.get(url)
+            if not resp.ok:
+                raise GitHubAPIError.from_response(resp)
+            yield resp.json()
+            url = resp.links.get('next', {}).get('url')
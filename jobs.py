@@ -0,0 +1,152 @@
+import os
+import time
+import uuid
+import importlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Analyses submitted as background jobs run on a local worker pool by
+# default; JOB_QUEUE_BACKEND may name another queue class as "module:Class"
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '8'))
+JOB_TTL = float(os.getenv('JOB_TTL', '3600'))
+JOB_MAX = int(os.getenv('JOB_MAX', '1000'))
+JOB_QUEUE_BACKEND = os.getenv('JOB_QUEUE_BACKEND', '')
+
+
+class Job:
+    """A unit of background work with a status and an ordered event log"""
+
+    def __init__(self, kind='analysis'):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = 'queued'
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.events = []
+        self._cond = threading.Condition()
+
+    @property
+    def finished(self):
+        return self.status in ('done', 'failed')
+
+    def emit(self, event, data=None):
+        """Record a progress event and wake anyone streaming this job"""
+        with self._cond:
+            self.events.append({'id': len(self.events) + 1, 'event': event, 'data': data or {}})
+            self._cond.notify_all()
+
+    def progress(self, stage, status):
+        """Progress callback handed to the analyzer"""
+        self.emit('progress', {'stage': stage, 'status': status})
+
+    def run(self, fn, *args, **kwargs):
+        self.status = 'running'
+        self.emit('status', {'status': self.status})
+        try:
+            self.result = fn(self, *args, **kwargs)
+            self.status = 'done'
+        except Exception as e:
+            self.error = str(e)
+            self.status = 'failed'
+        self.finished_at = time.time()
+        self.emit('status', {'status': self.status, 'error': self.error})
+
+    def iter_events(self, since=0, timeout=30):
+        """Yield events after ``since``, waiting for new ones until the job finishes"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                while len(self.events) <= since and not self.finished:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return
+                    self._cond.wait(remaining)
+                new_events = self.events[since:]
+                done = self.finished
+            for event in new_events:
+                yield event
+            since += len(new_events)
+            if done and since >= len(self.events):
+                return
+
+    def to_dict(self, include_result=True):
+        data = {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'error': self.error,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+            'progress': [e['data'] for e in self.events if e['event'] == 'progress'],
+        }
+        if include_result and self.status == 'done':
+            data['result'] = self.result
+        return data
+
+
+class InProcessQueue:
+    """Default queue: runs jobs on a thread pool inside this process"""
+
+    def __init__(self, workers=JOB_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+
+    def submit(self, job, fn, *args, **kwargs):
+        self.executor.submit(job.run, fn, *args, **kwargs)
+
+
+def _load_queue():
+    if not JOB_QUEUE_BACKEND:
+        return InProcessQueue()
+    module_name, _, class_name = JOB_QUEUE_BACKEND.partition(':')
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+class JobManager:
+    """Tracks submitted jobs and forgets finished ones after JOB_TTL"""
+
+    def __init__(self, queue=None, ttl=JOB_TTL, max_jobs=JOB_MAX):
+        self.queue = queue
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, kind='analysis', **kwargs):
+        """Queue ``fn(job, *args, **kwargs)`` and return the job immediately"""
+        if self.queue is None:
+            self.queue = _load_queue()
+        job = Job(kind)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        job.emit('status', {'status': job.status})
+        self.queue.submit(job, fn, *args, **kwargs)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self):
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.finished and now - job.finished_at > self.ttl:
+                del self._jobs[job_id]
+        # Never keep more than max_jobs; drop the oldest finished ones first
+        overflow = len(self._jobs) - self.max_jobs + 1
+        for job_id, job in list(self._jobs.items()):
+            if overflow <= 0:
+                break
+            if job.finished:
+                del self._jobs[job_id]
+                overflow -= 1
+
+
+job_manager = JobManager()
@@ -0,0 +1,281 @@
+import os
+import re
+import subprocess
+import posixpath
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from dotenv import load_dotenv
+from models import RepoData, Contributor, Release
+from metrics import timed
+from content_scan import is_relevant, needs_content, parse_manifest, build_stack, SCAN_MAX_FILE_SIZE
+
+# Load environment variables
+load_dotenv()
+
+# Offline analysis of a checked-out repository: the same RepoData the GitHub
+# API would give, built from the working tree and git history without any
+# network access. Tracked files come from ``git ls-files`` (any directory is
+# walked in parallel when it is not a git checkout) and are sized to count
+# bytes per language; contributors come from the commit history, releases
+# from tags, and the license from the license file's text.
+LOCAL_WALK_WORKERS = int(os.getenv('LOCAL_WALK_WORKERS', '8'))
+
+# Entries kept per list field, read from the same variables as the GitHub analyzer
+DEFAULT_LIMITS = {
+    'contributors': int(os.getenv('CONTRIBUTORS_LIMIT', '5')),
+    'releases': int(os.getenv('RELEASES_LIMIT', '3')),
+}
+
+# Language by file name, then by extension. Like GitHub, data and prose
+# formats (JSON, YAML, Markdown, ...) are not counted.
+FILENAME_LANGUAGES = {
+    'Dockerfile': 'Dockerfile',
+    'Makefile': 'Makefile',
+    'CMakeLists.txt': 'CMake',
+}
+EXTENSION_LANGUAGES = {
+    '.py': 'Python', '.pyi': 'Python', '.ipynb': 'Jupyter Notebook',
+    '.js': 'JavaScript', '.mjs': 'JavaScript', '.cjs': 'JavaScript', '.jsx': 'JavaScript',
+    '.ts': 'TypeScript', '.tsx': 'TypeScript', '.vue': 'Vue', '.svelte': 'Svelte',
+    '.html': 'HTML', '.htm': 'HTML', '.css': 'CSS', '.scss': 'SCSS', '.sass': 'Sass', '.less': 'Less',
+    '.go': 'Go', '.rs': 'Rust', '.java': 'Java', '.kt': 'Kotlin', '.kts': 'Kotlin', '.scala': 'Scala',
+    '.c': 'C', '.h': 'C', '.cc': 'C++', '.cpp': 'C++', '.cxx': 'C++', '.hpp': 'C++', '.cs': 'C#',
+    '.m': 'Objective-C', '.swift': 'Swift', '.dart': 'Dart', '.rb': 'Ruby', '.php': 'PHP',
+    '.sh': 'Shell', '.bash': 'Shell', '.zsh': 'Shell', '.ps1': 'PowerShell', '.bat': 'Batchfile',
+    '.pl': 'Perl', '.lua': 'Lua', '.r': 'R', '.R': 'R', '.jl': 'Julia', '.hs': 'Haskell',
+    '.ex': 'Elixir', '.exs': 'Elixir', '.erl': 'Erlang', '.clj': 'Clojure', '.sql': 'PLpgSQL',
+}
+# Directories never counted, and skipped entirely by the directory walk
+VENDORED_DIRS = {'node_modules', 'vendor', 'third_party', 'venv', '.venv', 'dist', 'build', '__pycache__'}
+
+# License file text -> name as the GitHub API reports it; the first match wins
+LICENSES = [
+    (('gnu affero general public license', 'version 3'), 'GNU Affero General Public License v3.0'),
+    (('gnu lesser general public license', 'version 3'), 'GNU Lesser General Public License v3.0'),
+    (('gnu lesser general public license', 'version 2.1'), 'GNU Lesser General Public License v2.1'),
+    (('gnu general public license', 'version 3'), 'GNU General Public License v3.0'),
+    (('gnu general public license', 'version 2'), 'GNU General Public License v2.0'),
+    (('apache license', 'version 2.0'), 'Apache License 2.0'),
+    (('mozilla public license version 2.0',), 'Mozilla Public License 2.0'),
+    (('boost software license',), 'Boost Software License 1.0'),
+    (('this is free and unencumbered software',), 'The Unlicense'),
+    (('permission is hereby granted, free of charge',), 'MIT License'),
+    (('permission to use, copy, modify, and/or distribute',), 'ISC License'),
+    (('redistribution and use in source and binary forms', 'neither the name'),
+     'BSD 3-Clause "New" or "Revised" License'),
+    (('redistribution and use in source and binary forms',), 'BSD 2-Clause "Simplified" License'),
+]
+_LICENSE_FILE = re.compile(r'^(licen[cs]e|copying)(\.(md|txt|rst))?$', re.I)
+_README_FILE = re.compile(r'^readme(\.(md|markdown|rst|txt))?$', re.I)
+_GITHUB_REMOTE = re.compile(r'github\.com[:/]([^/]+)/([^/]+?)(?:\.git)?/?$')
+_NOREPLY = re.compile(r'^(?:\d+\+)?([A-Za-z0-9-]+)@users\.noreply\.github\.com$', re.I)
+_SHORTLOG = re.compile(r'^\s*(\d+)\t(.*?)(?: <(.*)>)?$')
+
+
+def _git(root, *args):
+    """Output of a git command in ``root``, or None if git is missing or the command fails"""
+    try:
+        result = subprocess.run(['git', '-C', root, *args], capture_output=True, timeout=60)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.decode('utf-8', errors='replace')
+
+
+def language_of(path):
+    """Language of a file counted in the language breakdown, or None"""
+    parts = path.split('/')
+    if any(part in VENDORED_DIRS for part in parts[:-1]) or path.endswith('.min.js'):
+        return None
+    name = parts[-1]
+    return FILENAME_LANGUAGES.get(name) or EXTENSION_LANGUAGES.get(os.path.splitext(name)[1])
+
+
+def detect_license(text):
+    """Name of the license a license file contains; 'Other' when it is not recognized"""
+    text = ' '.join(text[:8192].lower().split())
+    for phrases, name in LICENSES:
+        if all(phrase in text for phrase in phrases):
+            return name
+    return 'Other'
+
+
+def _scan_dir(root, directory):
+    """(files as (path, size), subdirectories) of one directory, relative to root"""
+    files, subdirs = [], []
+    with os.scandir(os.path.join(root, directory)) as entries:
+        for entry in entries:
+            path = posixpath.join(directory, entry.name) if directory else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in VENDORED_DIRS and (not entry.name.startswith('.') or entry.name == '.github'):
+                    subdirs.append(path)
+            elif entry.is_file(follow_symlinks=False):
+                files.append((path, entry.stat(follow_symlinks=False).st_size))
+    return files, subdirs
+
+
+def _sizes(root, paths):
+    sizes = []
+    for path in paths:
+        try:
+            sizes.append((path, os.lstat(os.path.join(root, path)).st_size))
+        except OSError:
+            # Tracked but deleted from the working tree
+            pass
+    return sizes
+
+
+def list_files(root, pool):
+    """All files of the working tree as (path, size), using the git index when there is one"""
+    tracked = _git(root, 'ls-files', '-z')
+    if tracked is not None:
+        paths = [p for p in tracked.split('\0') if p]
+        chunks = [paths[i:i + 512] for i in range(0, len(paths), 512)]
+        return [item for sizes in pool.map(lambda chunk: _sizes(root, chunk), chunks) for item in sizes]
+
+    # Not a git checkout: walk the directories in parallel
+    files = []
+    pending = {pool.submit(_scan_dir, root, '')}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            dir_files, subdirs = future.result()
+            files.extend(dir_files)
+            pending.update(pool.submit(_scan_dir, root, d) for d in subdirs)
+    return files
+
+
+def _contributors(root, limit):
+    output = _git(root, 'shortlog', '-sne', 'HEAD') or ''
+    by_name = {}
+    for line in output.splitlines():
+        match = _SHORTLOG.match(line)
+        if not match:
+            continue
+        count, name, email = int(match.group(1)), match.group(2), match.group(3) or ''
+        noreply = _NOREPLY.match(email)
+        contributor = by_name.setdefault(name.lower(), Contributor(login=name))
+        contributor.contributions += count
+        if noreply and not contributor.url:
+            # Commits made through GitHub give away the account
+            contributor.login = noreply.group(1)
+            contributor.url = f"https://github.com/{noreply.group(1)}"
+    contributors = sorted(by_name.values(), key=lambda c: -c.contributions)
+    return contributors[:limit]
+
+
+def _releases(root, limit):
+    if limit <= 0:
+        return []
+    # Lightweight tags have no message of their own, only annotated tags get a body
+    output = _git(root, 'for-each-ref', '--sort=-creatordate', f'--count={limit}',
+                  '--format=%(refname:short)%00%(creatordate:iso-strict)%00'
+                  '%(if)%(*objectname)%(then)%(contents)%(end)%00',
+                  'refs/tags') or ''
+    fields = output.split('\0')
+    releases = []
+    for i in range(0, len(fields) - 2, 3):
+        tag, created, body = fields[i].lstrip('\n'), fields[i + 1], fields[i + 2].strip()
+        releases.append(Release(
+            tag_name=tag,
+            name=tag,
+            published_at=datetime.fromisoformat(created) if created else None,
+            body=(body[:200] + '...') if body else '',
+        ))
+    return releases
+
+
+def _dates(root):
+    """(first commit, last commit) dates of HEAD's history"""
+    last = (_git(root, 'log', '-1', '--format=%cI', 'HEAD') or '').strip()
+    roots = (_git(root, 'log', '--max-parents=0', '--format=%aI', 'HEAD') or '').split()
+    return (min(datetime.fromisoformat(d) for d in roots) if roots else None,
+            datetime.fromisoformat(last) if last else None)
+
+
+def _remote(root):
+    """(owner/name, URL) of a GitHub origin remote, or (None, None)"""
+    url = (_git(root, 'config', '--get', 'remote.origin.url') or '').strip()
+    match = _GITHUB_REMOTE.search(url)
+    if not match:
+        return None, None
+    full_name = f"{match.group(1)}/{match.group(2)}"
+    return full_name, f"https://github.com/{full_name}"
+
+
+def _branch(root):
+    branch = (_git(root, 'symbolic-ref', '--quiet', '--short', 'HEAD') or '').strip()
+    if not branch:
+        # Detached HEAD, as in most CI checkouts: use the remote's default branch
+        branch = (_git(root, 'symbolic-ref', '--quiet', '--short', 'refs/remotes/origin/HEAD') or '').strip()
+        branch = branch.split('/', 1)[1] if '/' in branch else branch
+    return branch or None
+
+
+def _read(root, path, limit=None):
+    with open(os.path.join(root, path), 'rb') as f:
+        return f.read(limit) if limit else f.read()
+
+
+def analyze_local(path, limits=None):
+    """Build RepoData for the repository checked out at ``path``; raises ValueError if it isn't a directory"""
+    if not os.path.isdir(path):
+        raise ValueError(f"Not a directory: {path}")
+    limits = dict(DEFAULT_LIMITS, **(limits or {}))
+    root = (_git(path, 'rev-parse', '--show-toplevel') or '').strip() or os.path.abspath(path)
+
+    with ThreadPoolExecutor(max_workers=LOCAL_WALK_WORKERS, thread_name_prefix='local-walk') as pool:
+        # git history is read while the files are listed
+        contributors = pool.submit(_contributors, root, limits['contributors'])
+        releases = pool.submit(_releases, root, limits['releases'])
+        dates = pool.submit(_dates, root)
+        with timed('local.files'):
+            files = list_files(root, pool)
+        with timed('local.git'):
+            contributors, releases, (created_at, updated_at) = \
+                contributors.result(), releases.result(), dates.result()
+
+    languages = {}
+    for file_path, size in files:
+        language = language_of(file_path)
+        if language:
+            languages[language] = languages.get(language, 0) + size
+    languages = dict(sorted(languages.items(), key=lambda item: -item[1]))
+
+    root_files = sorted(p for p, _ in files if '/' not in p)
+    readme = 'No README found'
+    readmes = [p for p in root_files if _README_FILE.match(p)]
+    if readmes:
+        # Prefer README.md, like GitHub
+        readmes.sort(key=lambda p: not p.lower().endswith('.md'))
+        readme = _read(root, readmes[0]).decode('utf-8', errors='replace')
+    license_files = [p for p in root_files if _LICENSE_FILE.match(p)]
+    license_name = None
+    if license_files:
+        license_name = detect_license(_read(root, license_files[0], 8192).decode('utf-8', errors='replace'))
+
+    name = os.path.basename(root.rstrip(os.sep))
+    full_name, url = _remote(root)
+    with timed('local.content_scan'):
+        relevant = {p: size for p, size in files if is_relevant(p)}
+        parsed = {p: parse_manifest(p, _read(root, p)) for p, size in relevant.items()
+                  if needs_content(p) and size <= SCAN_MAX_FILE_SIZE}
+        stack = dict(build_stack(name, relevant, parsed), truncated=False)
+
+    return RepoData(
+        name=full_name.split('/')[1] if full_name else name,
+        full_name=full_name or name,
+        url=url or '',
+        default_branch=_branch(root),
+        created_at=created_at,
+        updated_at=updated_at,
+        pushed_at=updated_at,
+        language=next(iter(languages), None),
+        license=license_name,
+        readme=readme,
+        contributors=contributors,
+        languages=languages,
+        releases=releases,
+        stack=stack,
+    )
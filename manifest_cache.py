@@ -0,0 +1,91 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from dotenv import load_dotenv
+import metrics
+
+# Load environment variables
+load_dotenv()
+
+# Parsed manifests are cached on disk by git blob SHA. A blob SHA names the
+# file's exact content, so an entry never goes stale and is shared by every
+# repository (and branch, fork or token) holding the same manifest; it can
+# only be looked up by someone who already read the SHA from a tree listing.
+# The least recently used entries are evicted above MANIFEST_CACHE_SIZE.
+MANIFEST_CACHE_PATH = os.getenv('MANIFEST_CACHE_PATH', 'manifest_cache.sqlite3')
+MANIFEST_CACHE_SIZE = int(os.getenv('MANIFEST_CACHE_SIZE', '50000'))
+
+# SQLite allows at most 999 bound parameters per statement
+_BATCH = 500
+
+
+class ManifestCache:
+    """SQLite store of parse results by blob key, shared by all workers on a host"""
+
+    def __init__(self, path=MANIFEST_CACHE_PATH, max_entries=MANIFEST_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = None
+        if max_entries > 0:
+            self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+            with self._conn:
+                self._conn.execute('PRAGMA journal_mode=WAL')
+                self._conn.execute(
+                    'CREATE TABLE IF NOT EXISTS manifests '
+                    '(key TEXT PRIMARY KEY, value TEXT NOT NULL, accessed REAL NOT NULL)'
+                )
+
+    def get_many(self, keys):
+        """Map the cached keys among ``keys`` to their parse result (which may be None)"""
+        keys = list(keys)
+        found = {}
+        if self._conn is not None and keys:
+            with self._lock:
+                for i in range(0, len(keys), _BATCH):
+                    chunk = keys[i:i + _BATCH]
+                    marks = ','.join('?' * len(chunk))
+                    rows = self._conn.execute(
+                        f'SELECT key, value FROM manifests WHERE key IN ({marks})', chunk).fetchall()
+                    found.update((key, json.loads(value)) for key, value in rows)
+                    with self._conn:
+                        self._conn.execute(f'UPDATE manifests SET accessed = ? WHERE key IN ({marks})',
+                                           [time.time()] + chunk)
+        for key in keys:
+            metrics.cache_lookup('manifest', key in found)
+        return found
+
+    def set_many(self, items):
+        """Store ``{key: parse result}`` and evict the least recently used entries over the cap"""
+        if self._conn is None or not items:
+            return
+        now = time.time()
+        rows = [(key, json.dumps(value), now) for key, value in items.items()]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO manifests (key, value, accessed) VALUES (?, ?, ?)', rows)
+            self._conn.execute(
+                'DELETE FROM manifests WHERE key IN ('
+                'SELECT key FROM manifests ORDER BY accessed DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        if self._conn is None:
+            return
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM manifests')
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_manifest_cache():
+    """Process-wide manifest cache, opened on first use"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ManifestCache()
+        return _cache
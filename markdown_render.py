@@ -0,0 +1,100 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+import metrics
+
+# Load environment variables
+load_dotenv()
+
+# Markdown is converted to HTML in one place. Rendered HTML is kept in an LRU
+# keyed by a hash of the source, so previewing the same README again (or the
+# same text through the template filter) is a dictionary lookup.
+# MARKDOWN_BACKEND=commonmark uses cmarkgfm or markdown-it-py when installed.
+MARKDOWN_BACKEND = os.getenv('MARKDOWN_BACKEND', 'markdown2').lower()
+MARKDOWN_CACHE_SIZE = int(os.getenv('MARKDOWN_CACHE_SIZE', '256'))
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+
+def _markdown2():
+    import markdown2
+    return markdown2.markdown
+
+
+def _commonmark():
+    """Fastest installed CommonMark implementation, raw HTML passed through like markdown2"""
+    try:
+        import cmarkgfm
+        from cmarkgfm.cmark import Options
+        return lambda text: cmarkgfm.github_flavored_markdown_to_html(text, options=Options.CMARK_OPT_UNSAFE)
+    except ImportError:
+        pass
+    from markdown_it import MarkdownIt
+    return MarkdownIt('commonmark').enable(['table', 'strikethrough']).render
+
+
+def _load_backend(name):
+    if name == 'commonmark':
+        try:
+            return name, _commonmark()
+        except ImportError:
+            print("Warning: neither cmarkgfm nor markdown-it-py is installed, using markdown2")
+    elif name != 'markdown2':
+        print(f"Warning: unknown MARKDOWN_BACKEND '{name}', using markdown2")
+    return 'markdown2', _markdown2()
+
+
+class MarkdownRenderer:
+    """Markdown to HTML converter with an LRU of rendered documents"""
+
+    def __init__(self, backend=MARKDOWN_BACKEND, max_entries=MARKDOWN_CACHE_SIZE):
+        self.backend, self._convert = _load_backend(backend)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, text):
+        if not text:
+            return ''
+        key = hashlib.sha256(text.encode('utf-8')).digest()
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        metrics.cache_lookup('markdown', html is not None)
+        if html is not None:
+            return html
+        with metrics.timed('markdown_render'):
+            html = self._convert(text)
+        with self._lock:
+            self._entries[key] = html
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return html
+
+    def stats(self):
+        with self._lock:
+            return {'backend': self.backend, 'hits': self.hits, 'misses': self.misses,
+                    'size': len(self._entries)}
+
+
+def get_renderer():
+    """Return the process-wide renderer, created on first use"""
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = MarkdownRenderer()
+        return _renderer
+
+
+def render_markdown(text):
+    """Render Markdown to HTML, reusing the result for text seen before"""
+    return get_renderer().render(text)
@@ -0,0 +1,208 @@
+import os
+import sys
+import json
+import time
+import logging
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# In-process metrics in the Prometheus text format, served by /metrics.
+# Stage timings, GitHub call counts and cache lookups are recorded on the hot
+# path; gauges such as rate-limit headroom are collected when scraped. Each
+# gunicorn worker keeps its own values, so scrape every worker (the ``pid``
+# label tells them apart). METRICS_LOG_REQUESTS=1 additionally logs one JSON
+# line per request with its stage timings.
+METRICS_LOG_REQUESTS = os.getenv('METRICS_LOG_REQUESTS', '0') == '1'
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+_metrics = []
+_collectors = []
+_trace = contextvars.ContextVar('metrics_trace', default=None)
+
+
+def _labels_text(labels):
+    if not labels:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in labels.values())
+    return '{' + ','.join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + '}'
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(label, '')) for label in self.labels)
+
+
+class Counter(_Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield self.name, dict(zip(self.labels, key)), value
+
+
+class Gauge(Counter):
+    type = 'gauge'
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * len(self.buckets) + [0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-2] += 1
+            counts[-1] += value
+
+    def samples(self):
+        with self._lock:
+            values = [(key, list(counts)) for key, counts in self._values.items()]
+        for key, counts in values:
+            labels = dict(zip(self.labels, key))
+            for bound, count in zip(self.buckets, counts):
+                yield f"{self.name}_bucket", dict(labels, le=repr(float(bound))), count
+            yield f"{self.name}_bucket", dict(labels, le='+Inf'), counts[-2]
+            yield f"{self.name}_count", labels, counts[-2]
+            yield f"{self.name}_sum", labels, counts[-1]
+
+
+def register_collector(fn):
+    """Register ``fn()`` yielding (name, type, help, [(labels, value), ...]) at scrape time"""
+    _collectors.append(fn)
+    return fn
+
+
+STAGE_SECONDS = Histogram('readme_stage_seconds', 'Time spent per processing stage', ['stage'])
+GITHUB_CALLS = Counter('github_api_calls_total', 'GitHub API requests made', ['method', 'status'])
+GITHUB_CALL_SECONDS = Histogram('github_api_call_seconds', 'Latency of GitHub API requests')
+FETCH_ERRORS = Counter('readme_fetch_errors_total', 'Repository sub-resources that failed or timed out', ['field', 'reason'])
+CACHE_LOOKUPS = Counter('cache_lookups_total', 'Cache lookups by cache and result', ['cache', 'result'])
+HTTP_REQUESTS = Counter('http_requests_total', 'HTTP requests served', ['endpoint', 'status'])
+HTTP_REQUEST_SECONDS = Histogram('http_request_seconds', 'Time to handle HTTP requests', ['endpoint'])
+HTTP_IN_PROGRESS = Gauge('http_requests_in_progress', 'HTTP requests being handled')
+
+
+@contextmanager
+def timed(stage):
+    """Record how long the enclosed block takes as one observation of a stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        trace = _trace.get()
+        if trace is not None:
+            trace['stages'].append((stage, elapsed))
+
+
+def timed_stage(stage):
+    """Decorator form of timed()"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def github_call(method, status, elapsed):
+    GITHUB_CALLS.inc(method=method, status=status)
+    GITHUB_CALL_SECONDS.observe(elapsed)
+    trace = _trace.get()
+    if trace is not None:
+        trace['github_calls'].append(status)
+
+
+def cache_lookup(cache, hit):
+    CACHE_LOOKUPS.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def begin_request():
+    """Start collecting stage timings for the current request (and threads it starts)"""
+    HTTP_IN_PROGRESS.inc()
+    return _trace.set({'start': time.perf_counter(), 'stages': [], 'github_calls': []})
+
+
+def end_request(token, method, path, endpoint, status):
+    trace = _trace.get()
+    _trace.reset(token)
+    HTTP_IN_PROGRESS.dec()
+    elapsed = time.perf_counter() - trace['start']
+    HTTP_REQUESTS.inc(endpoint=endpoint, status=status)
+    HTTP_REQUEST_SECONDS.observe(elapsed, endpoint=endpoint)
+    if METRICS_LOG_REQUESTS:
+        stages = {}
+        for stage, seconds in list(trace['stages']):
+            stages[stage] = round(stages.get(stage, 0) + seconds * 1000, 2)
+        _request_log.info(json.dumps({
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'method': method,
+            'path': path,
+            'endpoint': endpoint,
+            'status': status,
+            'duration_ms': round(elapsed * 1000, 2),
+            'github_calls': len(trace['github_calls']),
+            'stages_ms': stages,
+        }))
+
+
+def render():
+    """All metrics in the Prometheus text exposition format"""
+    pid = str(os.getpid())
+    lines = []
+    families = [(m.name, m.type, m.documentation, m.samples()) for m in _metrics]
+    for collector in _collectors:
+        for name, kind, documentation, values in collector():
+            families.append((name, kind, documentation, ((name, labels, v) for labels, v in values)))
+    for name, kind, documentation, samples in families:
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {kind}")
+        for sample, labels, value in samples:
+            lines.append(f"{sample}{_labels_text(dict(labels, pid=pid))} {value}")
+    return '\n'.join(lines) + '\n'
+
+
+_request_log = logging.getLogger('readme_generator.requests')
+if METRICS_LOG_REQUESTS and not _request_log.handlers:
+    _handler = logging.StreamHandler(sys.stderr)
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    _request_log.addHandler(_handler)
+    _request_log.setLevel(logging.INFO)
+    _request_log.propagate = False
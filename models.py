@@ -0,0 +1,195 @@
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Analyzed repository data. Instances serialize to plain dicts for JSON
+# responses (timestamps as ISO 8601 strings) and to compact positional rows
+# for caches: to_bytes uses msgpack when installed and JSON otherwise, and
+# every row starts with SCHEMA_VERSION so rows written by another version
+# are rejected instead of being misread. Bump it whenever fields change.
+# The models are slotted dataclasses, which need Python 3.10 or later.
+SCHEMA_VERSION = 2
+
+# Placeholder kept when the repository has no README (it is not Markdown)
+NO_README = 'No README found'
+
+_MSGPACK = b'm'
+_JSON = b'j'
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def _datetime(value):
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _json_dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def _json_loads(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+@dataclass(slots=True)
+class Contributor:
+    login: str
+    url: str = ''
+    contributions: int = 0
+
+    def to_dict(self):
+        return {'login': self.login, 'url': self.url, 'contributions': self.contributions}
+
+    def to_row(self):
+        return [self.login, self.url, self.contributions]
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
+
+@dataclass(slots=True)
+class Release:
+    tag_name: str
+    name: str = ''
+    published_at: Optional[datetime] = None
+    body: str = ''
+
+    def to_dict(self):
+        return {'tag_name': self.tag_name, 'name': self.name,
+                'published_at': _iso(self.published_at), 'body': self.body}
+
+    def to_row(self):
+        return [self.tag_name, self.name, _iso(self.published_at), self.body]
+
+    @classmethod
+    def from_row(cls, row):
+        tag_name, name, published_at, body = row
+        return cls(tag_name, name, _datetime(published_at), body)
+
+
+@dataclass(slots=True)
+class RepoData:
+    name: str
+    full_name: str
+    description: str = 'No description provided'
+    url: str = ''
+    default_branch: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    pushed_at: Optional[datetime] = None
+    language: Optional[str] = None
+    forks_count: int = 0
+    stargazers_count: int = 0
+    open_issues_count: int = 0
+    license: Optional[str] = None
+    topics: list = field(default_factory=list)
+    readme: str = NO_README
+    contributors: list = field(default_factory=list)
+    languages: dict = field(default_factory=dict)
+    releases: list = field(default_factory=list)
+    user: Optional[dict] = None
+    # Tech stack, install steps and entry points found in the repository's files
+    stack: Optional[dict] = None
+
+    def to_dict(self):
+        """JSON-ready dict, with timestamps as ISO 8601 strings"""
+        return {
+            'name': self.name,
+            'full_name': self.full_name,
+            'description': self.description,
+            'url': self.url,
+            'default_branch': self.default_branch,
+            'created_at': _iso(self.created_at),
+            'updated_at': _iso(self.updated_at),
+            'pushed_at': _iso(self.pushed_at),
+            'language': self.language,
+            'forks_count': self.forks_count,
+            'stargazers_count': self.stargazers_count,
+            'open_issues_count': self.open_issues_count,
+            'license': self.license,
+            'topics': list(self.topics),
+            'readme': self.readme,
+            'contributors': [c.to_dict() for c in self.contributors],
+            'languages': dict(self.languages),
+            'releases': [r.to_dict() for r in self.releases],
+            'user': dict(self.user) if self.user else None,
+            'stack': self.stack,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Inverse of to_dict"""
+        data = dict(data)
+        for key in ('created_at', 'updated_at', 'pushed_at'):
+            data[key] = _datetime(data.get(key))
+        data['contributors'] = [Contributor(**c) for c in data.get('contributors') or []]
+        data['releases'] = [Release(**dict(r, published_at=_datetime(r.get('published_at'))))
+                            for r in data.get('releases') or []]
+        return cls(**data)
+
+    def to_row(self):
+        """Positional form used by the binary and JSON encodings"""
+        return [
+            SCHEMA_VERSION, self.name, self.full_name, self.description, self.url,
+            self.default_branch, _iso(self.created_at), _iso(self.updated_at), _iso(self.pushed_at),
+            self.language, self.forks_count, self.stargazers_count, self.open_issues_count,
+            self.license, self.topics, self.readme, [c.to_row() for c in self.contributors],
+            self.languages, [r.to_row() for r in self.releases], self.user, self.stack,
+        ]
+
+    @classmethod
+    def from_row(cls, row):
+        if not row or row[0] != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported RepoData schema version: {row[0] if row else None}")
+        (_, name, full_name, description, url, default_branch, created_at, updated_at, pushed_at,
+         language, forks_count, stargazers_count, open_issues_count, license, topics, readme,
+         contributors, languages, releases, user, stack) = row
+        return cls(
+            name, full_name, description, url, default_branch,
+            _datetime(created_at), _datetime(updated_at), _datetime(pushed_at),
+            language, forks_count, stargazers_count, open_issues_count, license,
+            list(topics), readme, [Contributor.from_row(c) for c in contributors],
+            dict(languages), [Release.from_row(r) for r in releases],
+            dict(user) if user else None, stack,
+        )
+
+    def to_json(self):
+        return _json_dumps(self.to_row())
+
+    @classmethod
+    def from_json(cls, raw):
+        return cls.from_row(_json_loads(raw))
+
+    def to_bytes(self):
+        """Compact encoding: msgpack when installed, else JSON, tagged with the format"""
+        if msgpack is not None:
+            return _MSGPACK + msgpack.packb(self.to_row(), use_bin_type=True)
+        return _JSON + self.to_json()
+
+    @classmethod
+    def from_bytes(cls, raw):
+        if raw[:1] == _MSGPACK:
+            if msgpack is None:
+                raise ValueError("RepoData was encoded with msgpack, which is not installed")
+            return cls.from_row(msgpack.unpackb(raw[1:], raw=False))
+        return cls.from_json(raw[1:])
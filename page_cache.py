@@ -0,0 +1,66 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+import metrics
+
+# Load environment variables
+load_dotenv()
+
+# Rendered result pages are kept for a short while, keyed by everything that
+# went into them (repository, token scope, user details, template version),
+# so previewing the same repository again returns at once. ``refresh=1``
+# renders the page again, and publishing to a repository drops its pages.
+RESULT_PAGE_CACHE_SIZE = int(os.getenv('RESULT_PAGE_CACHE_SIZE', '128'))
+RESULT_PAGE_CACHE_TTL = float(os.getenv('RESULT_PAGE_CACHE_TTL', '300'))
+
+
+def page_key(*parts):
+    """Cache key for a page rendered from ``parts``"""
+    return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()
+
+
+class PageCache:
+    """Size-bounded LRU with a TTL of rendered HTML fragments"""
+
+    def __init__(self, max_entries=RESULT_PAGE_CACHE_SIZE, ttl=RESULT_PAGE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and item[0] < time.monotonic():
+                del self._entries[key]
+                item = None
+            if item is not None:
+                self._entries.move_to_end(key)
+        metrics.cache_lookup('result_page', item is not None)
+        return item[1] if item is not None else None
+
+    def set(self, key, html, full_name=None):
+        """Keep a page; ``full_name`` is the repository it shows, for invalidate()"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, html, full_name.lower() if full_name else None)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, full_name=None):
+        """Drop every page of a repository, or everything when no name is given"""
+        with self._lock:
+            if full_name is None:
+                self._entries.clear()
+                return
+            name = full_name.lower()
+            for key in [key for key, item in self._entries.items() if item[2] == name]:
+                del self._entries[key]
+
+
+page_cache = PageCache()
@@ -0,0 +1,187 @@
+import os
+import base64
+import binascii
+import posixpath
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dotenv import load_dotenv
+from github_client import GitHubClient, GitHubAPIError, blob_sha
+from result_cache import result_cache
+from page_cache import page_cache
+from rate_limit import scheduler, BATCH
+
+# Load environment variables
+load_dotenv()
+
+# Bulk publishing writes all files for a repository as one commit through
+# the Git Data API: read the branch head, compare blob SHAs of the files
+# against its tree, then create a tree, a commit and move the branch ref.
+# Repositories are published concurrently by a bounded worker pool.
+PUBLISH_WORKERS = int(os.getenv('PUBLISH_WORKERS', '4'))
+PUBLISH_MAX_REPOS = int(os.getenv('PUBLISH_MAX_REPOS', '100'))
+PUBLISH_MAX_FILES = int(os.getenv('PUBLISH_MAX_FILES', '20'))
+DEFAULT_MESSAGE = 'chore: update README via README Generator'
+
+# Attempts per repository when the branch moves between reading and updating it
+REF_ATTEMPTS = 2
+
+
+def _check(resp):
+    if not resp.ok:
+        raise GitHubAPIError.from_response(resp)
+    return resp.json()
+
+
+def _existing_blobs(client, full_name, tree_sha, paths):
+    """Map each path to its (sha, mode) in the tree, or None if it doesn't exist
+
+    Only the directories on the way to the files are listed, so large
+    repositories don't need a recursive tree listing.
+    """
+    trees = {'': tree_sha}
+    entries = {}
+
+    def list_dir(directory):
+        if directory in entries:
+            return entries[directory]
+        sha = trees.get(directory)
+        if sha is None:
+            parent, name = posixpath.split(directory)
+            item = list_dir(parent).get(name)
+            sha = item['sha'] if item and item['type'] == 'tree' else None
+        listing = {}
+        if sha is not None:
+            for item in client.get_json(f"/repos/{full_name}/git/trees/{sha}")['tree']:
+                listing[item['path']] = item
+        entries[directory] = listing
+        return listing
+
+    found = {}
+    for path in paths:
+        directory, name = posixpath.split(path)
+        item = list_dir(directory).get(name)
+        found[path] = (item['sha'], item['mode']) if item and item['type'] == 'blob' else None
+    return found
+
+
+def publish_files(client, full_name, files, message=DEFAULT_MESSAGE, branch=None):
+    """Commit ``files`` ([{'path', 'content'}, ...]) to a branch as a single commit
+
+    Files whose blob SHA matches the branch are left out; when nothing
+    changed no commit is made. ``content`` is text, or base64 with
+    ``'encoding': 'base64'`` for binary files.
+    """
+    if not branch:
+        branch = client.get_json(f"/repos/{full_name}")['default_branch']
+    files = [dict(f, path=f['path'].strip('/')) for f in files]
+    # Blob SHAs are computed locally, so unchanged files cost no API call
+    shas = {}
+    for f in files:
+        if f.get('encoding') == 'base64':
+            try:
+                shas[f['path']] = blob_sha(base64.b64decode(f['content']))
+            except binascii.Error:
+                raise ValueError(f"{f['path']}: content is not valid base64")
+        else:
+            shas[f['path']] = blob_sha(f['content'])
+    result = {'full_name': full_name, 'branch': branch, 'success': False}
+
+    for attempt in range(REF_ATTEMPTS):
+        head = client.get_json(f"/repos/{full_name}/git/ref/heads/{branch}")['object']['sha']
+        base_tree = client.get_json(f"/repos/{full_name}/git/commits/{head}")['tree']['sha']
+        existing = _existing_blobs(client, full_name, base_tree, [f['path'] for f in files])
+
+        entries = []
+        statuses = {}
+        for f in files:
+            binary = f.get('encoding') == 'base64'
+            current = existing[f['path']]
+            # Compare blob SHAs locally instead of downloading the current files
+            if current and current[0] == shas[f['path']]:
+                statuses[f['path']] = 'unchanged'
+                continue
+            entry = {'path': f['path'], 'mode': current[1] if current else '100644', 'type': 'blob'}
+            if binary:
+                # Only changed binary files are uploaded
+                blob = _check(client.request('POST', f"/repos/{full_name}/git/blobs",
+                                             json={'content': f['content'], 'encoding': 'base64'}))
+                entry['sha'] = blob['sha']
+            else:
+                # Text is sent inline; GitHub creates the blob with the tree
+                entry['content'] = f['content']
+            entries.append(entry)
+            statuses[f['path']] = 'updated' if current else 'created'
+        result['files'] = statuses
+
+        if not entries:
+            result.update(success=True, skipped=True, reason='No changes')
+            return result
+
+        tree = _check(client.request('POST', f"/repos/{full_name}/git/trees",
+                                     json={'base_tree': base_tree, 'tree': entries}))
+        commit = _check(client.request('POST', f"/repos/{full_name}/git/commits",
+                                       json={'message': message, 'tree': tree['sha'], 'parents': [head]}))
+        ref = client.request('PATCH', f"/repos/{full_name}/git/refs/heads/{branch}",
+                             json={'sha': commit['sha'], 'force': False})
+        if ref.status_code == 422 and attempt + 1 < REF_ATTEMPTS:
+            # Someone pushed in the meantime; build the commit again on the new head
+            continue
+        _check(ref)
+        # The repository changed, so cached analyses and result pages of it are stale
+        result_cache.invalidate(full_name)
+        page_cache.invalidate(full_name)
+        result.update(success=True, skipped=False, commit=commit['sha'])
+        return result
+
+
+def publish_one(client, target, message=DEFAULT_MESSAGE):
+    """Publish one repository's files, reporting errors inline"""
+    full_name = target.get('full_name')
+    files = target.get('files') or []
+    if target.get('content') is not None:
+        # Shorthand for just the README
+        files = [{'path': target.get('path') or 'README.md', 'content': target['content']}] + files
+    result = {'full_name': full_name, 'success': False}
+    if not full_name or not files:
+        result['error'] = 'Missing full_name or files'
+        return result
+    if not all(isinstance(f, dict) and f.get('path') and isinstance(f.get('content'), str) for f in files):
+        result['error'] = 'Each file needs a path and text content'
+        return result
+    if len(files) > PUBLISH_MAX_FILES:
+        result['error'] = f'Too many files (max {PUBLISH_MAX_FILES})'
+        return result
+    try:
+        with scheduler.priority(BATCH):
+            return publish_files(client, full_name, files, target.get('message') or message, target.get('branch'))
+    except GitHubAPIError as e:
+        result.update(error=e.message, status=e.status)
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+def publish_batch(targets, token, message=DEFAULT_MESSAGE, workers=PUBLISH_WORKERS):
+    """Yield one result per repository as soon as its publish finishes
+
+    At most ``workers`` repositories are in flight, as in generate_batch.
+    """
+    client = GitHubClient(token)
+    pending = iter(targets)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='gh-publish')
+    in_flight = set()
+    try:
+        for target in pending:
+            in_flight.add(executor.submit(publish_one, client, target, message))
+            if len(in_flight) >= workers:
+                break
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                next_target = next(pending, None)
+                if next_target is not None:
+                    in_flight.add(executor.submit(publish_one, client, next_target, message))
+                yield future.result()
+    finally:
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=False)
@@ -0,0 +1,203 @@
+import os
+import time
+import hashlib
+import threading
+import contextvars
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+import metrics
+
+# Load environment variables
+load_dotenv()
+
+# Central pacing of GitHub calls per token. Interactive calls may spend the
+# budget down to RATE_LIMIT_RESERVE; batch calls stop at RATE_LIMIT_BATCH_RESERVE
+# (a fraction of the limit), are spread evenly until the reset once less than
+# RATE_LIMIT_PACE_BELOW of the limit is left, and always yield to waiting
+# interactive calls.
+RATE_LIMIT_RESERVE = int(os.getenv('RATE_LIMIT_RESERVE', '5'))
+RATE_LIMIT_BATCH_RESERVE = float(os.getenv('RATE_LIMIT_BATCH_RESERVE', '0.2'))
+RATE_LIMIT_MAX_WAIT = float(os.getenv('RATE_LIMIT_MAX_WAIT', '30'))
+RATE_LIMIT_PACE_BELOW = float(os.getenv('RATE_LIMIT_PACE_BELOW', '0.5'))
+
+INTERACTIVE = 'interactive'
+BATCH = 'batch'
+
+_priority = contextvars.ContextVar('github_priority', default=INTERACTIVE)
+
+
+def current_priority():
+    return _priority.get()
+
+
+def token_id(token):
+    """Stable, non-reversible identifier for a token"""
+    if not token:
+        return 'anon'
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()[:16]
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a call cannot be made before the budget resets"""
+
+    def __init__(self, reset=None, message=None):
+        self.reset = reset
+        when = time.strftime('%H:%M:%S UTC', time.gmtime(reset)) if reset else 'later'
+        super().__init__(message or f"GitHub API rate limit exceeded, resets at {when}")
+
+
+class TokenBudget:
+    def __init__(self):
+        self.limit = None
+        self.remaining = None
+        self.reset = 0
+        self.blocked_until = 0
+        self.next_batch_at = 0
+        self.waiting = {INTERACTIVE: 0, BATCH: 0}
+
+    def to_dict(self):
+        return {
+            'limit': self.limit,
+            'remaining': self.remaining,
+            'reset': self.reset or None,
+            'blocked_until': self.blocked_until or None,
+            'queued': dict(self.waiting),
+        }
+
+
+class RateLimitScheduler:
+    def __init__(self, reserve=RATE_LIMIT_RESERVE, batch_reserve=RATE_LIMIT_BATCH_RESERVE,
+                 max_wait=RATE_LIMIT_MAX_WAIT, pace_below=RATE_LIMIT_PACE_BELOW):
+        self.reserve = reserve
+        self.batch_reserve = batch_reserve
+        self.max_wait = max_wait
+        self.pace_below = pace_below
+        self._budgets = {}
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def priority(self, name):
+        """Run the enclosed GitHub calls (and threads started from copied contexts) at a priority"""
+        token = _priority.set(name)
+        try:
+            yield
+        finally:
+            _priority.reset(token)
+
+    def _budget(self, token):
+        key = token_id(token)
+        budget = self._budgets.get(key)
+        if budget is None:
+            budget = self._budgets[key] = TokenBudget()
+        return budget
+
+    def _delay(self, budget, priority, now):
+        """Seconds this call must wait, 0 when it may go ahead"""
+        if budget.blocked_until > now:
+            return budget.blocked_until - now
+        if budget.remaining is None or budget.reset <= now:
+            return 0
+        if priority == BATCH:
+            if budget.waiting[INTERACTIVE]:
+                return 0.1
+            if budget.remaining <= self._batch_reserve(budget):
+                return budget.reset - now
+            if budget.next_batch_at > now:
+                return budget.next_batch_at - now
+            return 0
+        if budget.remaining <= self.reserve:
+            return budget.reset - now
+        return 0
+
+    def _batch_reserve(self, budget):
+        return max(self.reserve, int((budget.limit or 0) * self.batch_reserve))
+
+    def acquire(self, token):
+        """Block until a call may be made with this token, or raise RateLimitExceeded"""
+        priority = _priority.get()
+        with self._cond:
+            budget = self._budget(token)
+            budget.waiting[priority] += 1
+            try:
+                while True:
+                    now = time.time()
+                    delay = self._delay(budget, priority, now)
+                    if delay <= 0:
+                        break
+                    if priority == INTERACTIVE and delay > self.max_wait:
+                        raise RateLimitExceeded(max(budget.blocked_until, budget.reset))
+                    self._cond.wait(min(delay, 5))
+                if budget.remaining is not None:
+                    budget.remaining -= 1
+                    if (priority == BATCH and budget.reset > now
+                            and budget.remaining < (budget.limit or 0) * self.pace_below):
+                        # Spread what is left of the batch share evenly until the reset
+                        spare = max(budget.remaining - self._batch_reserve(budget), 1)
+                        budget.next_batch_at = now + (budget.reset - now) / spare
+            finally:
+                budget.waiting[priority] -= 1
+
+    def update(self, token, resp):
+        """Record the budget reported by a response and honor Retry-After"""
+        headers = resp.headers
+        with self._cond:
+            budget = self._budget(token)
+            if 'X-RateLimit-Remaining' in headers:
+                budget.remaining = int(headers['X-RateLimit-Remaining'])
+                budget.limit = int(headers.get('X-RateLimit-Limit') or budget.limit or 0) or None
+                budget.reset = int(headers.get('X-RateLimit-Reset') or 0)
+            if resp.status_code in (403, 429):
+                retry_after = headers.get('Retry-After')
+                if retry_after and retry_after.isdigit():
+                    budget.blocked_until = time.time() + int(retry_after)
+                elif budget.remaining == 0:
+                    budget.blocked_until = budget.reset
+            self._cond.notify_all()
+
+    def budget(self, token):
+        with self._cond:
+            return self._budget(token).to_dict()
+
+    def collect(self):
+        """Rate-limit headroom per token for the metrics endpoint"""
+        with self._cond:
+            budgets = [(key, b.limit, b.remaining, b.reset, sum(b.waiting.values()))
+                       for key, b in self._budgets.items() if b.remaining is not None]
+        yield ('github_rate_limit_remaining', 'gauge', 'Calls left in the current rate-limit window',
+               [({'token': key}, remaining) for key, _, remaining, _, _ in budgets])
+        yield ('github_rate_limit_limit', 'gauge', 'Calls allowed per rate-limit window',
+               [({'token': key}, limit or 0) for key, limit, _, _, _ in budgets])
+        yield ('github_rate_limit_reset_timestamp_seconds', 'gauge', 'When the rate-limit window resets',
+               [({'token': key}, reset) for key, _, _, reset, _ in budgets])
+        yield ('github_rate_limit_waiting', 'gauge', 'Calls waiting for rate-limit budget',
+               [({'token': key}, waiting) for key, _, _, _, waiting in budgets])
+
+
+class PriorityExecutor:
+    """One thread pool per priority for fan-out work that makes GitHub calls
+
+    Batch work waiting on the scheduler holds its thread while it waits, so
+    it gets its own pool and never takes a thread an interactive call needs.
+    """
+
+    def __init__(self, max_workers, thread_name_prefix):
+        self._pools = {
+            name: ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f'{thread_name_prefix}-{name}')
+            for name in (INTERACTIVE, BATCH)
+        }
+
+    def submit(self, fn, *args, **kwargs):
+        """Run fn on the pool of the caller's priority, inside a copy of the caller's context"""
+        return self._pools[_priority.get()].submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def is_rate_limited(resp):
+    """True for primary (remaining 0) and secondary (Retry-After) limit responses"""
+    if resp.status_code not in (403, 429):
+        return False
+    return resp.headers.get('X-RateLimit-Remaining') == '0' or 'Retry-After' in resp.headers
+
+
+scheduler = RateLimitScheduler()
+metrics.register_collector(scheduler.collect)
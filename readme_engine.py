@@ -0,0 +1,286 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import fields
+from jinja2 import Environment, FileSystemLoader, nodes
+from dotenv import load_dotenv
+import metrics
+from models import RepoData
+
+# Load environment variables
+load_dotenv()
+
+# README sections are Jinja2 templates in readme_templates/, one file per
+# section. A language profile (readme_templates/profiles/<profile>/) overlays
+# the files that differ for that language. Every section is compiled once per
+# profile when the engine is created and rendered with a single join.
+BUILTIN_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'readme_templates')
+README_TEMPLATE_DIR = os.getenv('README_TEMPLATE_DIR', '')
+README_SECTIONS = os.getenv('README_SECTIONS', 'full')
+README_RENDER_CACHE_SIZE = int(os.getenv('README_RENDER_CACHE_SIZE', '256'))
+
+SECTIONS = [
+    'title', 'badges', 'toc', 'features', 'demo', 'getting_started', 'usage',
+    'configuration', 'tech_stack', 'contributing', 'license', 'contact',
+    'contributors', 'acknowledgments',
+]
+
+# The repo_data fields behind each value of the render context besides
+# ``repo`` itself (see ReadmeEngine.context). A section's inputs are worked
+# out from its template, so custom templates are covered too.
+CONTEXT_INPUTS = {
+    'project_name': ['name'],
+    'user_name': ['user'],
+    'user_email': ['user'],
+    'portfolio_url': ['user'],
+    'badges': ['full_name', 'url', 'license', 'language'],
+    'features': ['topics'],
+    'stack': ['stack'],
+    'tech_stack': ['stack'],
+}
+REPO_FIELDS = [f.name for f in fields(RepoData)]
+
+SECTION_SETS = {
+    'full': SECTIONS,
+    'minimal': ['title', 'badges', 'features', 'getting_started', 'usage', 'license', 'contact'],
+}
+
+PROFILES = {
+    'Python': 'python',
+    'JavaScript': 'javascript',
+    'Node.js': 'javascript',
+}
+
+DEFAULT_TECH_STACK = {
+    "Frontend": ["HTML", "CSS", "JavaScript"],
+    "Backend": ["Python"],
+    "Database": ["SQLite"],
+    "DevOps": ["Docker", "GitHub Actions"]
+}
+
+DEFAULT_FEATURES = [
+    "Modern UI: Clean and intuitive user interface",
+    "Responsive Design: Works on all devices and screen sizes",
+    "Easy Setup: Simple installation and configuration process"
+]
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def resolve_sections(sections=None):
+    """Turn a section set name, comma-separated string or list into section names"""
+    sections = sections or README_SECTIONS
+    if isinstance(sections, str):
+        if sections in SECTION_SETS:
+            return list(SECTION_SETS[sections])
+        sections = [s.strip() for s in sections.split(',') if s.strip()]
+    unknown = [s for s in sections if s not in SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown README section(s): {', '.join(unknown)}")
+    return list(sections)
+
+
+def template_inputs(env, name, seen=None):
+    """Sorted repo_data fields a template reads, following includes
+
+    Every field is returned when the template uses ``repo`` other than
+    through a constant attribute or key, or includes a template by a
+    computed name, since its inputs can't be told then.
+    """
+    seen = set() if seen is None else seen
+    if name in seen:
+        return []
+    seen.add(name)
+    source = env.loader.get_source(env, name)[0]
+    found = set()
+
+    def visit(node):
+        if isinstance(node, (nodes.Getattr, nodes.Getitem)) and isinstance(node.node, nodes.Name) \
+                and node.node.name == 'repo':
+            if isinstance(node, nodes.Getattr):
+                found.add(node.attr)
+                return True
+            if isinstance(node.arg, nodes.Const) and isinstance(node.arg.value, str):
+                found.add(node.arg.value)
+                return True
+            return False
+        if isinstance(node, nodes.Name) and node.ctx == 'load':
+            if node.name == 'repo':
+                return False
+            found.update(CONTEXT_INPUTS.get(node.name, []))
+        elif isinstance(node, (nodes.Include, nodes.Extends, nodes.Import, nodes.FromImport)):
+            if not isinstance(node.template, nodes.Const):
+                return False
+            included = template_inputs(env, node.template.value, seen)
+            if included == REPO_FIELDS:
+                return False
+            found.update(included)
+        return all(visit(child) for child in node.iter_child_nodes())
+
+    if not visit(env.parse(source)):
+        return REPO_FIELDS
+    return sorted(found & set(REPO_FIELDS))
+
+
+class ReadmeEngine:
+    def __init__(self, template_dirs=None):
+        """Compile every section for every language profile up front"""
+        self.template_dirs = [d for d in (template_dirs or []) if d]
+        self.profiles = {'default'} | set(PROFILES.values())
+        for base in self.template_dirs + [BUILTIN_TEMPLATE_DIR]:
+            profiles_dir = os.path.join(base, 'profiles')
+            if os.path.isdir(profiles_dir):
+                self.profiles.update(os.listdir(profiles_dir))
+        self.templates = {}
+        # repo_data fields each section of each profile reads
+        self.inputs = {}
+        for profile in self.profiles:
+            self.templates[profile], self.inputs[profile] = self._compile(profile)
+        self.version = self._templates_version()
+        # Last rendered sections per repository and section list, as
+        # {section: (fingerprint, text)}
+        self._rendered = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _templates_version(self):
+        """Hash of every template file the engine was compiled from"""
+        digest = hashlib.sha256()
+        for base in self.template_dirs + [BUILTIN_TEMPLATE_DIR]:
+            for root, dirs, files in os.walk(base):
+                dirs.sort()
+                for name in sorted(files):
+                    path = os.path.join(root, name)
+                    digest.update(path.encode('utf-8'))
+                    with open(path, 'rb') as f:
+                        digest.update(f.read())
+        return digest.hexdigest()
+
+    def _compile(self, profile):
+        # Custom directories win over the built-in templates, and within each
+        # directory the profile overlay wins over the generic section
+        search_path = []
+        for base in self.template_dirs + [BUILTIN_TEMPLATE_DIR]:
+            search_path += [os.path.join(base, 'profiles', profile), base]
+        env = Environment(
+            loader=FileSystemLoader(search_path),
+            keep_trailing_newline=True,
+            trim_blocks=True,
+            lstrip_blocks=True,
+            auto_reload=False,
+        )
+        templates = {section: env.get_template(f"{section}.md") for section in SECTIONS}
+        inputs = {section: template_inputs(env, f"{section}.md") for section in SECTIONS}
+        return templates, inputs
+
+    def context(self, repo_data):
+        """Values derived from repo_data that the section templates use"""
+        # Get user information or use defaults
+        user_data = repo_data.user or {}
+
+        # Add badges
+        badges = []
+        if repo_data.license:
+            license_badge = repo_data.license.replace(' ', '%20')
+            badges.append(f"![License](https://img.shields.io/badge/license-{license_badge}-blue)")
+        if repo_data.language:
+            badges.append(f"![Language](https://img.shields.io/badge/language-{repo_data.language}-blueviolet)")
+        if repo_data.url:
+            # Not for a local checkout without a GitHub remote, which has no owner
+            badges.append(f"![Stars](https://img.shields.io/github/stars/{repo_data.full_name}?style=social)")
+            badges.append(f"![Forks](https://img.shields.io/github/forks/{repo_data.full_name}?style=social)")
+
+        # Use repository topics as features (e.g. "machine-learning" -> "Machine Learning"),
+        # or defaults in "Label: Description" form when there are none
+        if repo_data.topics:
+            features = [(' '.join(word.capitalize() for word in topic.split('-')), None)
+                        for topic in repo_data.topics[:5]]
+        else:
+            features = [tuple(part.strip() for part in feature.split(':', 1)) for feature in DEFAULT_FEATURES]
+
+        return {
+            'repo': repo_data,
+            'project_name': repo_data.name or 'My Project',
+            'user_name': user_data.get('name', 'Your Name'),
+            'user_email': user_data.get('email', 'your.email@example.com'),
+            'portfolio_url': user_data.get('portfolio_url', ''),
+            'badges': badges,
+            'features': features,
+            # Detected by scanning the repository's files, when that succeeded
+            'stack': repo_data.stack or {},
+            'tech_stack': (repo_data.stack or {}).get('tech_stack') or DEFAULT_TECH_STACK,
+        }
+
+    def profile_for(self, repo_data):
+        """Language profile for a repository, e.g. profiles/go/ for Go when such a directory exists"""
+        language = repo_data.language or ''
+        profile = PROFILES.get(language, language.lower())
+        if profile in self.profiles:
+            return profile
+        # e.g. a notebook repository with a requirements.txt still gets the Python steps
+        detected = ((repo_data.stack or {}).get('tech_stack') or {}).get('Languages') or []
+        for language in detected:
+            profile = PROFILES.get(language, language.lower())
+            if profile in self.profiles:
+                return profile
+        return 'default'
+
+    def fingerprint(self, section, profile, repo_data):
+        """Hash of everything a section's text depends on"""
+        inputs = {field: getattr(repo_data, field) for field in self.inputs[profile][section]}
+        payload = json.dumps([self.version, profile, section, inputs], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def iter_render(self, repo_data, sections=None):
+        """Yield the selected sections of a README one at a time
+
+        Sections whose fingerprint matches the last README rendered for the
+        same repository are spliced in from it instead of being rendered again.
+        """
+        sections = resolve_sections(sections)
+        profile = self.profile_for(repo_data)
+        templates = self.templates[profile]
+        key = (repo_data.full_name.lower(), tuple(sections))
+        with self._lock:
+            previous = self._rendered.get(key) or {}
+        context = None
+        rendered = {}
+        for section in sections:
+            fingerprint = self.fingerprint(section, profile, repo_data)
+            cached = previous.get(section)
+            reused = bool(cached) and cached[0] == fingerprint
+            metrics.cache_lookup('readme_sections', reused)
+            if reused:
+                text = cached[1]
+            else:
+                if context is None:
+                    context = self.context(repo_data)
+                with metrics.timed('template_render'):
+                    text = templates[section].render(context)
+            rendered[section] = (fingerprint, text)
+            yield text
+        with self._lock:
+            self._rendered[key] = rendered
+            self._rendered.move_to_end(key)
+            while len(self._rendered) > README_RENDER_CACHE_SIZE:
+                self._rendered.popitem(last=False)
+
+    def render(self, repo_data, sections=None):
+        """Render the selected sections of a README"""
+        return ''.join(self.iter_render(repo_data, sections))
+
+
+def get_engine(template_dirs=None):
+    """Return the shared engine for a set of custom template directories"""
+    if template_dirs is None:
+        template_dirs = README_TEMPLATE_DIR.split(os.pathsep) if README_TEMPLATE_DIR else []
+    elif isinstance(template_dirs, str):
+        template_dirs = [template_dirs]
+    key = tuple(template_dirs)
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = _engines[key] = ReadmeEngine(list(key))
+        return engine
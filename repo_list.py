@@ -0,0 +1,134 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+from github_client import GitHubClient
+from rate_limit import token_id
+import metrics
+
+# Load environment variables
+load_dotenv()
+
+# The repository picker lists every repository a signed-in user can access.
+# The list is kept per user for a short while so searching it doesn't touch
+# GitHub; after that it is fetched again, with each page revalidated against
+# its ETag (unchanged pages answer 304 and don't count against the budget).
+REPO_LIST_TTL = float(os.getenv('REPO_LIST_TTL', '60'))
+REPO_LIST_CACHE_SIZE = int(os.getenv('REPO_LIST_CACHE_SIZE', '512'))
+REPO_LIST_PARAMS = {'sort': 'updated', 'affiliation': 'owner,collaborator,organization_member'}
+
+
+def summarize(repo):
+    """The fields of a /user/repos item the picker shows or filters on"""
+    return {
+        'full_name': repo.get('full_name'),
+        'html_url': repo.get('html_url'),
+        'name': repo.get('name'),
+        'owner': (repo.get('owner') or {}).get('login'),
+        'private': repo.get('private'),
+        'fork': repo.get('fork'),
+        'archived': repo.get('archived'),
+        'description': repo.get('description'),
+        'language': repo.get('language'),
+        'updated_at': repo.get('updated_at'),
+    }
+
+
+def _flag(value):
+    if value is None or value == '':
+        return None
+    return str(value).lower() in ('1', 'true', 'yes')
+
+
+def make_filter(q=None, language=None, owner=None, visibility=None, fork=None, archived=None):
+    """Predicate for summaries; ``q`` matches every word against the name and description"""
+    words = (q or '').lower().split()
+    language = (language or '').lower()
+    owner = (owner or '').lower()
+    visibility = (visibility or '').lower()
+    if visibility and visibility not in ('public', 'private'):
+        raise ValueError("visibility must be 'public' or 'private'")
+    fork = _flag(fork)
+    archived = _flag(archived)
+
+    def matches(repo):
+        if words:
+            text = f"{repo['full_name'] or ''} {repo['description'] or ''}".lower()
+            if not all(word in text for word in words):
+                return False
+        if language and (repo['language'] or '').lower() != language:
+            return False
+        if owner and (repo['owner'] or '').lower() != owner:
+            return False
+        if visibility and bool(repo['private']) != (visibility == 'private'):
+            return False
+        if fork is not None and bool(repo['fork']) != fork:
+            return False
+        if archived is not None and bool(repo['archived']) != archived:
+            return False
+        return True
+
+    return matches
+
+
+class RepoListCache:
+    """Per-user repository lists, keyed by a hash of the token"""
+
+    def __init__(self, max_entries=REPO_LIST_CACHE_SIZE, ttl=REPO_LIST_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        key = token_id(token)
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and item[0] < time.monotonic():
+                del self._entries[key]
+                item = None
+            if item is not None:
+                self._entries.move_to_end(key)
+        metrics.cache_lookup('repo_list', item is not None)
+        return item[1] if item is not None else None
+
+    def set(self, token, repos):
+        key = token_id(token)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, repos)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token=None):
+        with self._lock:
+            if token is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(token_id(token), None)
+
+
+repo_lists = RepoListCache()
+
+
+def iter_user_repos(token, refresh=False):
+    """Yield the signed-in user's repositories in batches, as pages arrive
+
+    A cached list is yielded as a single batch. Otherwise every page is
+    fetched (the rest in parallel once the first reveals the page count)
+    and the complete list is cached when the last page is in.
+    """
+    repos = None if refresh else repo_lists.get(token)
+    if repos is not None:
+        yield repos
+        return
+    repos = []
+    seen = set()
+    for page in GitHubClient(token).iter_page_batches('/user/repos', params=REPO_LIST_PARAMS):
+        # A repository updated while the pages are fetched can move to another page
+        batch = [summarize(r) for r in page if r.get('full_name') not in seen]
+        seen.update(r['full_name'] for r in batch)
+        repos.extend(batch)
+        yield batch
+    repo_lists.set(token, repos)
@@ -0,0 +1,194 @@
+import os
+import json
+import time
+import base64
+import fnmatch
+import sqlite3
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Conditional-request cache for GitHub API responses. Entries hold the
+# ETag/Last-Modified validators and the body, so a 304 (which does not count
+# against the rate limit) can be answered from the cache.
+CACHE_BACKEND = os.getenv('GITHUB_CACHE_BACKEND', 'memory').lower()
+CACHE_SIZE = int(os.getenv('GITHUB_CACHE_SIZE', '1024'))
+CACHE_PATH = os.getenv('GITHUB_CACHE_PATH', 'github_cache.sqlite3')
+CACHE_TTL = int(os.getenv('GITHUB_CACHE_TTL', '86400'))
+REDIS_URL = os.getenv('REDIS_URL', '')
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def _dumps(entry):
+    data = dict(entry, body=base64.b64encode(entry['body']).decode('ascii'))
+    return json.dumps(data).encode('utf-8')
+
+
+def _loads(raw):
+    data = json.loads(raw)
+    data['body'] = base64.b64decode(data['body'])
+    return data
+
+
+class MemoryCache:
+    """In-process LRU cache bounded by entry count"""
+
+    def __init__(self, max_entries=CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache:
+    """On-disk cache shared by all workers on a host, evicted least recently used first"""
+
+    def __init__(self, path=CACHE_PATH, max_entries=CACHE_SIZE):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        with self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses '
+                '(key TEXT PRIMARY KEY, value BLOB NOT NULL, accessed REAL NOT NULL)'
+            )
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            with self._conn:
+                self._conn.execute('UPDATE responses SET accessed = ? WHERE key = ?', (time.time(), key))
+        return _loads(row[0])
+
+    def set(self, key, entry):
+        value = _dumps(entry)
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, value, accessed) VALUES (?, ?, ?)',
+                (key, value, time.time())
+            )
+            self._conn.execute(
+                'DELETE FROM responses WHERE key IN ('
+                'SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM responses')
+
+
+class LocalRedis:
+    """Minimal in-process stand-in for the subset of the redis-py API we use"""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires and expires < time.time():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value, ex=None, nx=False):
+        with self._lock:
+            if nx:
+                item = self._data.get(key)
+                if item is not None and not (item[1] and item[1] < time.time()):
+                    return None
+            self._data[key] = (value, time.time() + ex if ex else None)
+            return True
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(1 for key in keys if self._data.pop(key, None) is not None)
+
+    def scan_iter(self, match='*'):
+        with self._lock:
+            keys = list(self._data)
+        return iter([key for key in keys if fnmatch.fnmatchcase(key, match)])
+
+
+def get_redis(url=REDIS_URL):
+    """Connect to Redis when configured and installed, else use the local stand-in"""
+    if url:
+        try:
+            import redis
+            return redis.Redis.from_url(url)
+        except ImportError:
+            print("Warning: redis package not installed, using in-process stand-in")
+    return LocalRedis()
+
+
+class RedisCache:
+    """Cache stored in Redis (or any client with the same get/set API)"""
+
+    def __init__(self, client=None, prefix='gh-etag:', ttl=CACHE_TTL):
+        self.client = client or get_redis()
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return _loads(raw) if raw else None
+
+    def set(self, key, entry):
+        self.client.set(self.prefix + key, _dumps(entry), ex=self.ttl)
+
+    def clear(self):
+        """Delete this cache's keys only; the database may hold other data"""
+        keys = []
+        for key in self.client.scan_iter(match=self.prefix + '*'):
+            keys.append(key)
+            if len(keys) >= 500:
+                self.client.delete(*keys)
+                keys = []
+        if keys:
+            self.client.delete(*keys)
+
+
+def get_response_cache():
+    """Return the process-wide cache for the configured backend (None when disabled)"""
+    global _cache
+    if CACHE_BACKEND in ('', 'none', 'off'):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            if CACHE_BACKEND == 'sqlite':
+                _cache = SQLiteCache()
+            elif CACHE_BACKEND == 'redis':
+                _cache = RedisCache()
+            else:
+                _cache = MemoryCache()
+        return _cache
@@ -0,0 +1,104 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+from models import RepoData
+import metrics
+
+# Load environment variables
+load_dotenv()
+
+# Analyzed repo_data is cached per repository, visibility scope and push
+# state, so previewing and regenerating the same repo skips the analysis.
+# Entries are stored encoded (RepoData.to_bytes), which keeps them compact and
+# hands every caller its own copy for less than a deepcopy would cost.
+RESULT_CACHE_SIZE = int(os.getenv('RESULT_CACHE_SIZE', '256'))
+RESULT_CACHE_TTL = float(os.getenv('RESULT_CACHE_TTL', '600'))
+
+
+def visibility_scope(repo, token=None):
+    """Public repos share one scope; private ones are scoped to the token"""
+    if not repo.get('private'):
+        return 'public'
+    return hashlib.sha256((token or '').encode('utf-8')).hexdigest()[:16]
+
+
+def result_key(repo, token=None):
+    """Cache key for an analyzed repository payload"""
+    return (
+        repo['full_name'].lower(),
+        visibility_scope(repo, token),
+        repo.get('pushed_at'),
+        repo.get('updated_at'),
+    )
+
+
+class ResultCache:
+    """Size-bounded LRU with a TTL of encoded RepoData, so callers can mutate results"""
+
+    def __init__(self, max_entries=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and item[1] < time.monotonic():
+                del self._entries[key]
+                item = None
+            if item is None:
+                self.misses += 1
+                metrics.cache_lookup('analysis', False)
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = item[0]
+        metrics.cache_lookup('analysis', True)
+        return RepoData.from_bytes(value)
+
+    def latest(self, key):
+        """Most recent entry for the same repository and scope, whatever its push state"""
+        now = time.monotonic()
+        with self._lock:
+            for other in reversed(self._entries):
+                value, expires = self._entries[other]
+                if other[:2] == key[:2] and expires >= now:
+                    break
+            else:
+                return None
+        return RepoData.from_bytes(value)
+
+    def set(self, key, value):
+        value = value.to_bytes()
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, full_name=None):
+        """Drop every entry for a repository, or everything when no name is given"""
+        with self._lock:
+            if full_name is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            name = full_name.lower()
+            stale = [key for key in self._entries if key[0] == name]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries),
+                    'bytes': sum(len(item[0]) for item in self._entries.values())}
+
+
+result_cache = ResultCache()
@@ -0,0 +1,189 @@
+import os
+import time
+import uuid
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+from dotenv import load_dotenv
+from response_cache import get_redis
+from metrics import Counter
+
+# Load environment variables
+load_dotenv()
+
+# Concurrent identical analyses share one run. Threads of a worker wait for
+# the first caller's result; with SINGLE_FLIGHT_BACKEND=file or redis that
+# caller also takes a lock shared by all workers, so a worker that finds the
+# lock taken waits for the holder and reuses the result it publishes.
+SINGLE_FLIGHT_BACKEND = os.getenv('SINGLE_FLIGHT_BACKEND', '').lower()
+SINGLE_FLIGHT_DIR = os.getenv('SINGLE_FLIGHT_DIR', os.path.join(tempfile.gettempdir(), 'readme-generator-flights'))
+SINGLE_FLIGHT_WAIT = float(os.getenv('SINGLE_FLIGHT_WAIT', '60'))
+SINGLE_FLIGHT_RESULT_TTL = int(os.getenv('SINGLE_FLIGHT_RESULT_TTL', '30'))
+
+POLL_INTERVAL = 0.05
+FLIGHTS = Counter('single_flight_calls_total', 'Coalesced calls by whether they ran or shared a result', ['result'])
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class FileFlightBackend:
+    """Lock and result files in a directory shared by the workers of one host"""
+
+    def __init__(self, directory=SINGLE_FLIGHT_DIR, wait=SINGLE_FLIGHT_WAIT, ttl=SINGLE_FLIGHT_RESULT_TTL):
+        self.directory = directory
+        self.wait = wait
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key, suffix):
+        return os.path.join(self.directory, hashlib.sha256(key.encode('utf-8')).hexdigest() + suffix)
+
+    @contextmanager
+    def lock(self, key):
+        path = self._path(key, '.lock')
+        deadline = time.monotonic() + self.wait
+        acquired = False
+        while not acquired and time.monotonic() < deadline:
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                acquired = True
+            except FileExistsError:
+                try:
+                    # A lock older than the longest wait belongs to a dead worker
+                    if time.time() - os.path.getmtime(path) > self.wait:
+                        os.remove(path)
+                        continue
+                except OSError:
+                    continue
+                time.sleep(POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            if acquired:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def get(self, key):
+        path = self._path(key, '.result')
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def set(self, key, raw):
+        path = self._path(key, '.result')
+        tmp = f"{path}.{uuid.uuid4().hex}"
+        with open(tmp, 'wb') as f:
+            f.write(raw)
+        os.replace(tmp, path)
+
+
+class RedisFlightBackend:
+    """Lock and result keys in Redis, shared by workers on any host"""
+
+    def __init__(self, client=None, prefix='flight:', wait=SINGLE_FLIGHT_WAIT, ttl=SINGLE_FLIGHT_RESULT_TTL):
+        self.client = client or get_redis()
+        self.prefix = prefix
+        self.wait = wait
+        self.ttl = ttl
+
+    @contextmanager
+    def lock(self, key):
+        name = f"{self.prefix}lock:{key}"
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + self.wait
+        acquired = False
+        # The lock expires on its own if its holder dies
+        while not acquired and time.monotonic() < deadline:
+            acquired = bool(self.client.set(name, owner, ex=int(self.wait) + 1, nx=True))
+            if not acquired:
+                time.sleep(POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            if acquired:
+                current = self.client.get(name)
+                if current is not None and (current.decode() if isinstance(current, bytes) else current) == owner:
+                    self.client.delete(name)
+
+    def get(self, key):
+        return self.client.get(f"{self.prefix}result:{key}")
+
+    def set(self, key, raw):
+        self.client.set(f"{self.prefix}result:{key}", raw, ex=self.ttl)
+
+
+def _load_backend(name):
+    if name == 'file':
+        return FileFlightBackend()
+    if name == 'redis':
+        return RedisFlightBackend()
+    return None
+
+
+class SingleFlight:
+    def __init__(self, backend=None):
+        self.backend = backend
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, reuse_stored=True):
+        """Return ``fn()``, or the bytes returned by an identical call already in flight
+
+        ``fn`` must return bytes (or None) so that a result computed in
+        another worker can be handed over. Exceptions reach every waiter.
+        With ``reuse_stored=False`` a result another worker stored earlier
+        is not used, so a refresh really runs ``fn``.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            FLIGHTS.inc(result='shared')
+            if call.error is not None:
+                raise call.error
+            return call.value
+        try:
+            if self.backend:
+                call.value = self._run_shared(key, fn, reuse_stored)
+            else:
+                FLIGHTS.inc(result='ran')
+                call.value = fn()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _run_shared(self, key, fn, reuse_stored=True):
+        with self.backend.lock(key):
+            # Another worker may have finished this while we waited for the lock
+            raw = self.backend.get(key) if reuse_stored else None
+            if raw is not None:
+                FLIGHTS.inc(result='shared')
+                return raw
+            FLIGHTS.inc(result='ran')
+            raw = fn()
+            if raw is not None:
+                self.backend.set(key, raw)
+            return raw
+
+
+single_flight = SingleFlight(_load_backend(SINGLE_FLIGHT_BACKEND))
@@ -38,7 +38,96 @@
     });
   }
 
-  // Repo picker
+  // Repo picker: matches are searched on the server and streamed in as
+  // newline-delimited JSON batches while GitHub's pages arrive
+  let repoController = null;
+  let repoSearchTimer = null;
+
+  function repoItem(r, modal) {
+    const item = document.createElement('a');
+    item.href = '#';
+    item.className = 'list-group-item list-group-item-action d-flex justify-content-between align-items-center';
+    item.dataset.fullName = (r.full_name || '').toLowerCase();
+    item.innerHTML = `
+      <div>
+        <div class="fw-semibold"></div>
+        <div class="small text-muted"></div>
+      </div>
+      <span class="badge ${r.private ? 'bg-warning text-dark' : 'bg-success'}"></span>
+    `;
+    item.querySelector('.fw-semibold').textContent = r.full_name || '';
+    item.querySelector('.small').textContent = r.description || '';
+    item.querySelector('.badge').textContent = r.private ? 'Private' : (r.language || 'Public');
+    item.addEventListener('click', (e) => {
+      e.preventDefault();
+      const input = document.getElementById('repo_url');
+      if (input) {
+        input.value = `https://github.com/${r.full_name}`;
+      }
+      modal.hide();
+    });
+    return item;
+  }
+
+  function insertSorted(repoList, item) {
+    // Pages arrive out of order, so keep the list sorted by name as they come in
+    const next = Array.from(repoList.children).find(el => el.dataset.fullName > item.dataset.fullName);
+    repoList.insertBefore(item, next || null);
+  }
+
+  async function loadRepos(query, modal) {
+    const repoList = document.getElementById('repoList');
+    const repoEmpty = document.getElementById('repoEmpty');
+    if (repoController) repoController.abort();
+    const controller = repoController = new AbortController();
+    repoList.innerHTML = '<div class="text-center text-muted py-3" id="repoLoading">Loading repositories...</div>';
+    repoEmpty.classList.add('d-none');
+
+    const params = new URLSearchParams({ stream: '1' });
+    if (query) params.set('q', query);
+    const resp = await fetch(`/api/repos?${params}`, { credentials: 'same-origin', signal: controller.signal });
+    if (resp.status === 401) {
+      window.location.href = '/login';
+      return;
+    }
+    if (!resp.ok) {
+      repoList.innerHTML = '<div class="text-danger">Failed to fetch repositories.</div>';
+      return;
+    }
+
+    let count = 0;
+    function handleLine(line) {
+      if (!line.trim()) return;
+      const msg = JSON.parse(line);
+      if (msg.error) throw new Error(msg.error);
+      (msg.repos || []).forEach(r => {
+        insertSorted(repoList, repoItem(r, modal));
+        count += 1;
+      });
+    }
+
+    let buffered = '';
+    if (resp.body && resp.body.getReader) {
+      const reader = resp.body.getReader();
+      const decoder = new TextDecoder();
+      for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffered += decoder.decode(value, { stream: true });
+        const lines = buffered.split('\n');
+        buffered = lines.pop();
+        lines.forEach(handleLine);
+      }
+    } else {
+      buffered = await resp.text();
+    }
+    buffered.split('\n').forEach(handleLine);
+
+    const loading = document.getElementById('repoLoading');
+    if (loading) loading.remove();
+    if (!count) repoEmpty.classList.remove('d-none');
+  }
+
   if (pickBtn) {
     pickBtn.addEventListener('click', async () => {
       try {
@@ -53,69 +142,27 @@
 
         // Open modal
         const modalEl = document.getElementById('repoPickerModal');
-        const repoList = document.getElementById('repoList');
-        const repoEmpty = document.getElementById('repoEmpty');
         const repoSearch = document.getElementById('repoSearch');
         if (!modalEl) return;
         const modal = bootstrap.Modal.getOrCreateInstance(modalEl);
-        repoList.innerHTML = '<div class="text-center text-muted py-3">Loading repositories...</div>';
-        repoEmpty.classList.add('d-none');
         modal.show();
 
-        // Fetch repos
-        const resp = await fetch('/api/repos', { credentials: 'same-origin' });
-        if (!resp.ok) {
-          repoList.innerHTML = '<div class="text-danger">Failed to fetch repositories.</div>';
-          return;
-        }
-        const data = await resp.json();
-        const repos = (data.repos || []).sort((a,b) => (a.full_name || '').localeCompare(b.full_name || ''));
-
-        function render(list) {
-          if (!list.length) {
-            repoList.innerHTML = '';
-            repoEmpty.classList.remove('d-none');
-            return;
-          }
-          repoEmpty.classList.add('d-none');
-          repoList.innerHTML = '';
-          list.forEach(r => {
-            const item = document.createElement('a');
-            item.href = '#';
-            item.className = 'list-group-item list-group-item-action d-flex justify-content-between align-items-center';
-            item.innerHTML = `
-              <div>
-                <div class="fw-semibold">${r.full_name}</div>
-                <div class="small text-muted">${r.description || ''}</div>
-              </div>
-              <span class="badge ${r.private ? 'bg-warning text-dark' : 'bg-success'}">${r.private ? 'Private' : (r.language || 'Public')}</span>
-            `;
-            item.addEventListener('click', (e) => {
-              e.preventDefault();
-              const input = document.getElementById('repo_url');
-              if (input) {
-                input.value = `https://github.com/${r.full_name}`;
-              }
-              modal.hide();
-            });
-            repoList.appendChild(item);
-          });
-        }
-
-        render(repos);
-
-        // Search filter
-        if (repoSearch) {
+        // Search on the server; the list stays cached there between keystrokes
+        if (repoSearch && !repoSearch.dataset.bound) {
+          repoSearch.dataset.bound = '1';
           repoSearch.addEventListener('input', () => {
-            const q = repoSearch.value.toLowerCase();
-            const filtered = repos.filter(r =>
-              (r.full_name || '').toLowerCase().includes(q) ||
-              (r.description || '').toLowerCase().includes(q)
-            );
-            render(filtered);
+            clearTimeout(repoSearchTimer);
+            repoSearchTimer = setTimeout(() => {
+              loadRepos(repoSearch.value.trim(), modal).catch(e => {
+                if (e.name !== 'AbortError') console.error(e);
+              });
+            }, 250);
           }, { passive: true });
         }
+
+        await loadRepos(repoSearch ? repoSearch.value.trim() : '', modal);
       } catch (e) {
+        if (e.name === 'AbortError') return;
         console.error(e);
         alert('Something went wrong while loading your repositories.');
       }
@@ -204,3 +251,64 @@
 
   confirmBtn.addEventListener('click', publishNow);
 })();
+
+// Background analysis progress (job page): stream events, fall back to polling
+(function () {
+  const list = document.getElementById('jobProgress');
+  if (!list) return;
+  const statusUrl = list.getAttribute('data-status-url');
+  const eventsUrl = list.getAttribute('data-events-url');
+
+  function addStep(stage, status) {
+    const item = document.createElement('li');
+    item.className = 'list-group-item d-flex justify-content-between align-items-center';
+    item.innerHTML = '<span></span><span class="badge bg-secondary"></span>';
+    item.children[0].textContent = stage;
+    item.children[1].textContent = status;
+    list.appendChild(item);
+  }
+
+  function finish() {
+    // The job page renders the result (or redirects with an error) once finished
+    window.location.reload();
+  }
+
+  async function poll() {
+    try {
+      const resp = await fetch(statusUrl, { credentials: 'same-origin' });
+      const job = await resp.json();
+      if (!resp.ok || job.status === 'done' || job.status === 'failed') {
+        finish();
+        return;
+      }
+      list.innerHTML = '';
+      (job.progress || []).forEach(p => addStep(p.stage, p.status));
+    } catch (e) {
+      console.error(e);
+    }
+    setTimeout(poll, 1000);
+  }
+
+  if (!window.EventSource) {
+    poll();
+    return;
+  }
+
+  list.innerHTML = '';
+  const source = new EventSource(eventsUrl);
+  source.addEventListener('progress', (e) => {
+    const data = JSON.parse(e.data);
+    addStep(data.stage, data.status);
+  });
+  source.addEventListener('status', (e) => {
+    const data = JSON.parse(e.data);
+    if (data.status === 'done' || data.status === 'failed') {
+      source.close();
+      finish();
+    }
+  });
+  source.onerror = () => {
+    source.close();
+    poll();
+  };
+})();
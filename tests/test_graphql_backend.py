@@ -0,0 +1,70 @@
+import pytest
+import github_client
+import manifest_cache
+import response_cache
+from benchmarks.fixtures import SCENARIOS, synthetic
+from benchmarks.stub_server import StubGitHub
+from github_analyzer import GitHubAnalyzer
+from result_cache import result_cache
+
+# The GraphQL backend is checked against the REST one on the benchmark
+# fixtures, served by the same local stub of the GitHub API.
+FIXTURES = {name: SCENARIOS[name]() for name in ('small', 'many_contributors', 'monorepo')}
+# README outside HEAD:README.md, so GraphQL falls back to REST for it
+FIXTURES['no_readme'] = synthetic('no-readme', 0, 3, 0, 1, [])
+FIXTURES['no_readme']['readme'] = None
+
+
+@pytest.fixture(scope='module')
+def stub():
+    stub = StubGitHub(FIXTURES.values()).start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture(autouse=True)
+def github(stub, monkeypatch, tmp_path):
+    monkeypatch.setattr(github_client, 'GITHUB_API_URL', stub.url)
+    monkeypatch.setattr(github_client, 'GITHUB_GRAPHQL_URL', f"{stub.url}/graphql")
+    # Isolated caches, whatever backend the environment configures
+    monkeypatch.setattr(manifest_cache, '_cache', manifest_cache.ManifestCache(str(tmp_path / 'manifests.sqlite3')))
+    monkeypatch.setattr(response_cache, 'CACHE_BACKEND', 'memory')
+    monkeypatch.setattr(response_cache, '_cache', response_cache.MemoryCache())
+    result_cache.invalidate()
+    stub.reset_calls()
+    return stub
+
+
+def analyze(backend, fixture, **kwargs):
+    owner, name = fixture['repo']['full_name'].split('/')
+    return GitHubAnalyzer(token='test-token', backend=backend).analyze_repository(owner, name, **kwargs)
+
+
+@pytest.mark.parametrize('name', FIXTURES)
+def test_graphql_matches_rest(name):
+    rest = analyze('rest', FIXTURES[name], refresh=True)
+    graphql = analyze('graphql', FIXTURES[name], refresh=True)
+    assert rest is not None
+    assert graphql == rest
+
+
+def test_graphql_uses_one_query(github):
+    analyze('graphql', FIXTURES['small'])
+    calls = github.reset_calls()
+    assert calls.pop('graphql') == 1
+    # Only what GraphQL can't return goes over REST
+    assert set(calls) <= {'contributors', 'git/trees', 'git/blobs'}
+
+
+def test_graphql_cache_hit_makes_no_rest_calls(github):
+    first = analyze('graphql', FIXTURES['small'])
+    github.reset_calls()
+    assert analyze('graphql', FIXTURES['small']) == first
+    assert github.reset_calls() == {'graphql': 1}
+
+
+def test_backends_share_cache_entries(github):
+    rest = analyze('rest', FIXTURES['small'])
+    github.reset_calls()
+    assert analyze('graphql', FIXTURES['small']) == rest
+    assert github.reset_calls() == {'graphql': 1}
@@ -0,0 +1,75 @@
+import os
+import time
+import threading
+from dotenv import load_dotenv
+from rate_limit import scheduler, token_id
+import metrics
+
+# Load environment variables
+load_dotenv()
+
+# Service tokens used for requests that bring no token of their own
+# (anonymous visitors, API calls without "token"). Each analysis takes the
+# token with the most rate-limit budget left, round-robin among equals, so
+# the pool's combined hourly limit is available. GITHUB_TOKENS is a
+# comma-separated list; without it the pool is just GITHUB_TOKEN. A token
+# GitHub answers with 401 (revoked or expired) is dropped from the pool.
+#
+# These tokens are shared by every visitor, so the analyzer only serves
+# public repositories with them (see GitHubAnalyzer.pooled).
+GITHUB_TOKENS = [t.strip() for t in os.getenv('GITHUB_TOKENS', '').split(',') if t.strip()] \
+    or [t for t in [os.getenv('GITHUB_TOKEN')] if t]
+
+TOKENS_DROPPED = metrics.Counter('github_token_pool_dropped_total', 'Service tokens dropped after a 401')
+
+
+class TokenPool:
+    def __init__(self, tokens=()):
+        self._tokens = list(dict.fromkeys(tokens))
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, token):
+        with self._lock:
+            return token in self._tokens
+
+    def __len__(self):
+        with self._lock:
+            return len(self._tokens)
+
+    def _headroom(self, token, now):
+        budget = scheduler.budget(token)
+        if budget['blocked_until'] and budget['blocked_until'] > now:
+            return -1
+        if budget['remaining'] is None or (budget['reset'] or 0) <= now:
+            # Not used yet, or its window has reset since
+            return float('inf')
+        return budget['remaining']
+
+    def pick(self):
+        """The token with the most budget left, or None when the pool is empty"""
+        with self._lock:
+            if not self._tokens:
+                return None
+            start = self._next % len(self._tokens)
+            self._next += 1
+            # Start at a different token each time so ties go round-robin
+            tokens = self._tokens[start:] + self._tokens[:start]
+        now = time.time()
+        return max(tokens, key=lambda token: self._headroom(token, now))
+
+    def drop(self, token):
+        """Remove a token GitHub no longer accepts; tokens outside the pool are ignored"""
+        with self._lock:
+            if token not in self._tokens:
+                return
+            self._tokens.remove(token)
+        TOKENS_DROPPED.inc()
+        print(f"Dropping GitHub token {token_id(token)} from the pool: rejected with 401")
+
+    def collect(self):
+        yield ('github_token_pool_size', 'gauge', 'Service tokens in the pool', [({}, len(self))])
+
+
+token_pool = TokenPool(GITHUB_TOKENS)
+metrics.register_collector(token_pool.collect)